@@ -1,8 +1,9 @@
+import os
 import streamlit as st
 import pandas as pd
-from file1_time import run_pool_fire_model
-from file2_distance import run_distance_model
-from file3_ppe import run_ppe_model
+from cache import ResultCache
+from pipeline import run_pipeline
+from file3_ppe import status_summary
 from fuel_data import get_fuel_properties, get_all_fuel_names
 
 st.set_page_config(page_title="CFEES-DRDO Pool Fire & PPE Safety Simulator", layout="wide")
@@ -30,6 +31,22 @@ st.markdown(
 
 st.markdown("---")
 
+
+# -----------------------------
+# SHARED CACHES
+# -----------------------------
+@st.cache_resource
+def result_cache():
+    # one cache per server process, shared by all sessions; set
+    # FIRE_MODEL_CACHE_DIR to also keep results on disk across restarts
+    return ResultCache(disk_dir=os.environ.get("FIRE_MODEL_CACHE_DIR"))
+
+
+@st.cache_data
+def fuel_properties(fuel):
+    return get_fuel_properties(fuel)
+
+
 # -----------------------------
 # USER INPUTS
 # -----------------------------
@@ -42,7 +59,7 @@ with col1:
     fuel = st.selectbox("Select Fuel Type", get_all_fuel_names())
     
     # Get fuel properties from database
-    fuel_props = get_fuel_properties(fuel)
+    fuel_props = fuel_properties(fuel)
     
 with col2:
     st.markdown("### 📊 Fuel Properties (Auto-populated)")
@@ -56,6 +73,9 @@ left_col, right_col = st.columns([1, 1])
 with left_col:
     m_fuel = st.number_input("Mass of Fuel (kg)", min_value=0.1, step=0.1)
     D = st.number_input("Pool Diameter (m)", min_value=0.1, step=0.1)
+    view_factor = st.radio("Flame View Factor", ["point", "cylinder"], horizontal=True,
+                           help="Point source (original) or solid cylindrical flame")
+    tilt_deg = st.slider("Flame Tilt towards Target (°)", -60, 60, 0, disabled=view_factor != "cylinder")
 
 with right_col:
     # Auto-populated fuel properties (fixed density shown)
@@ -108,22 +128,21 @@ if run_sim:
     else:
         st.header("2️⃣ Simulation Results")
 
+        # ---- Files 1-3 (cached per stage) ----
+        results = run_pipeline(fuel, m_fuel, D, layers, exposure_time=600.0,
+                               fuel_props=fuel_props, cache=result_cache(), view_factor=view_factor,
+                               view_options={"tilt_deg": tilt_deg} if view_factor == "cylinder" else None)
+        fire_result = results["fire_result"]
+        df_distance = results["df_distance"]
+        df_ppe, pain_time = results["df_ppe"], results["pain_time"]
+
         # ---- File 1: Pool Fire Model ----
-        fire_result = run_pool_fire_model(
-            fuel, 
-            m_fuel, 
-            D,
-            burning_rate=fuel_props['burning_rate'],
-            lhv_mj=fuel_props['lhv'],
-            combustion_efficiency=fuel_props['combustion_efficiency']
-        )
         st.subheader("🔥 Pool Fire Model (R=0)")
         st.write(f"**Burn Duration:** {fire_result['burn_duration_s']:.2f} s")
         st.write(f"**Peak Heat Flux:** {fire_result['q_peak_W_m2']/1000:.2f} kW/m²")
         st.write(f"**Time at Peak:** {fire_result['t_peak_s']:.2f} s")
 
         # ---- File 2: Distance Model ----
-        df_distance = run_distance_model(fire_result)
         row_selected = df_distance[df_distance["Flux_Approx_100kW"] == True].iloc[0]
         R_selected = row_selected["Distance_m"]
         flux_selected = row_selected["Total_Flux_W_m2"]/1000
@@ -133,8 +152,6 @@ if run_sim:
         st.write(f"**Heat Flux at this Distance:** {flux_selected:.2f} kW/m²")
 
         # ---- File 3: PPE Model ----
-        df_ppe, pain_time = run_ppe_model(df_distance, layers, fire_result['t_peak_s'], exposure_time=600.0)
-
         st.subheader("🛡️ PPE Safety Analysis")
 
         # Pain time
@@ -147,6 +164,10 @@ if run_sim:
         final_status = df_ppe["Exposure_Safety_Status"].iloc[-1]
         st.write(f"**Final Safety Status after 600 s:** {final_status}")
 
+        # Time line of safety levels
+        st.write("**Safety Levels over the Exposure:**")
+        st.dataframe(status_summary(df_ppe)[["First_Entry_s", "Time_In_Level_s"]])
+
         # Layer temperatures at pain time
         if pain_time is not None:
             closest_idx = (df_ppe["Time_s"] - pain_time).abs().idxmin()
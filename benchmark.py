@@ -0,0 +1,646 @@
+# ----------------------------------------------------------
+# BENCHMARKS AND GOLDEN-VALUE CHECKS
+# Timing and peak memory of the fire, distance and PPE models
+# and the end-to-end pipeline over a range of sizes, plus a
+# check of the main.py scenario against recorded results and
+# regression checks of fixed bugs
+# Usage: python benchmark.py [--quick] [--suite NAME ...]
+#                            [--json out.json] [--compare old.json]
+# ----------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time as _time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from burn_injury import SkinDamage
+from file1_time import run_pool_fire_model, run_pool_fire_batch
+from file2_distance import run_distance_model, solve_threshold_distances
+from file3_ppe import run_ppe_model, run_ppe_batch, status_summary
+from fuel_data import FUEL_DATABASE, FuelRegistry, get_fuel_properties
+from inverse_design import min_layer_thickness, min_standoff_distance
+from monte_carlo import run_monte_carlo
+from pipeline import run_pipeline
+from results_io import load_results, save_results
+from runner import run_scenarios
+from spill_fire import run_spill_fire_model
+from site_hazard import place_fire, site_flux_raster, iso_flux_contours
+from view_factor import flame_view_factor
+
+
+BASE_LAYERS = [
+    {"name": "Outer Shell",      "d": 0.0007, "k": 0.25, "rho": 450, "cp": 1400, "eps": 0.8},
+    {"name": "Moisture Barrier", "d": 0.0005, "k": 0.20, "rho": 900, "cp": 1300, "eps": 0.7},
+    {"name": "Thermal Liner",    "d": 0.0030, "k": 0.05, "rho": 120, "cp": 1400, "eps": 0.9},
+    {"name": "Inner Liner",      "d": 0.0005, "k": 0.10, "rho": 300, "cp": 1300, "eps": 0.9},
+]
+
+
+def _best_time(func, repeat=3):
+    """Best wall time of repeat calls, plus the last result."""
+    best = np.inf
+    for _ in range(repeat):
+        t0 = _time.perf_counter()
+        result = func()
+        best = min(best, _time.perf_counter() - t0)
+    return best, result
+
+
+def _measure(func, repeat=3):
+    """Best wall time over repeat calls and peak traced memory of one call (MiB)."""
+    elapsed, result = _best_time(func, repeat)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time_s": elapsed, "peak_mib": peak / 2**20}, result
+
+
+def _stack(n_layers):
+    """Garment stack of n_layers built by cycling the four base layers."""
+    return [dict(BASE_LAYERS[i % 4], name=f"L{i}") for i in range(n_layers)]
+
+
+def _reference_ppe(df_distance, layers, t_peak, exposure_time=600.0):
+    """Per-step, per-layer formulation of run_ppe_model (reference only)."""
+    row = df_distance[df_distance["Flux_Approx_100kW"] == True].iloc[0]
+    q_rad_ref = row["Radiative_Flux_W_m2"]
+    q_conv_ref = row["Convective_Flux_W_m2"]
+
+    sigma, T_amb, h_skin, dt = 5.67e-8, 300.0, 10.0, 0.1
+    time = np.arange(0, exposure_time + dt, dt)
+    n_layers = len(layers)
+    T = np.ones(n_layers) * T_amb
+    T_hist = np.zeros((len(time), n_layers))
+    q_skin = np.zeros(len(time))
+
+    def h_air_gap(T1, T2):
+        Tm = 0.5 * (T1 + T2)
+        h_rad = 4 * sigma * Tm**3 / (1/0.8 + 1/0.8 - 1)
+        return 0.026 / 0.001 + h_rad
+
+    for n, t in enumerate(time):
+        fire_factor = 0.0 if t <= 0 else (t / t_peak) * np.exp(1 - t / t_peak)
+        q_in = layers[0]["eps"] * q_rad_ref * fire_factor + q_conv_ref * fire_factor
+        T_new = T.copy()
+        for i, layer in enumerate(layers):
+            mcp = layer["rho"] * layer["cp"] * layer["d"]
+            q_left = q_in if i == 0 else h_air_gap(T[i-1], T[i]) * (T[i-1] - T[i])
+            if i < n_layers - 1:
+                q_right = h_air_gap(T[i], T[i+1]) * (T[i] - T[i+1])
+            else:
+                q_right = h_skin * (T[i] - T_amb)
+                q_skin[n] = q_right
+            T_new[i] += (q_left - q_right) / mcp * dt
+        T = T_new
+        T_hist[n, :] = T
+
+    return T_hist, q_skin
+
+
+def bench_ppe_solver(layer_counts=(4, 8, 16), exposure_times=(60.0, 600.0)):
+    """Reference loop vs array solver over layer count and exposure length."""
+    fire_result = run_pool_fire_model("Gasoline", 14.8, 2.0)
+    df_distance = run_distance_model(fire_result)
+    t_peak = fire_result["t_peak_s"]
+
+    rows = []
+    for n_layers in layer_counts:
+        layers = _stack(n_layers)
+        for exposure_time in exposure_times:
+            t_ref, (T_ref, q_ref) = _best_time(
+                lambda: _reference_ppe(df_distance, layers, t_peak, exposure_time))
+            t_new, (df_ppe, _) = _best_time(
+                lambda: run_ppe_model(df_distance, layers, t_peak, exposure_time))
+
+            T_new = df_ppe[[f"T_{layer['name']}_K" for layer in layers]].to_numpy()
+            identical = (np.array_equal(T_ref, T_new, equal_nan=True)
+                         and np.array_equal(q_ref, df_ppe["q_skin_W_m2"].to_numpy(), equal_nan=True))
+
+            rows.append({
+                "n_layers": n_layers,
+                "exposure_time_s": exposure_time,
+                "reference_s": t_ref,
+                "array_s": t_new,
+                "speedup": t_ref / t_new,
+                "identical": identical,
+            })
+
+    return pd.DataFrame(rows)
+
+
+def bench_ppe_batch(n_stacks=(10, 100), n_distances=5, exposure_time=600.0):
+    """Batched stacks × distances vs one run_ppe_model call per configuration."""
+    fire_result = run_pool_fire_model("Gasoline", 14.8, 2.0)
+    df_distance = run_distance_model(fire_result)
+    t_peak = fire_result["t_peak_s"]
+    t_single, _ = _best_time(lambda: run_ppe_model(df_distance, BASE_LAYERS, t_peak, exposure_time))
+
+    rows = []
+    for n in n_stacks:
+        stacks = [[dict(layer, d=layer["d"] * f) for layer in BASE_LAYERS]
+                  for f in np.linspace(0.5, 3.0, n)]
+        distances = np.linspace(3.0, 15.0, n_distances)
+        t_batch, _ = _best_time(
+            lambda: run_ppe_batch(df_distance, stacks, t_peak, distances, exposure_time), repeat=1)
+        n_cfg = n * n_distances
+        rows.append({
+            "configurations": n_cfg,
+            "sequential_est_s": t_single * n_cfg,
+            "batch_s": t_batch,
+            "speedup": t_single * n_cfg / t_batch,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def bench_ppe_conduction(node_counts=(1, 3, 9, 33), n_stacks=(1, 100), exposure_time=600.0):
+    """Through-thickness nodes per layer: single stack and stack batches (implicit, dt 0.1)."""
+    fire_result = _reference_fire()
+    df_distance = run_distance_model(fire_result)
+    t_peak = fire_result["t_peak_s"]
+
+    rows = []
+    for nodes in node_counts:
+        for n in n_stacks:
+            stacks = [BASE_LAYERS] * n
+            stats, result = _measure(lambda: run_ppe_batch(df_distance, stacks, t_peak, exposure_time=exposure_time,
+                                                           method="implicit", dt=0.1, nodes_per_layer=nodes),
+                                     repeat=1)
+            rows.append(dict({"nodes_per_layer": nodes, "stacks": n,
+                              "pain_time_s": result["Pain_Time_s"].iloc[0]}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_burn_injury(batch_sizes=(1, 100, 1000), exposure_time=600.0, dt=0.1):
+    """Streaming Henriques burn injury over the number of exposures advanced together."""
+    time = np.arange(0, exposure_time + dt, dt)
+    rows = []
+    for n in batch_sizes:
+        q_skin = np.linspace(40e3, 2e3, n)
+
+        def run():
+            skin = SkinDamage(n)
+            for t in time:
+                skin.update(t, q_skin)
+            return skin.summary()
+
+        stats, summary = _measure(run, repeat=1)
+        rows.append(dict({"exposures": n, "steps": len(time),
+                          "second_degree_s_40kW": summary["Second_Degree_s"].iloc[0]}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_ppe_integrators(exposure_times=(600.0, 3600.0)):
+    """Steps, wall time and pain time for each run_ppe_model integrator."""
+    fire_result = run_pool_fire_model("Gasoline", 14.8, 2.0)
+    df_distance = run_distance_model(fire_result)
+    t_peak = fire_result["t_peak_s"]
+
+    rows = []
+    for exposure_time in exposure_times:
+        for method in ("euler", "implicit", "adaptive"):
+            elapsed, (df_ppe, pain_time) = _best_time(
+                lambda: run_ppe_model(df_distance, BASE_LAYERS, t_peak, exposure_time, method=method))
+            rows.append({
+                "exposure_time_s": exposure_time,
+                "method": method,
+                "rows": len(df_ppe),
+                "time_s": elapsed,
+                "pain_time_s": pain_time,
+            })
+
+    return pd.DataFrame(rows)
+
+
+# -------------------------------------------------
+# SIZE SWEEPS (parameters, then time_s and peak_mib)
+# -------------------------------------------------
+def _reference_fire():
+    props = get_fuel_properties("Gasoline")
+    return run_pool_fire_model("Gasoline", 14.8, 2.0, props["burning_rate"], props["lhv"],
+                               props["combustion_efficiency"])
+
+
+def bench_fire(n_points=(300, 3000, 30000)):
+    """run_pool_fire_model over time resolution."""
+    rows = []
+    for n in n_points:
+        stats, _ = _measure(lambda: run_pool_fire_model("Gasoline", 14.8, 2.0, n_points=n))
+        rows.append(dict({"n_points": n}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_fire_batch(batch_sizes=(10, 100, 1000), n_points=300):
+    """run_pool_fire_batch over the number of scenarios."""
+    rows = []
+    for n in batch_sizes:
+        masses = np.linspace(5.0, 50.0, n)
+        stats, _ = _measure(lambda: run_pool_fire_batch("Gasoline", masses, 2.0, n_points=n_points))
+        rows.append(dict({"scenarios": n, "n_points": n_points}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_distance(n_points=(300, 3000, 30000)):
+    """run_distance_model over radial resolution, and the threshold solver."""
+    fire_result = _reference_fire()
+    rows = []
+    for n in n_points:
+        stats, _ = _measure(lambda: run_distance_model(fire_result, n_points=n))
+        rows.append(dict({"solver": "grid", "n_points": n}, **stats))
+    stats, _ = _measure(lambda: solve_threshold_distances(fire_result, [100e3, 37.5e3, 12.5e3, 4.7e3]))
+    rows.append(dict({"solver": "bisection", "n_points": 0}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_view_factor(grid_sizes=(300, 3000), n_times=300):
+    """Flame view factors over a (time × distance) grid, per model."""
+    R = np.linspace(0.0, 50.0, max(grid_sizes))
+    H = np.linspace(1.0, 6.0, n_times)[:, None]
+    flame_view_factor(R[:10], 2.0, H, "cylinder", tilt_deg=10.0)   # builds the tilt table once
+
+    rows = []
+    for label, model, options in [("point", "point", {}), ("cylinder", "cylinder", {}),
+                                  ("cylinder_tilted", "cylinder", {"tilt_deg": 20.0})]:
+        for n in grid_sizes:
+            stats, _ = _measure(lambda: flame_view_factor(R[:n], 2.0, H, model, **options))
+            rows.append(dict({"model": label, "n_R": n, "n_times": n_times}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_site_hazard(raster_sizes=(1000, 4000), n_sources=(10, 40)):
+    """Multi-fire site raster (1 m cells) and its iso-flux contours."""
+    fires = [_reference_fire(), run_pool_fire_model("Diesel", 5000.0, 15.0)]
+    rng = np.random.default_rng(0)
+
+    rows = []
+    for size in raster_sizes:
+        for n in n_sources:
+            sources = [place_fire(fires[i % 2], *rng.uniform(0, size, 2)) for i in range(n)]
+            stats, raster = _measure(lambda: site_flux_raster(sources, (0, size, 0, size), 1.0), repeat=1)
+            rows.append(dict({"stage": "raster", "cells": size * size, "sources": n,
+                              "evaluated_fraction": raster["evaluated_fraction"]}, **stats))
+            stats, _ = _measure(lambda: iso_flux_contours(raster), repeat=1)
+            rows.append(dict({"stage": "contours", "cells": size * size, "sources": n,
+                              "evaluated_fraction": np.nan}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_ppe(exposure_times=(60.0, 600.0, 3600.0), layer_counts=(4, 16), methods=("euler", "implicit")):
+    """run_ppe_model over exposure length, layer count and integrator."""
+    fire_result = _reference_fire()
+    df_distance = run_distance_model(fire_result)
+    t_peak = fire_result["t_peak_s"]
+
+    rows = []
+    for method in methods:
+        for n_layers in layer_counts:
+            layers = _stack(n_layers)
+            for exposure_time in exposure_times:
+                stats, _ = _measure(lambda: run_ppe_model(df_distance, layers, t_peak, exposure_time,
+                                                          method=method))
+                rows.append(dict({"method": method, "n_layers": n_layers, "exposure_time_s": exposure_time},
+                                 **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_pipeline(batch_sizes=(1, 8, 32)):
+    """End-to-end fire → distance → PPE, uncached, one process."""
+    rows = []
+    stats, _ = _measure(lambda: run_pipeline("Gasoline", 14.8, 2.0, BASE_LAYERS, cache=None))
+    rows.append(dict({"runner": "run_pipeline", "scenarios": 1}, **stats))
+
+    for n in batch_sizes:
+        scenarios = pd.DataFrame({"Fuel": "Gasoline", "m_fuel_kg": np.linspace(5.0, 50.0, n), "D_m": 2.0})
+        stats, _ = _measure(lambda: run_scenarios(scenarios, workers=1, cache=None), repeat=1)
+        rows.append(dict({"runner": "run_scenarios", "scenarios": n}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_monte_carlo(sample_counts=(1000, 10_000, 100_000), methods=("lhs",)):
+    """Monte Carlo fire → distance → PPE over the number of samples (one process)."""
+    rows = []
+    for method in methods:
+        for n in sample_counts:
+            stats, out = _measure(lambda: run_monte_carlo("Gasoline", 14.8, 2.0, BASE_LAYERS, n_samples=n,
+                                                          method=method, seed=0, workers=1), repeat=1)
+            bands = out["df_bands"]
+            rows.append(dict({"method": method, "samples": n,
+                              "pain_time_p50_s": bands.at["Pain_Time_s", "P50"],
+                              "distance_p50_m": bands.at["Distance_m", "P50"]}, **stats))
+    return pd.DataFrame(rows)
+
+
+def bench_inverse_design(target_times=(30.0, 60.0, 300.0)):
+    """Inverse queries: closest standoff distance and thinnest Thermal Liner per target pain time."""
+    fire_result = _reference_fire()
+    rows = []
+    for target in target_times:
+        stats, out = _measure(lambda: min_standoff_distance(fire_result, BASE_LAYERS, target))
+        rows.append(dict({"query": "distance", "target_time_s": target, "value": out["distance_m"],
+                          "solves": out["solves"]}, **stats))
+        stats, out = _measure(lambda: min_layer_thickness(fire_result, BASE_LAYERS, "Thermal Liner", target,
+                                                          distance=4.0))
+        rows.append(dict({"query": "thickness", "target_time_s": target, "value": out["thickness_m"],
+                          "solves": out["solves"]}, **stats))
+    return pd.DataFrame(rows)
+
+
+# -------------------------------------------------
+# GOLDEN VALUES (main.py scenario: 14.8 kg gasoline, D = 2 m)
+# -------------------------------------------------
+GOLDEN = {
+    "burn_duration_s": 85.65429664582004,
+    "q_peak_W_m2": 456542.8975662216,
+    "t_peak_s": 42.6839137131344,
+    "selected_distance_m": 3.177257525083612,
+    "selected_flux_W_m2": 96167.75641630855,
+    "distance_100kW_m": 3.097867965698242,
+    "pain_time_s": 23.1,
+    "burn_risk_time_s": 26.1,
+    "not_safe_time_s": 28.4,
+}
+GOLDEN_RTOL = 1e-9
+GOLDEN_STATUS = "NOT_SAFE"
+
+
+def check_golden():
+    """Run the main.py scenario and compare its key outputs with GOLDEN."""
+    out = run_pipeline("Gasoline", 14.8, 2.0, BASE_LAYERS, cache=None)
+    fire_result = out["fire_result"]
+    df_distance = out["df_distance"]
+    df_ppe = out["df_ppe"]
+    selected = df_distance[df_distance["Flux_Approx_100kW"] == True].iloc[0]
+    first_entry = status_summary(df_ppe)["First_Entry_s"]
+
+    actual = {
+        "burn_duration_s": fire_result["burn_duration_s"],
+        "q_peak_W_m2": fire_result["q_peak_W_m2"],
+        "t_peak_s": fire_result["t_peak_s"],
+        "selected_distance_m": selected["Distance_m"],
+        "selected_flux_W_m2": selected["Total_Flux_W_m2"],
+        "distance_100kW_m": solve_threshold_distances(fire_result, 100e3)["Distance_m"].iloc[0],
+        "pain_time_s": np.nan if out["pain_time"] is None else out["pain_time"],
+        "burn_risk_time_s": first_entry["BURN_RISK"],
+        "not_safe_time_s": first_entry["NOT_SAFE"],
+    }
+
+    rows = []
+    for name, expected in GOLDEN.items():
+        value = float(actual[name])
+        rel_error = abs(value - expected) / abs(expected)
+        rows.append({"quantity": name, "expected": expected, "actual": value,
+                     "rel_error": rel_error, "ok": bool(rel_error <= GOLDEN_RTOL)})
+
+    final_status = str(df_ppe["Exposure_Safety_Status"].iloc[-1])
+    rows.append({"quantity": "final_status", "expected": GOLDEN_STATUS, "actual": final_status,
+                 "rel_error": np.nan, "ok": final_status == GOLDEN_STATUS})
+    return pd.DataFrame(rows)
+
+
+# -------------------------------------------------
+# REGRESSION CHECKS (behaviour that once broke)
+# -------------------------------------------------
+def _check_registry_partial_update():
+    """A partial update of a registered fuel keeps its other properties."""
+    registry = FuelRegistry.from_dict(FUEL_DATABASE)
+    registry.add("Gasoline", burning_rate=0.06)
+    registry.add_many([{"name": "Gasoline", "lhv": 44.0, "density": None}])
+    expected = dict(FUEL_DATABASE["Gasoline"], burning_rate=0.06, lhv=44.0)
+    actual = registry.get("Gasoline")
+    return actual == expected, str(actual)
+
+
+def _check_ppe_euler_identical():
+    """The default Euler run_ppe_model history is bit-identical to the per-layer loop (NaN rows included)."""
+    fire_result = run_pool_fire_model("Gasoline", 14.8, 2.0)
+    df_distance = run_distance_model(fire_result)
+    T_ref, q_ref = _reference_ppe(df_distance, BASE_LAYERS, fire_result["t_peak_s"])
+    df_ppe, _ = run_ppe_model(df_distance, BASE_LAYERS, fire_result["t_peak_s"])
+
+    T_new = df_ppe[[f"T_{layer['name']}_K" for layer in BASE_LAYERS]].to_numpy()
+    identical = (np.array_equal(T_ref, T_new, equal_nan=True)
+                 and np.array_equal(q_ref, df_ppe["q_skin_W_m2"].to_numpy(), equal_nan=True))
+    return identical, f"{len(df_ppe)} rows compared"
+
+
+def _check_results_round_trip():
+    """Stored results (float32 default) feed the distance and PPE models like a fresh run."""
+    cases = [(14.8, 2.0), (100.0, 3.0), (500.0, 5.0)]
+    errors = []
+    with tempfile.TemporaryDirectory() as store:
+        for i, (m_fuel, D) in enumerate(cases):
+            fire_result = run_pool_fire_model("Gasoline", m_fuel, D)
+            df_distance = run_distance_model(fire_result)
+            _, pain_time = run_ppe_model(df_distance, BASE_LAYERS, fire_result["t_peak_s"])
+
+            save_results(store, f"case{i}", {"fire_result": fire_result, "df_distance": df_distance})
+            loaded = load_results(store, f"case{i}")
+            df_loaded = run_distance_model(loaded["fire_result"])
+            _, pain_loaded = run_ppe_model(loaded["df_distance"], BASE_LAYERS, loaded["fire_result"]["t_peak_s"])
+
+            q, q_loaded = df_distance["Total_Flux_W_m2"].to_numpy(), df_loaded["Total_Flux_W_m2"].to_numpy()
+            errors.append(float(np.max(np.abs(q_loaded - q) / q)))
+            if pain_loaded != pain_time:
+                return False, f"Gasoline {m_fuel} kg, D = {D} m: pain time {pain_loaded} s vs {pain_time} s"
+    return max(errors) < 1e-6, f"max flux rel. error {max(errors):.1e}, pain times equal"
+
+
+def _spill_mass_burned(result, props):
+    df = result["df_flux"]
+    return np.trapezoid(df["HRR_W"], df["Time_s"]) / (props["lhv"] * 1e6 * props["combustion_efficiency"])
+
+
+def _check_spill_mass_balance():
+    """Spill fires burn the released mass (integral of m'' A dt), confined or not, in any release mode."""
+    props = get_fuel_properties("Gasoline")
+    cases = [
+        {"m_fuel": 1e3}, {"m_fuel": 1e5}, {"m_fuel": 500.0, "D_max": 5.0}, {"m_fuel": 1e6, "D_max": 20.0},
+        {"m_fuel": 1e5, "release": "continuous", "release_rate": 1e5 / 600, "D_max": 30.0},
+    ]
+    ratios = [_spill_mass_burned(run_spill_fire_model("Gasoline", n_points=3000, **case), props) / case["m_fuel"]
+              for case in cases]
+    return max(abs(r - 1) for r in ratios) < 2e-3, f"burned / released: {np.round(ratios, 5).tolist()}"
+
+
+def _check_spill_large_inventory():
+    """A large bunded spill burns out at the closed-form time in a few adaptive steps."""
+    props = get_fuel_properties("Gasoline")
+    m_fuel, D_max, h_min = 1e7, 20.0, 0.005
+    result = run_spill_fire_model("Gasoline", m_fuel, D_max=D_max, h_min=h_min)
+
+    # constant-area burn down to the h_min film, then the sqrt(V) break-up
+    A = np.pi * D_max**2 / 4
+    regression = props["burning_rate"] / props["density"]
+    t_expected = ((m_fuel / props["density"] - h_min * A) / (regression * A)
+                  + 2 * h_min / regression)
+    rel_error = abs(result["burn_duration_s"] - t_expected) / t_expected
+    ok = rel_error < 1e-3 and result["steps"] < 100
+    return ok, f"burn {result['burn_duration_s']:.1f} s vs {t_expected:.1f} s, {result['steps']} steps"
+
+
+REGRESSION_CHECKS = {
+    "registry_partial_update": _check_registry_partial_update,
+    "ppe_euler_identical": _check_ppe_euler_identical,
+    "results_round_trip": _check_results_round_trip,
+    "spill_mass_balance": _check_spill_mass_balance,
+    "spill_large_inventory": _check_spill_large_inventory,
+}
+
+
+def check_regressions():
+    """Run REGRESSION_CHECKS; one row per check with ok and a detail string."""
+    rows = []
+    for name, check in REGRESSION_CHECKS.items():
+        try:
+            ok, detail = check()
+        except Exception as exc:
+            ok, detail = False, f"{type(exc).__name__}: {exc}"
+        rows.append({"check": name, "ok": bool(ok), "detail": detail})
+    return pd.DataFrame(rows)
+
+
+# -------------------------------------------------
+# SUITE
+# -------------------------------------------------
+SUITES = {
+    "fire": bench_fire,
+    "fire_batch": bench_fire_batch,
+    "distance": bench_distance,
+    "view_factor": bench_view_factor,
+    "site_hazard": bench_site_hazard,
+    "ppe": bench_ppe,
+    "ppe_solver": bench_ppe_solver,
+    "ppe_batch": bench_ppe_batch,
+    "ppe_integrators": bench_ppe_integrators,
+    "ppe_conduction": bench_ppe_conduction,
+    "burn_injury": bench_burn_injury,
+    "monte_carlo": bench_monte_carlo,
+    "inverse_design": bench_inverse_design,
+    "pipeline": bench_pipeline,
+}
+
+# smaller sizes for a fast smoke run
+QUICK = {
+    "fire": {"n_points": (300, 3000)},
+    "fire_batch": {"batch_sizes": (10, 100)},
+    "distance": {"n_points": (300, 3000)},
+    "view_factor": {"grid_sizes": (300,)},
+    "site_hazard": {"raster_sizes": (1000,), "n_sources": (10,)},
+    "ppe": {"exposure_times": (60.0, 600.0), "layer_counts": (4,)},
+    "ppe_solver": {"layer_counts": (4,), "exposure_times": (60.0,)},
+    "ppe_batch": {"n_stacks": (10,)},
+    "ppe_integrators": {"exposure_times": (600.0,)},
+    "ppe_conduction": {"node_counts": (1, 5), "n_stacks": (1, 20)},
+    "burn_injury": {"batch_sizes": (1, 100)},
+    "monte_carlo": {"sample_counts": (1000, 10_000)},
+    "inverse_design": {"target_times": (30.0, 60.0)},
+    "pipeline": {"batch_sizes": (1, 4)},
+}
+
+
+def environment():
+    """Versions and machine info stored with the results for comparability."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(suites=None, quick=False):
+    """Golden check plus the selected suites; returns a JSON-serializable dict."""
+    suites = list(SUITES) if suites is None else suites
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown suites: {sorted(unknown)}. Available: {list(SUITES)}")
+
+    report = {"environment": environment(), "golden": check_golden(), "checks": check_regressions(),
+              "results": {}}
+    for name in suites:
+        report["results"][name] = SUITES[name](**(QUICK[name] if quick else {}))
+    return report
+
+
+def _to_json(report):
+    out = dict(report)
+    out["golden"] = json.loads(report["golden"].to_json(orient="records"))
+    out["checks"] = json.loads(report["checks"].to_json(orient="records"))
+    out["results"] = {k: json.loads(v.to_json(orient="records")) for k, v in report["results"].items()}
+    return out
+
+
+def compare(report, baseline):
+    """
+    time_s of matching rows as new / old ratios (below 1 is faster).
+
+    Rows are matched on the parameter columns preceding time_s; suites
+    without a time_s column are skipped.
+    """
+    rows = []
+    for name, df in report["results"].items():
+        if "time_s" not in df.columns or name not in baseline.get("results", {}):
+            continue
+        keys = list(df.columns[:list(df.columns).index("time_s")])
+        old = pd.DataFrame(baseline["results"][name])
+        if old.empty or not set(keys) <= set(old.columns):
+            continue
+        merged = df[keys + ["time_s"]].merge(old[keys + ["time_s"]], on=keys, suffixes=("", "_old"))
+        rows.append(pd.DataFrame({
+            "suite": name,
+            "case": merged[keys].astype(str).apply(
+                lambda r: ", ".join(f"{k}={v}" for k, v in r.items()), axis=1),
+            "time_s_old": merged["time_s_old"],
+            "time_s": merged["time_s"],
+            "ratio": merged["time_s"] / merged["time_s_old"],
+        }))
+    return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and golden-value check of the fire / PPE models.")
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), help="suites to run (default all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore", category=RuntimeWarning)
+    report = run_benchmarks(args.suite, args.quick)
+
+    print("===== GOLDEN VALUES =====")
+    print(report["golden"].to_string(index=False))
+    print("\n===== REGRESSION CHECKS =====")
+    print(report["checks"].to_string(index=False))
+    for name, df in report["results"].items():
+        print(f"\n===== {name.upper()} =====")
+        print(df.to_string(index=False))
+
+    if args.compare:
+        with open(args.compare) as f:
+            ratios = compare(report, json.load(f))
+        print("\n===== COMPARED WITH BASELINE =====")
+        print(ratios.to_string(index=False) if len(ratios) else "no matching rows")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(_to_json(report), f, indent=1)
+
+    return 0 if report["golden"]["ok"].all() and report["checks"]["ok"].all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# ----------------------------------------------------------
+# SKIN BURN INJURY (Henriques damage integral)
+# Heat conduction into a three-layer skin model driven by the
+# PPE skin-side flux, with the Henriques damage integral
+# at the basal layer and the dermis base giving times to
+# 1st, 2nd and 3rd degree burns. State is kept per run, so
+# thousands of PPE runs can be streamed together without
+# storing their histories:
+#
+#   skin = SkinDamage(n=1)
+#   for chunk in iter_ppe_model(...):
+#       skin.feed(chunk["Time_s"], chunk["q_skin_W_m2"])
+#   skin.summary()
+# ----------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from integrators import linear_crossing
+
+
+# -------------------------------------------------
+# TISSUE (ISO 13506 / ASTM F1930 skin model)
+# -------------------------------------------------
+SKIN_LAYERS = [
+    {"name": "Epidermis",    "d": 80e-6,  "k": 0.255, "rho": 1200, "cp": 3598},
+    {"name": "Dermis",       "d": 2.0e-3, "k": 0.523, "rho": 1200, "cp": 3222},
+    {"name": "Subcutaneous", "d": 10e-3,  "k": 0.167, "rho": 1000, "cp": 2760},
+]
+SKIN_INTERVALS = (4, 20, 12)   # grid intervals per tissue layer
+
+T_SKIN_SURFACE = 305.65        # initial surface temperature (32.5 °C)
+T_CORE = 310.15                # body core temperature (37 °C), fixed at the inner boundary
+
+# Henriques rate dΩ/dt = P exp(-ΔE / (R T)) from T_onset on: (T_onset, P, ΔE/R)
+HENRIQUES = [
+    (317.15, 2.185e124, 93534.9),   # 44 – 50 °C
+    (323.15, 1.823e51, 39109.8),    # 50 °C and above
+]
+
+# burn degree -> (damage depth, Ω level)
+BURN_DEGREES = {
+    "First_Degree": ("basal", 0.53),
+    "Second_Degree": ("basal", 1.0),
+    "Third_Degree": ("dermis_base", 1.0),
+}
+
+
+def damage_rate(T):
+    """Henriques damage rate dΩ/dt (1/s) for tissue temperatures T (K)."""
+    T = np.asarray(T, dtype=float)
+    rate = np.zeros(T.shape)
+    for T_on, P, E_R in HENRIQUES:
+        # log form keeps P (up to 1e124) from overflowing
+        active = T >= T_on
+        rate = np.where(active, np.exp(np.log(P) - E_R / np.where(active, T, T_on)), rate)
+    return rate
+
+
+def _tissue_grid(layers, intervals):
+    """
+    Node heat capacities, link conductances and initial temperatures.
+
+    Vertex-centred grid: layer interfaces are nodes (sharing the half cells
+    on both sides), the last node is held at T_CORE. The initial profile is
+    the steady piecewise-linear one from T_SKIN_SURFACE to T_CORE, kept
+    steady by a constant surface loss q_rest.
+
+    Returns (C, G, T0, q_rest, depth_nodes) with depth_nodes mapping
+    "basal" / "dermis_base" to node indices.
+    """
+    if len(intervals) != len(layers) or min(intervals) < 1:
+        raise ValueError("Give a positive number of grid intervals for every tissue layer.")
+
+    C = np.zeros(sum(intervals) + 1)
+    G, resistance = [], []
+    node = 0
+    boundaries = []
+    for layer, n in zip(layers, intervals):
+        dx = layer["d"] / n
+        for _ in range(n):
+            C[node] += 0.5 * layer["rho"] * layer["cp"] * dx
+            C[node + 1] += 0.5 * layer["rho"] * layer["cp"] * dx
+            G.append(layer["k"] / dx)
+            resistance.append(dx / layer["k"])
+            node += 1
+        boundaries.append(node)
+
+    G = np.array(G)
+    R_cum = np.r_[0.0, np.cumsum(resistance)]
+    q_rest = (T_CORE - T_SKIN_SURFACE) / R_cum[-1]
+    T0 = T_SKIN_SURFACE + q_rest * R_cum
+
+    return C, G, T0, q_rest, {"basal": boundaries[0], "dermis_base": boundaries[1]}
+
+
+class SkinDamage:
+    """
+    Streaming skin temperature and burn-damage state of n exposures.
+
+    Feed skin-side flux samples in time order with update(t, q_skin) (q_skin
+    scalar or one value per exposure), or whole histories with feed(); only
+    the current tissue temperatures, damage integrals and event times are
+    kept. The tissue step is backward Euler; its system matrix is constant
+    for a given step, so its inverse is computed once per step length and
+    every step is one (exposures × nodes) matrix product.
+
+    Parameters:
+    - n         : number of exposures advanced together
+    - t0        : start time (s); the flux before the first sample is 0
+    - max_dt    : longest tissue step (s); longer sample intervals are
+                  substepped with the flux interpolated linearly
+    - layers, intervals : tissue layers and grid intervals per layer
+    """
+
+    def __init__(self, n=1, t0=0.0, max_dt=0.1, layers=SKIN_LAYERS, intervals=SKIN_INTERVALS):
+        self.n = n
+        self.max_dt = max_dt
+        self._C, self._G, T0, self._q_rest, self._depth = _tissue_grid(layers, intervals)
+
+        self.t = float(t0)
+        self.T = np.tile(T0, (n, 1))
+        self.q_last = np.zeros(n)
+        self.omega = {depth: np.zeros(n) for depth in self._depth}
+        self.peak_T = {depth: self.T[:, node].copy() for depth, node in self._depth.items()}
+        self.burn_times = {degree: np.full(n, np.nan) for degree in BURN_DEGREES}
+        self._inverse = {}
+
+    def _step_inverse(self, dt):
+        """Inverse of the backward-Euler matrix for step dt (cached)."""
+        key = round(dt, 12)
+        if key not in self._inverse:
+            if len(self._inverse) > 256:
+                self._inverse.clear()
+            n_nodes = len(self._C)
+            A = np.diag(self._C / dt)
+            i = np.arange(n_nodes - 1)
+            A[i, i] += self._G
+            A[i + 1, i + 1] += self._G
+            A[i, i + 1] -= self._G
+            A[i + 1, i] -= self._G
+            # core node held at T_CORE
+            A[-1] = 0.0
+            A[-1, -1] = 1.0
+            self._inverse[key] = np.linalg.inv(A).T
+        return self._inverse[key]
+
+    def update(self, t, q_skin):
+        """Advance to time t (s) with skin-side flux q_skin (W/m²) reached at t."""
+        q_skin = np.broadcast_to(np.asarray(q_skin, dtype=float), (self.n,))
+        span = t - self.t
+        if span < 0:
+            raise ValueError(f"Samples must be in time order (got t = {t} after {self.t}).")
+        if span == 0:
+            self.q_last = q_skin.copy()
+            return self
+
+        n_sub = int(np.ceil(span / self.max_dt - 1e-9))
+        dt = span / n_sub
+        M = self._step_inverse(dt)
+        C_dt = self._C / dt
+
+        for k in range(1, n_sub + 1):
+            t_new = self.t + dt
+            q = self.q_last + (q_skin - self.q_last) * (k / n_sub)
+
+            rhs = self.T * C_dt
+            rhs[:, 0] += q - self._q_rest
+            rhs[:, -1] = T_CORE
+            T_new = rhs @ M
+
+            self._accumulate(self.t, t_new, self.T, T_new)
+            self.T, self.t = T_new, t_new
+
+        self.t = float(t)
+        self.q_last = q_skin.copy()
+        return self
+
+    def _accumulate(self, t0, t1, T0, T1):
+        """Trapezoidal damage over one step and located burn times."""
+        for depth, node in self._depth.items():
+            omega0 = self.omega[depth]
+            omega1 = omega0 + 0.5 * (t1 - t0) * (damage_rate(T0[:, node]) + damage_rate(T1[:, node]))
+            np.fmax(self.peak_T[depth], T1[:, node], out=self.peak_T[depth])
+
+            for degree, (degree_depth, level) in BURN_DEGREES.items():
+                if degree_depth != depth:
+                    continue
+                times = self.burn_times[degree]
+                new = np.isnan(times) & (omega1 >= level)
+                if new.any():
+                    times[new] = linear_crossing(t0, t1, omega0[new], omega1[new], level)
+            self.omega[depth] = omega1
+
+    def feed(self, time, q_skin):
+        """update() over a history: time (n_t,), q_skin (n_t,) or (n_t, n)."""
+        q_skin = np.asarray(q_skin, dtype=float)
+        for i, t in enumerate(np.asarray(time, dtype=float)):
+            self.update(t, q_skin[i])
+        return self
+
+    def summary(self):
+        """
+        Per-exposure results as a DataFrame: <degree>_s burn times (NaN if
+        not reached), damage integrals and peak basal / dermis-base temperatures.
+        """
+        data = {f"{degree}_s": times for degree, times in self.burn_times.items()}
+        data["Omega_Basal"] = self.omega["basal"]
+        data["Omega_Dermis_Base"] = self.omega["dermis_base"]
+        data["Peak_T_Basal_K"] = self.peak_T["basal"]
+        data["Peak_T_Dermis_Base_K"] = self.peak_T["dermis_base"]
+        return pd.DataFrame(data)
+
+
+# -------------------------------------------------
+# POST-PROCESSING OF PPE RESULTS
+# -------------------------------------------------
+def burn_injury(df_ppe, max_dt=0.1, **tissue):
+    """
+    Burn injury for one run_ppe_model history.
+
+    Use a full-resolution history (no every / window thinning), or stream
+    iter_ppe_model chunks through SkinDamage.feed instead.
+
+    Parameters:
+    - df_ppe  : DataFrame from run_ppe_model (Time_s, q_skin_W_m2)
+    - max_dt  : longest tissue step (s)
+    - tissue  : layers / intervals overrides for SkinDamage
+
+    Returns:
+    - dict with first/second/third_degree_s (None if not reached),
+      omega_basal, omega_dermis_base, peak_T_basal_K
+    """
+    time = df_ppe["Time_s"].to_numpy()
+    skin = SkinDamage(1, t0=time[0], max_dt=max_dt, **tissue)
+    skin.feed(time, df_ppe["q_skin_W_m2"].to_numpy())
+
+    row = skin.summary().iloc[0]
+    times = {degree: (None if np.isnan(row[f"{degree}_s"]) else float(row[f"{degree}_s"]))
+             for degree in BURN_DEGREES}
+    return {
+        "first_degree_s": times["First_Degree"],
+        "second_degree_s": times["Second_Degree"],
+        "third_degree_s": times["Third_Degree"],
+        "omega_basal": float(row["Omega_Basal"]),
+        "omega_dermis_base": float(row["Omega_Dermis_Base"]),
+        "peak_T_basal_K": float(row["Peak_T_Basal_K"]),
+    }
@@ -0,0 +1,204 @@
+# ----------------------------------------------------------
+# RESULT CACHE
+# Content-addressed memoization of model stages: in-memory
+# LRU tier with size-based eviction, optional on-disk tier
+# ----------------------------------------------------------
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------------------------
+# KEYS
+# -------------------------------------------------
+def _normalize(obj):
+    """Canonical JSON-compatible form of scenario inputs."""
+    if isinstance(obj, dict):
+        return {str(k): _normalize(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return {"__ndarray__": str(obj.dtype), "shape": list(obj.shape),
+                "data": hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()}
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        # integral floats key like ints (D=2 and D=2.0 are the same scenario);
+        # otherwise repr round-trips exactly
+        obj = float(obj)
+        return int(obj) if obj.is_integer() else repr(obj)
+    if obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, type):
+        return obj.__name__
+    return repr(obj)
+
+
+def cache_key(stage, *args, **kwargs):
+    """SHA-256 key of a stage name and its (normalized) inputs."""
+    payload = json.dumps([stage, _normalize(list(args)), _normalize(kwargs)],
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# -------------------------------------------------
+# SIZE ESTIMATE
+# -------------------------------------------------
+def _sizeof(obj):
+    """Approximate memory footprint in bytes of a cached value."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_sizeof(k) + _sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_sizeof(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+# -------------------------------------------------
+# CACHE
+# -------------------------------------------------
+class ResultCache:
+    """
+    Two-tier memo of stage results keyed by cache_key.
+
+    Parameters:
+    - max_bytes   : memory tier budget; least recently used entries are
+                    evicted once the estimated total exceeds it
+    - max_entries : optional cap on the number of in-memory entries
+    - disk_dir    : optional directory for the pickle tier; entries
+                    evicted from memory are still found there
+
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, max_entries=None, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self._disk_path(key) is not None
+                                        and os.path.exists(self._disk_path(key)))
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def _disk_path(self, key):
+        if self.disk_dir is None:
+            return None
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _store(self, key, value, size):
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._nbytes += size
+
+        while self._entries and (self._nbytes > self.max_bytes
+                                 or (self.max_entries is not None and len(self._entries) > self.max_entries)):
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self._nbytes -= old_size
+
+    def get(self, key, default=None):
+        """Cached value for key (memory first, then disk), or default."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        path = self._disk_path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                value = None
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store(key, value, _sizeof(value))
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Store value under key in memory and, if enabled, on disk."""
+        with self._lock:
+            self._store(key, value, _sizeof(value))
+
+        path = self._disk_path(key)
+        if path is not None:
+            # write-then-rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        return value
+
+    def get_or_compute(self, key, func, *args, **kwargs):
+        """Cached value for key, computing and storing func(*args, **kwargs) on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, func(*args, **kwargs))
+        return value
+
+    def clear(self, disk=False):
+        """Drop the memory tier (and the disk tier if disk=True)."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+        if disk and self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self):
+        """Hit / miss counters and memory use."""
+        return {
+            "entries": len(self._entries),
+            "nbytes": self._nbytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
@@ -8,8 +8,66 @@ import numpy as np
 import pandas as pd
 import math
 
+from correlations import chi_r, tau_f, H_min, tau_atm
+from fuel_data import REGISTRY
+from history import decimation_mask
+from instrumentation import count, stage, timed
+from view_factor import flame_view_factor
 
-def run_pool_fire_model(fuel, m_fuel, D, burning_rate=0.055, lhv_mj=43.7, combustion_efficiency=0.98):
+
+FLUX_COLUMNS = [
+    "Time_s",
+    "HRR_W",
+    "Flame_Height_m",
+    "Radiative_Flux_W_m2",
+    "Convective_Flux_W_m2",
+    "Total_Flux_W_m2"
+]
+
+
+def _hrr_shape(t, t_burn):
+    """Parabolic HRR growth/decay factor 4(t/t_burn)(1 - t/t_burn) >= 0."""
+    s = t / t_burn
+    return np.maximum(0.0, 4 * s * (1 - s))
+
+
+def _flame_flux(HRR, D, chi_r_val, tau_f_val, R=0.0, view_factor="point", view_options=None):
+    """
+    Flame height and flux components for HRR values (broadcasting).
+
+    HRR, D, chi_r_val, tau_f_val and R may be scalars or arrays of
+    compatible shapes; returns (H, q_rad, q_conv, q_total). view_factor
+    and view_options select the flame view factor (see view_factor.py).
+    """
+    HRR_kW = HRR / 1000.0
+
+    H_corr = 0.235 * HRR_kW**0.4 - 1.02 * D
+    H = np.maximum(H_corr, H_min(D))
+
+    A_proj = D * H
+    E_surface = (chi_r_val * HRR / A_proj) * tau_f_val
+
+    F_geom = flame_view_factor(R, D, H, view_factor, **(view_options or {}))
+
+    q_rad = E_surface * F_geom * tau_atm(R)
+    q_conv = (1 - chi_r_val) * HRR / A_proj
+    q_total = q_rad + q_conv
+
+    return H, q_rad, q_conv, q_total
+
+
+@timed("fire.model")
+def run_pool_fire_model(fuel, m_fuel, D, burning_rate=0.055, lhv_mj=43.7, combustion_efficiency=0.98,
+                        n_points=300, every=None, window=None, view_factor="point", view_options=None):
+    """
+    Pool fire at the seat of fire (R = 0) over the burn duration.
+
+    n_points sets the time resolution. every / window thin df_flux (every
+    Nth row, or the min/max Total_Flux_W_m2 rows per window of N); key
+    outputs use the full resolution and the peak and final rows are kept.
+    view_factor ("point" or "cylinder") and view_options are kept in the
+    result and reused by the distance model.
+    """
 
     # ==========================================================
     # FUEL PROPERTIES
@@ -22,105 +80,150 @@ def run_pool_fire_model(fuel, m_fuel, D, burning_rate=0.055, lhv_mj=43.7, combus
     R = 0.0
 
     # ==========================================================
-    # PIECEWISE CORRELATIONS
-    # ==========================================================
-
-    def chi_r(D):
-        if D <= 5:
-            return 0.25
-        elif D < 30:
-            return 0.25 - 0.20 * (D - 5) / 25
-        else:
-            return 0.05
-
-    def kappa_f(D):
-        if D <= 5:
-            return 0.04
-        elif D < 30:
-            return 0.04 + 0.08 * (D - 5) / 25
-        else:
-            return 0.12
-
-    def tau_f(D):
-        return math.exp(-kappa_f(D) * (2 * D))
-
-    def H_min(D):
-        if D <= 5:
-            return 0.25 * D
-        elif D < 30:
-            return 0.25 * D + 0.25 * (D - 5)
-        else:
-            return 0.5 * D
-
-    def kappa_atm(R):
-        if R == 0:
-            return 0.0
-        elif R <= 10:
-            return 0.04
-        elif R < 50:
-            return 0.04 + 0.002 * (R - 10)
-        else:
-            return 0.12
-
-    def tau_atm(R):
-        return math.exp(-kappa_atm(R) * R)
-
-    # ==========================================================
-    # CORE CALCULATIONS
+    # CORE CALCULATIONS (whole time vector at once)
     # ==========================================================
 
     A_pool = math.pi * D**2 / 4.0
     t_burn = m_fuel / (m_dot_area * A_pool)
-    time = np.linspace(0, t_burn, 300)
+    time = np.linspace(0, t_burn, n_points)
 
-    rows = []
+    f = _hrr_shape(time, t_burn)
+    HRR = m_dot_area * A_pool * LHV * eta * f
 
-    for t in time:
+    H, q_rad, q_conv, q_total = _flame_flux(HRR, D, chi_r(D), tau_f(D), R, view_factor, view_options)
 
-        f = 4 * (t / t_burn) * (1 - t / t_burn)
-        f = max(0.0, f)
+    idx_peak = int(np.argmax(q_total))
 
-        HRR = m_dot_area * A_pool * LHV * eta * f
-        HRR_kW = HRR / 1000.0
+    keep = decimation_mask(n_points, every, window, q_total)
+    keep[[idx_peak, -1]] = True
 
-        H_corr = 0.235 * HRR_kW**0.4 - 1.02 * D
-        H = max(H_corr, H_min(D))
+    count("fire.model", n_points)
+    with stage("fire.frame"):
+        df = pd.DataFrame(dict(zip(FLUX_COLUMNS, [
+            time[keep], HRR[keep], H[keep], q_rad[keep], q_conv[keep], q_total[keep]
+        ])))
 
-        A_proj = D * H
-        E_surface = (chi_r(D) * HRR / A_proj) * tau_f(D)
+    q_peak = q_total[idx_peak]
+    t_peak = time[idx_peak]
+
+    return {
+        "fuel": fuel,
+        "burn_duration_s": t_burn,
+        "q_peak_W_m2": q_peak,
+        "t_peak_s": t_peak,
+        "D_m": D,
+        "chi_r": float(chi_r(D)),
+        "tau_f": float(tau_f(D)),
+        "view_factor": view_factor,
+        "view_options": dict(view_options or {}),
+        "df_flux": df
+    }
 
-        denom = 4 * math.pi * (R**2 + (H / 2)**2)
-        F_geom = A_proj / denom if denom > 0 else 0.0
-        F_geom = min(F_geom, 1.0)
 
-        tau_atm_val = tau_atm(R)
+@timed("fire.batch")
+def run_pool_fire_batch(fuels, m_fuel, D, burning_rate=None, lhv_mj=None, combustion_efficiency=None,
+                        n_points=300, keep_series=True, long_format=True, every=None, chunk_size=4096,
+                        registry=None, view_factor="point", view_options=None):
+    """
+    Evaluate many pool-fire scenarios as one (scenario × time) computation.
+
+    Parameters:
+    - fuels     : fuel name or array of names (looked up in registry)
+    - m_fuel    : fuel mass(es) in kg
+    - D         : pool diameter(s) in m
+    - burning_rate, lhv_mj, combustion_efficiency :
+                  optional per-scenario overrides of the database values
+    - n_points  : time points per scenario
+    - keep_series : keep the (scenario × time) arrays; if False only the
+                  per-scenario summary is returned and memory stays bounded
+    - long_format : also build df_flux, one long frame with a Scenario column
+    - every     : keep every Nth time point (and the last) in df_flux
+    - chunk_size  : scenarios evaluated per array pass
+    - registry  : fuel_data.FuelRegistry (default fuel_data.REGISTRY)
+    - view_factor, view_options : flame view factor (see view_factor.py)
+
+    All scenario inputs are broadcast against each other.
+
+    Returns:
+    - dict with per-scenario arrays (burn_duration_s, q_peak_W_m2,
+      t_peak_s), df_summary, series (dict of 2-D arrays keyed by the
+      df_flux column names, or None) and df_flux (or None)
+    """
+    fuels, m_fuel, D = np.broadcast_arrays(np.asarray(fuels, dtype=object),
+                                           np.asarray(m_fuel, dtype=float),
+                                           np.asarray(D, dtype=float))
+    fuels, m_fuel, D = fuels.ravel(), m_fuel.ravel(), D.ravel()
+    n = len(D)
 
-        q_rad = E_surface * F_geom * tau_atm_val
-        q_conv = (1 - chi_r(D)) * HRR / A_proj
-        q_total = q_rad + q_conv
+    # ==========================================================
+    # FUEL PROPERTIES (bulk column lookup)
+    # ==========================================================
+    registry = REGISTRY if registry is None else registry
+    fuel_rows = registry.index(fuels)
 
-        rows.append([
-            t, HRR, H, q_rad, q_conv, q_total
-        ])
+    def per_scenario(override, key):
+        if override is not None:
+            return np.broadcast_to(np.asarray(override, dtype=float), (n,))
+        return registry.columns[key][fuel_rows]
 
-    df = pd.DataFrame(rows, columns=[
-        "Time_s",
-        "HRR_W",
-        "Flame_Height_m",
-        "Radiative_Flux_W_m2",
-        "Convective_Flux_W_m2",
-        "Total_Flux_W_m2"
-    ])
+    m_dot_area = per_scenario(burning_rate, "burning_rate")
+    LHV = per_scenario(lhv_mj, "lhv") * 1e6
+    eta = per_scenario(combustion_efficiency, "combustion_efficiency")
 
-    idx_peak = df["Total_Flux_W_m2"].idxmax()
+    # ==========================================================
+    # CORE CALCULATIONS (chunks of scenarios × full time vector)
+    # ==========================================================
+    A_pool = math.pi * D**2 / 4.0
+    t_burn = m_fuel / (m_dot_area * A_pool)
+    HRR_max = m_dot_area * A_pool * LHV * eta
+
+    q_peak = np.empty(n)
+    t_peak = np.empty(n)
+    series = {col: np.empty((n, n_points)) for col in FLUX_COLUMNS} if keep_series else None
+
+    for start in range(0, n, chunk_size):
+        sl = slice(start, min(start + chunk_size, n))
+        tb = t_burn[sl, None]
+        Dc = D[sl, None]
+
+        time = np.linspace(0, t_burn[sl], n_points, axis=1)
+        HRR = HRR_max[sl, None] * _hrr_shape(time, tb)
+        H, q_rad, q_conv, q_total = _flame_flux(HRR, Dc, chi_r(Dc), tau_f(Dc), 0.0, view_factor, view_options)
+
+        idx_peak = np.argmax(q_total, axis=1)
+        rows = np.arange(len(idx_peak))
+        q_peak[sl] = q_total[rows, idx_peak]
+        t_peak[sl] = time[rows, idx_peak]
+
+        if keep_series:
+            for col, values in zip(FLUX_COLUMNS, [time, HRR, H, q_rad, q_conv, q_total]):
+                series[col][sl] = values
+
+    df_summary = pd.DataFrame({
+        "Scenario": np.arange(n),
+        "Fuel": fuels,
+        "m_fuel_kg": m_fuel,
+        "D_m": D,
+        "burn_duration_s": t_burn,
+        "q_peak_W_m2": q_peak,
+        "t_peak_s": t_peak,
+    })
 
-    q_peak = df.loc[idx_peak, "Total_Flux_W_m2"]
-    t_peak = df.loc[idx_peak, "Time_s"]
+    df_flux = None
+    if keep_series and long_format:
+        keep = decimation_mask(n_points, every)
+        keep[-1] = True
+        data = {"Scenario": np.repeat(np.arange(n), keep.sum())}
+        for col in FLUX_COLUMNS:
+            data[col] = series[col][:, keep].ravel()
+        df_flux = pd.DataFrame(data)
 
     return {
-        "fuel": fuel,
+        "fuel": fuels,
         "burn_duration_s": t_burn,
         "q_peak_W_m2": q_peak,
         "t_peak_s": t_peak,
-        "df_flux": df
+        "df_summary": df_summary,
+        "series": series,
+        "df_flux": df_flux
     }
@@ -5,91 +5,160 @@
 
 import numpy as np
 import pandas as pd
-import math
 
+from file1_time import _flame_flux
+from instrumentation import timed
 
-def run_distance_model(fire_result):
 
-    # ==========================================================
-    # EXTRACT FROM FILE 1 DICTIONARY
-    # ==========================================================
-    df_time = fire_result["df_flux"]
-    t_peak = fire_result["t_peak_s"]
-
-    # Get peak row directly
-    peak_row = df_time[df_time["Time_s"] == t_peak].iloc[0]
+R_C = 2.0  # convective decay length (m)
 
-    HRR = peak_row["HRR_W"]
-    H = peak_row["Flame_Height_m"]
 
-    # Since File1 was seat-of-fire, recompute needed values
-    # ------------------------------------------------------
-    D = 2.0  # must match File1 input (for now fixed)
-    m_dot_area = 0.055
-    LHV = 43.7e6
-    eta = 0.98
+def _radial_flux(R, HRR, D, chi_r, tau_f, view_factor="point", view_options=None):
+    """
+    Flux components at distance(s) R for a fire of given HRR (broadcasting).
 
-    A_pool = math.pi * D**2 / 4.0
-    A_proj = D * H
-
-    chi_r = 0.25  # for D=2 (since D <= 5)
-    tau_f = math.exp(-0.04 * (2 * D))
-
-    E_surface = (chi_r * HRR / A_proj) * tau_f
-
-    # ==========================================================
-    # DISTANCE RANGE
-    # ==========================================================
-    R_values = np.linspace(0, 50, 300)
+    Returns (q_rad, q_conv, q_total).
+    """
+    _, q_rad, q_conv_0, _ = _flame_flux(HRR, D, chi_r, tau_f, R, view_factor, view_options)
 
-    def kappa_atm(R):
-        if R == 0:
-            return 0.0
-        elif R <= 10:
-            return 0.04
-        elif R < 50:
-            return 0.04 + 0.002 * (R - 10)
-        else:
-            return 0.12
+    q_conv = q_conv_0 * np.exp(-R / R_C)
+    q_total = q_rad + q_conv
 
-    def tau_atm(R):
-        return math.exp(-kappa_atm(R) * R)
+    return q_rad, q_conv, q_total
 
-    R_c = 2.0  # convective decay length
 
-    rows = []
-
-    for R in R_values:
-
-        denom = 4 * math.pi * (R**2 + (H / 2)**2)
-        F_geom = A_proj / denom if denom > 0 else 0.0
-        F_geom = min(F_geom, 1.0)
-
-        tau_atm_val = tau_atm(R)
+def _peak_fire_state(fire_result):
+    """HRR at t_peak plus the fire geometry/correlations used by File1."""
+    df_time = fire_result["df_flux"]
+    t_peak = fire_result["t_peak_s"]
 
-        q_rad = E_surface * F_geom * tau_atm_val
+    # Peak row: the time point nearest t_peak (exact for a fresh run, and
+    # robust to a Time_s column that went through a lossy round trip)
+    peak_row = df_time.iloc[int(np.argmin(np.abs(df_time["Time_s"].to_numpy() - t_peak)))]
+
+    return peak_row["HRR_W"], fire_result["D_m"], fire_result["chi_r"], fire_result["tau_f"]
+
+
+def _view_model(fire_result, view_factor=None, view_options=None):
+    """View factor model and options: explicit values, else those of the fire run."""
+    if view_factor is None:
+        view_factor = fire_result.get("view_factor", "point")
+        if view_options is None:
+            view_options = fire_result.get("view_options")
+    return view_factor, view_options or {}
+
+
+def _bisect_distance(threshold, HRR, D, chi_r, tau_f, R_min=0.0, R_max=50.0, tol=1e-4, view=("point", None)):
+    """
+    Distance at which the total flux falls to threshold (broadcasting).
+
+    The total flux decreases monotonically with R, so all thresholds (and
+    fire states) are bisected together. Thresholds above the flux at R_min
+    give R_min; thresholds below the flux at R_max give NaN. view is the
+    (view_factor, view_options) pair.
+    """
+    threshold, HRR, D, chi_r, tau_f = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (threshold, HRR, D, chi_r, tau_f)))
+
+    lo = np.full(threshold.shape, float(R_min))
+    hi = np.full(threshold.shape, float(R_max))
+
+    q_lo = _radial_flux(lo, HRR, D, chi_r, tau_f, *view)[2]
+    q_hi = _radial_flux(hi, HRR, D, chi_r, tau_f, *view)[2]
+
+    n_iter = int(np.ceil(np.log2(max(R_max - R_min, tol) / tol)))
+    for _ in range(n_iter):
+        mid = 0.5 * (lo + hi)
+        above = _radial_flux(mid, HRR, D, chi_r, tau_f, *view)[2] > threshold
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+
+    R = 0.5 * (lo + hi)
+    R = np.where(threshold >= q_lo, float(R_min), R)
+    R = np.where(threshold < q_hi, np.nan, R)
+    return R
+
+
+@timed("distance.threshold")
+def solve_threshold_distances(fire_result, thresholds, R_min=0.0, R_max=50.0, tol=1e-4,
+                              view_factor=None, view_options=None):
+    """
+    Exact distances at which the t_peak total flux equals each threshold.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model
+    - thresholds  : flux threshold(s) in W/m² (e.g. 100e3, 37.5e3, 12.5e3, 4.7e3)
+    - R_min, R_max : search range (m)
+    - tol         : distance tolerance (m)
+    - view_factor, view_options : flame view factor (default: as in fire_result)
+
+    Returns:
+    - DataFrame with Threshold_W_m2 and Distance_m (R_min if the flux never
+      reaches the threshold, NaN if it is still exceeded at R_max)
+    """
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    HRR, D, chi_r, tau_f = _peak_fire_state(fire_result)
+
+    view = _view_model(fire_result, view_factor, view_options)
+
+    R = _bisect_distance(thresholds, HRR, D, chi_r, tau_f, R_min, R_max, tol, view)
+
+    return pd.DataFrame({
+        "Threshold_W_m2": thresholds,
+        "Distance_m": R
+    })
+
+
+@timed("distance.model")
+def run_distance_model(fire_result, R_min=0.0, R_max=50.0, n_points=300, threshold=100_000,
+                       view_factor=None, view_options=None):
+    """
+    Radial flux profile at t_peak on an evenly spaced distance grid.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model (HRR at t_peak, D,
+                    chi_r, tau_f and the view factor model are read from it)
+    - R_min, R_max : distance range (m)
+    - n_points    : grid points between R_min and R_max
+    - threshold   : total flux (W/m²) whose closest grid row is selected
+    - view_factor, view_options : flame view factor (default: as in fire_result)
+
+    Returns:
+    - DataFrame with Distance_m, Radiative_Flux_W_m2, Convective_Flux_W_m2,
+      Total_Flux_W_m2 and Selected (True on the grid row closest to
+      threshold). Flux_Approx_100kW repeats Selected under its legacy
+      name for existing readers; it marks the row chosen for threshold,
+      which is 100 kW/m² only by default.
+    """
 
-        q_conv_0 = (1 - chi_r) * HRR / A_proj
-        q_conv = q_conv_0 * math.exp(-R / R_c)
+    # ==========================================================
+    # EXTRACT FROM FILE 1 DICTIONARY
+    # ==========================================================
+    HRR, D, chi_r, tau_f = _peak_fire_state(fire_result)
+    view = _view_model(fire_result, view_factor, view_options)
 
-        q_total = q_rad + q_conv
+    # ==========================================================
+    # DISTANCE RANGE (whole radial grid at once)
+    # ==========================================================
+    R_values = np.linspace(R_min, R_max, n_points)
 
-        rows.append([R, q_rad, q_conv, q_total])
+    q_rad, q_conv, q_total = _radial_flux(R_values, HRR, D, chi_r, tau_f, *view)
 
-    df_dist = pd.DataFrame(rows, columns=[
-        "Distance_m",
-        "Radiative_Flux_W_m2",
-        "Convective_Flux_W_m2",
-        "Total_Flux_W_m2"
-    ])
+    df_dist = pd.DataFrame({
+        "Distance_m": R_values,
+        "Radiative_Flux_W_m2": q_rad,
+        "Convective_Flux_W_m2": q_conv,
+        "Total_Flux_W_m2": q_total
+    })
 
     # ==========================================================
-    # SELECT ≈100 kW/m²
+    # SELECT ≈ threshold (default 100 kW/m²)
     # ==========================================================
-    threshold = 100_000  # W/m²
-    df_dist["Flux_Approx_100kW"] = False
+    selected_index = int(np.argmin(np.abs(q_total - threshold)))
 
-    selected_index = (df_dist["Total_Flux_W_m2"] - threshold).abs().idxmin()
-    df_dist.loc[selected_index, "Flux_Approx_100kW"] = True
+    flags = np.zeros(n_points, dtype=bool)
+    flags[selected_index] = True
+    df_dist["Selected"] = flags
+    df_dist["Flux_Approx_100kW"] = flags     # legacy name of Selected
 
     return df_dist
@@ -2,20 +2,264 @@
 import numpy as np
 import pandas as pd
 
-def run_ppe_model(df_distance, layers, t_peak, exposure_time=600.0):
+from burn_injury import SkinDamage
+from history import decimation_mask
+from instrumentation import count, stage, timed
+from integrators import solve_tridiagonal, step_doubling, hermite_interp, hermite_crossing, linear_crossing
+
+
+# -------------------------------------------------
+# FIXED CONSTANTS
+# -------------------------------------------------
+SIGMA = 5.67e-8
+T_AMB = 300.0
+H_SKIN = 10.0
+
+AIR_GAP_THICKNESS = 0.001
+K_AIR = 0.026
+EPS_AIR_1 = 0.8
+EPS_AIR_2 = 0.8
+
+# Air gap: h_gap = H_COND + FOUR_SIGMA Tm^3 / EPS_DEN
+H_COND = K_AIR / AIR_GAP_THICKNESS
+FOUR_SIGMA = 4 * SIGMA
+EPS_DEN = 1/EPS_AIR_1 + 1/EPS_AIR_2 - 1
+
+# Skin-flux safety levels: q_skin below STATUS_THRESHOLDS[i] -> STATUS_LEVELS[i]
+STATUS_LEVELS = ["SAFE", "PAIN", "BURN_RISK", "NOT_SAFE"]
+STATUS_THRESHOLDS = [2000.0, 4000.0, 6000.0]
+
+# Exposure_Safety_Status is stored as these codes (int8) with STATUS_LEVELS as lookup
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_LEVELS, ordered=True)
+
+METHODS = ("euler", "implicit", "adaptive")
+
+
+def fire_time_function(t, tp):
+    """Incident-flux time factor (t/tp) exp(1 - t/tp), zero for t <= 0."""
+    t = np.asarray(t, dtype=float)
+    return np.where(t <= 0, 0.0, (t / tp) * np.exp(1 - t / tp))
+
+
+def _incident_flux(time, q_rad_ref, q_conv_ref, t_peak):
+    """Incident radiative and convective flux histories."""
+    fire_factor = fire_time_function(time, t_peak)
+    return q_rad_ref * fire_factor, q_conv_ref * fire_factor
+
+
+def _layer_network(layers, nodes_per_layer=1):
     """
-    PPE heat transfer model over time at a selected distance.
+    Node heat capacities and fixed link conductances of a garment stack.
+
+    Each layer is split into N nodes through its thickness: the first and
+    last sit on the layer faces and carry half a cell of heat capacity,
+    and neighbours are joined by conduction k / dx with dx = d / (N - 1).
+    Adjacent layers are joined face to face through the air gap. N = 1 is
+    the original lumped layer (one node, no internal resistance).
 
     Parameters:
-    - df_distance : DataFrame from distance model (must have Flux_Approx_100kW)
-    - layers      : list of dicts with PPE layer properties
-    - t_peak      : peak fire time from File1 (s)
-    - exposure_time : total simulation time (s)
+    - layers          : list of layer dicts (k is needed for N > 1)
+    - nodes_per_layer : N for every layer, or one value per layer
 
     Returns:
-    - df_ppe      : DataFrame with temperatures, heat flux, safety status
-    - pain_time   : first time wearer feels pain (s)
+    - mcp      : (n_nodes,) heat capacity per node (J/m²·K)
+    - k_link   : (n_nodes - 1,) conduction conductance per link (W/m²·K),
+                 NaN for air-gap links; None when every layer is lumped
+    - owner    : (n_nodes,) layer index of every node
+    """
+    n_nodes = np.broadcast_to(np.asarray(nodes_per_layer), (len(layers),))
+    if (n_nodes < 1).any() or (n_nodes != np.round(n_nodes)).any():
+        raise ValueError("nodes_per_layer must be a positive integer (or one per layer).")
+
+    mcp, k_link, owner = [], [], []
+    for i, (layer, n) in enumerate(zip(layers, n_nodes.astype(int))):
+        if i > 0:
+            k_link.append(np.nan)
+        if n == 1:
+            mcp.append(layer["rho"] * layer["cp"] * layer["d"])
+        else:
+            weights = np.full(n, 1.0 / (n - 1))
+            weights[[0, -1]] *= 0.5
+            mcp.extend(layer["rho"] * layer["cp"] * layer["d"] * weights)
+            k_link.extend([layer["k"] * (n - 1) / layer["d"]] * (n - 1))
+        owner.extend([i] * n)
+
+    k_link = np.array(k_link, dtype=float)
+    if np.isnan(k_link).all():
+        k_link = None
+    return np.array(mcp, dtype=float), k_link, np.array(owner)
+
+
+def _link_conductance(T, k_link=None):
+    """Conductance of every node link: air gap at the mean temperature, or conduction."""
+    Tm = 0.5 * (T[..., :-1] + T[..., 1:])
+    h = H_COND + FOUR_SIGMA * Tm**3 / EPS_DEN
+    if k_link is not None:
+        h = np.where(np.isnan(k_link), h, k_link)
+    return h
+
+
+def _layer_fluxes(T, q_in, k_link=None):
+    """
+    Flux into every node and into the skin for temperatures T (..., nodes).
+
+    Returns (q_left, q_skin); the flux leaving node i is q_left[..., i+1],
+    or q_skin for the last node. Without k_link every node is a lumped layer.
+    """
+    q_left = np.empty(np.shape(T))
+    q_left[..., 0] = q_in
+
+    q_left[..., 1:] = _link_conductance(T, k_link) * (T[..., :-1] - T[..., 1:])
+
+    q_skin = H_SKIN * (T[..., -1] - T_AMB)
+    return q_left, q_skin
+
+
+def _net_flux(q_left, q_skin):
+    """Net flux absorbed by every layer."""
+    net = q_left.copy()
+    net[..., :-1] -= q_left[..., 1:]
+    net[..., -1] -= q_skin
+    return net
+
+
+def _implicit_step(T, q_in, mcp, dt, k_link=None):
+    """
+    Backward-Euler step with the air-gap coefficients lagged at T.
+
+    The node balance becomes one tridiagonal system per configuration,
+    which is stable for any dt and costs O(nodes).
+    """
+    h_gap = _link_conductance(T, k_link)
+    g = dt / mcp
+
+    h_left = np.zeros(np.shape(T))
+    h_right = np.full(np.shape(T), H_SKIN)
+    h_left[..., 1:] = h_gap
+    h_right[..., :-1] = h_gap
+
+    lower = -g * h_left
+    upper = -g * h_right
+    diag = 1 + g * (h_left + h_right)
+
+    rhs = np.array(T, dtype=float)
+    rhs[..., 0] += g[..., 0] * q_in
+    rhs[..., -1] += g[..., -1] * H_SKIN * T_AMB
+
+    return solve_tridiagonal(lower, diag, upper, rhs)
+
+
+def _status_codes(q_skin):
+    """Safety level index (into STATUS_LEVELS) for every skin flux value."""
+    return np.select(
+        [q_skin < STATUS_THRESHOLDS[0], q_skin < STATUS_THRESHOLDS[1], q_skin < STATUS_THRESHOLDS[2]],
+        [0, 1, 2],
+        default=3
+    )
+
+
+def _new_status_summary():
+    return {
+        "first_entry": np.full(len(STATUS_LEVELS), np.nan),
+        "time_in_level": np.zeros(len(STATUS_LEVELS)),
+        "last_time": np.nan,
+        "last_code": -1,
+    }
+
+
+def _update_status_summary(summary, time, codes):
+    """
+    Fold a block of history rows into the running status summary.
+
+    summary holds first_entry (per level, NaN if never reached),
+    time_in_level (per level; each row's status holds until the next row)
+    and the last row's time and code, which links consecutive blocks.
+    """
+    if summary["last_code"] >= 0:
+        summary["time_in_level"][summary["last_code"]] += time[0] - summary["last_time"]
+    summary["time_in_level"] += np.bincount(codes[:-1], weights=np.diff(time), minlength=len(STATUS_LEVELS))
+
+    first = summary["first_entry"]
+    for code in np.unique(codes):
+        if np.isnan(first[code]):
+            first[code] = time[np.argmax(codes == code)]
+
+    summary["last_time"] = time[-1]
+    summary["last_code"] = codes[-1]
+
+
+def _summary_attrs(summary):
+    # plain lists: DataFrame.attrs is compared and deep-copied by pandas
+    return {
+        "First_Entry_s": summary["first_entry"].tolist(),
+        "Time_In_Level_s": summary["time_in_level"].tolist(),
+    }
+
+
+def status_summary(df_ppe):
     """
+    First entry time and total time in each safety level.
+
+    run_ppe_model / iter_ppe_model compute it at full resolution during
+    the run and keep it in df_ppe.attrs["status_summary"]; for other
+    frames (e.g. loaded from a store) it is rebuilt from the integer
+    status codes.
+
+    Returns:
+    - DataFrame indexed by Status with Code, First_Entry_s (NaN if the
+      level is never reached) and Time_In_Level_s
+    """
+    attrs = df_ppe.attrs.get("status_summary")
+    if attrs is None:
+        status = df_ppe["Exposure_Safety_Status"].astype(STATUS_DTYPE)
+        summary = _new_status_summary()
+        if len(df_ppe):
+            _update_status_summary(summary, df_ppe["Time_s"].to_numpy(dtype=float),
+                                   status.cat.codes.to_numpy())
+        attrs = _summary_attrs(summary)
+
+    return pd.DataFrame({
+        "Status": STATUS_LEVELS,
+        "Code": np.arange(len(STATUS_LEVELS), dtype=np.int8),
+        "First_Entry_s": attrs["First_Entry_s"],
+        "Time_In_Level_s": attrs["Time_In_Level_s"],
+    }).set_index("Status")
+
+
+def _new_crossings(prev, row, mcp, reached, hermite):
+    """
+    Threshold crossings between two consecutive rows of states at t.
+
+    prev/row are (t, T, q_left, q_skin) tuples. Each threshold not yet in
+    reached is located inside the step (cubic Hermite using the layer
+    balance as derivative, or linear) and added to reached. Returns a list
+    of (t_event, T_event, level_index).
+    """
+    t0, T0, q_left0, q_skin0 = prev
+    t1, T1, q_left1, q_skin1 = row
+    h = t1 - t0
+
+    if hermite:
+        f0 = _net_flux(q_left0, q_skin0) / mcp
+        f1 = _net_flux(q_left1, q_skin1) / mcp
+    else:
+        f0 = f1 = (T1 - T0) / h
+
+    events = []
+    for k, threshold in enumerate(STATUS_THRESHOLDS):
+        level = k + 1
+        if level in reached or not q_skin1 >= threshold:
+            continue
+        reached.add(level)
+        t_e = float(hermite_crossing(t0, t1, q_skin0, q_skin1, H_SKIN * f0[-1], H_SKIN * f1[-1], threshold))
+        T_e = hermite_interp((t_e - t0) / h, h, T0, T1, f0, f1)
+        events.append((t_e, T_e, level))
+
+    return events
+
+
+def _ppe_setup(df_distance, layers, t_peak, nodes_per_layer=1):
+    """Selected distance row, node network (see _layer_network) and absorbed-flux function."""
 
     # -------------------------------------------------
     # SELECT DISTANCE ROW (~100 kW/m²)
@@ -26,133 +270,568 @@ def run_ppe_model(df_distance, layers, t_peak, exposure_time=600.0):
     q_conv_ref = row["Convective_Flux_W_m2"]
 
     # -------------------------------------------------
-    # FIXED CONSTANTS
+    # LAYER PROPERTIES AS NODE ARRAYS
     # -------------------------------------------------
-    sigma = 5.67e-8
-    T_amb = 300.0
-    h_skin = 10.0
-    dt = 0.1
+    network = _layer_network(layers, nodes_per_layer)
+    eps_outer = layers[0]["eps"]
+
+    def absorbed_flux(time):
+        q_rad, q_conv = _incident_flux(time, q_rad_ref, q_conv_ref, t_peak)
+        return eps_outer * q_rad + q_conv
+
+    return distance_m, q_rad_ref, q_conv_ref, network, absorbed_flux
+
 
-    air_gap_thickness = 0.001
-    k_air = 0.026
-    eps_air_1 = 0.8
-    eps_air_2 = 0.8
+def _ppe_rows(method, absorbed_flux, mcp, exposure_time, dt=None, rtol=1e-4, atol=1e-2, max_step=10.0,
+              k_link=None):
+    """
+    Generator over output rows (t, T, q_left, q_skin) of one garment stack.
+
+    "euler" rows follow the original scheme (fluxes at t, temperatures
+    after the step); the other methods give states and fluxes at t.
+    Yielded arrays may be reused buffers, so copy them to keep them.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Available methods: {list(METHODS)}")
+    if method == "euler" and k_link is not None:
+        raise ValueError("Through-thickness conduction (nodes_per_layer > 1) needs method "
+                         "'implicit' or 'adaptive'; explicit steps are unstable on thin nodes.")
+
+    if method == "euler":
+        dt = 0.1 if dt is None else dt
+        time = np.arange(0, exposure_time + dt, dt)
+        yield from _euler_rows(time, absorbed_flux(time), mcp, dt)
+
+    elif method == "implicit":
+        dt = 1.0 if dt is None else dt
+        time = np.arange(0, exposure_time + dt, dt)
+        q_in = absorbed_flux(time)
+
+        T = np.full(len(mcp), T_AMB)
+        for n, t in enumerate(time):
+            if n > 0:
+                T = _implicit_step(T, q_in[n], mcp, dt, k_link)
+            yield (t, T) + _layer_fluxes(T, q_in[n], k_link)
+
+    else:
+        def step(t, T, h):
+            return _implicit_step(T, absorbed_flux(t + h), mcp, h, k_link)
+
+        T = np.full(len(mcp), T_AMB)
+        yield (0.0, T) + _layer_fluxes(T, absorbed_flux(0.0), k_link)
+        for t, T in step_doubling(step, 0.0, T, exposure_time, rtol=rtol, atol=atol, max_step=max_step):
+            yield (t, T) + _layer_fluxes(T, absorbed_flux(t), k_link)
+
+
+@timed("ppe.model")
+def run_ppe_model(df_distance, layers, t_peak, exposure_time=600.0, method="euler", dt=None,
+                  rtol=1e-4, atol=1e-2, max_step=10.0, every=None, window=None, on_chunk=None,
+                  nodes_per_layer=1):
+    """
+    PPE heat transfer model over time at a selected distance.
+
+    Parameters:
+    - df_distance : DataFrame from distance model (must have Flux_Approx_100kW)
+    - layers      : list of dicts with PPE layer properties
+    - t_peak      : peak fire time from File1 (s)
+    - exposure_time : total simulation time (s)
+    - method      : "euler"    – explicit fixed step (original scheme)
+                    "implicit" – backward Euler, tridiagonal, stable at large dt
+                    "adaptive" – implicit with step-doubling error control
+                                 (rtol, atol, max_step)
+    - dt          : fixed step (s); default 0.1 for euler, 1.0 for implicit
+    - every, window : thin the returned history (see iter_ppe_model)
+    - on_chunk    : optional callable receiving each history chunk as soon
+                    as it has been computed
+    - nodes_per_layer : nodes through each layer's thickness (int or one per
+                    layer); N > 1 resolves conduction with the layer's k and
+                    needs method "implicit" or "adaptive"
+
+    With nodes_per_layer > 1, T_<layer>_K is the heat-capacity weighted
+    mean over the layer's nodes and T_<layer>_node<j>_K the node profile
+    (node 0 on the fire side).
+
+    With "implicit" and "adaptive" the temperatures are the states at each
+    Time_s, and the first crossings of the 2000/4000/6000 W/m² thresholds
+    are located inside the step and added as extra rows.
+
+    Exposure_Safety_Status is a categorical (STATUS_DTYPE) column; the
+    first entry and total time in each level are in
+    df_ppe.attrs["status_summary"] (see status_summary).
+
+    Returns:
+    - df_ppe      : DataFrame with temperatures, heat flux, safety status
+    - pain_time   : first time wearer feels pain (s)
+    """
+    chunks = []
+    for chunk in iter_ppe_model(df_distance, layers, t_peak, exposure_time, method, dt, rtol, atol,
+                                max_step, every=every, window=window, nodes_per_layer=nodes_per_layer):
+        if on_chunk is not None:
+            on_chunk(chunk)
+        chunks.append(chunk)
+
+    df_ppe = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    df_ppe.attrs["status_summary"] = chunks[-1].attrs["status_summary"]
+
+    pain_time = np.float64(df_ppe.attrs["status_summary"]["First_Entry_s"][STATUS_LEVELS.index("PAIN")])
+    pain_time = None if np.isnan(pain_time) else pain_time
+
+    return df_ppe, pain_time
+
+
+def iter_ppe_model(df_distance, layers, t_peak, exposure_time=600.0, method="euler", dt=None,
+                   rtol=1e-4, atol=1e-2, max_step=10.0, every=None, window=None, chunk_size=4096,
+                   nodes_per_layer=1):
+    """
+    Stream the run_ppe_model history as DataFrame chunks while it is computed.
+
+    Only one chunk of rows is held at a time, so memory stays flat however
+    long the exposure is.
+
+    Parameters:
+    - df_distance, layers, t_peak, exposure_time, method, dt, rtol, atol,
+      max_step, nodes_per_layer : as for run_ppe_model
+    - every      : keep every Nth row
+    - window     : keep the rows with the minimum and maximum q_skin in each
+                   window of N rows
+    - chunk_size : rows computed per chunk (rounded up to a multiple of window)
+
+    Rows where the safety status changes, located event rows and the final
+    row are always kept, so first-occurrence times and the final status are
+    unaffected by thinning. Each chunk carries the status summary of the
+    history so far (full resolution) in chunk.attrs["status_summary"].
+
+    Yields:
+    - DataFrame chunks with the run_ppe_model columns
+    """
+    distance_m, q_rad_ref, q_conv_ref, network, absorbed_flux = _ppe_setup(df_distance, layers, t_peak,
+                                                                           nodes_per_layer)
+    mcp, k_link, _ = network
+    if window:
+        chunk_size = -(-chunk_size // window) * window
+
+    n_nodes = len(mcp)
+    buf_time = np.empty(chunk_size)
+    buf_T = np.empty((chunk_size, n_nodes))
+    buf_q_layer = np.empty((chunk_size, n_nodes))
+    buf_q_skin = np.empty(chunk_size)
+    buf_level = np.full(chunk_size, -1)
+    n_buf = 0
+    start = 0
+    prev_code = -1
+    summary = _new_status_summary()
+
+    def flush(last):
+        nonlocal n_buf, start, prev_code
+        time, q_skin, event_level = buf_time[:n_buf], buf_q_skin[:n_buf], buf_level[:n_buf]
+
+        # -------------------------------------------------
+        # SAFETY CLASSIFICATION
+        # -------------------------------------------------
+        codes = _status_codes(q_skin)
+        is_event = event_level >= 0
+        codes[is_event] = event_level[is_event]
+        _update_status_summary(summary, time, codes)
+
+        # -------------------------------------------------
+        # THINNING
+        # -------------------------------------------------
+        keep = decimation_mask(n_buf, every, window, q_skin, start)
+        keep |= is_event
+        keep |= codes != np.r_[prev_code, codes[:-1]]
+        if last:
+            keep[-1] = True
+
+        count("ppe.model", n_buf)
+        with stage("ppe.frame"):
+            frame = _ppe_frame(time[keep], buf_T[:n_buf][keep], buf_q_layer[:n_buf][keep], q_skin[keep],
+                               codes[keep], distance_m, q_rad_ref, q_conv_ref, t_peak, layers, network)
+        frame.attrs["status_summary"] = _summary_attrs(summary)
+
+        start += n_buf
+        prev_code = codes[-1]
+        buf_level[:] = -1
+        n_buf = 0
+        return frame
 
     # -------------------------------------------------
-    # TIME SETTINGS
+    # TIME INTEGRATION (rows plus located events)
     # -------------------------------------------------
-    time = np.arange(0, exposure_time + dt, dt)
-    n_layers = len(layers)
+    reached = set()
+    prev = None
+
+    for row in _ppe_rows(method, absorbed_flux, mcp, exposure_time, dt, rtol, atol, max_step, k_link):
+        t, T, q_left, q_skin = row
+
+        # Implicit/adaptive rows are fresh arrays, so they can be kept as prev
+        if method != "euler":
+            if prev is not None:
+                for t_e, T_e, level in _new_crossings(prev, row, mcp, reached, hermite=method == "adaptive"):
+                    if n_buf == chunk_size:
+                        yield flush(last=False)
+                    q_left_e, q_skin_e = _layer_fluxes(T_e, absorbed_flux(t_e), k_link)
+                    buf_time[n_buf] = t_e
+                    buf_T[n_buf] = T_e
+                    buf_q_layer[n_buf] = q_left_e
+                    buf_q_skin[n_buf] = q_skin_e
+                    buf_level[n_buf] = level
+                    n_buf += 1
+            prev = row
+
+        if n_buf == chunk_size:
+            yield flush(last=False)
+        buf_time[n_buf] = t
+        buf_T[n_buf] = T
+        buf_q_layer[n_buf] = q_left
+        buf_q_skin[n_buf] = q_skin
+        n_buf += 1
+
+    yield flush(last=True)
+
+
+def _ppe_frame(time, T_hist, q_layer, q_skin, codes, distance_m, q_rad_ref, q_conv_ref, t_peak, layers,
+               network):
+    """Output DataFrame for a block of PPE history rows (node histories folded into layers)."""
+    q_rad_t, q_conv_t = _incident_flux(time, q_rad_ref, q_conv_ref, t_peak)
+    q_total_t = q_rad_t + q_conv_t
 
     # -------------------------------------------------
-    # INITIAL TEMPERATURES
+    # OUTPUT DATAFRAME
     # -------------------------------------------------
-    T = np.ones(n_layers) * T_amb
+    data = {
+        "Time_s": time,
+        "Distance_m": distance_m,
+        "Radiative_Flux_Incident_W_m2": q_rad_t,
+        "Convective_Flux_Incident_W_m2": q_conv_t,
+        "Total_Flux_Incident_W_m2": q_total_t,
+        "q_skin_W_m2": q_skin,
+        "Exposure_Safety_Status": pd.Categorical.from_codes(codes.astype(np.int8), dtype=STATUS_DTYPE)
+    }
+
+    mcp, _, owner = network
+    for i, layer in enumerate(layers):
+        nodes = np.flatnonzero(owner == i)
+        if len(nodes) == 1:
+            data[f"T_{layer['name']}_K"] = T_hist[:, nodes[0]]
+        else:
+            data[f"T_{layer['name']}_K"] = T_hist[:, nodes] @ (mcp[nodes] / mcp[nodes].sum())
+        data[f"q_into_{layer['name']}_W_m2"] = q_layer[:, nodes[0]]
+
+    # through-thickness profiles of resolved layers
+    for i, layer in enumerate(layers):
+        nodes = np.flatnonzero(owner == i)
+        if len(nodes) > 1:
+            for j, node in enumerate(nodes):
+                data[f"T_{layer['name']}_node{j}_K"] = T_hist[:, node]
+
+    return pd.DataFrame(data)
+
+
+@timed("ppe.events")
+def run_ppe_events(df_distance, layers, t_peak, exposure_time=600.0, stop_on="PAIN", method="adaptive",
+                   dt=None, rtol=1e-4, atol=1e-2, max_step=10.0, nodes_per_layer=1):
+    """
+    Event-driven PPE run: event times and summary statistics only.
+
+    No per-step history is kept, and the run stops as soon as the stop_on
+    level is reached, so cost scales with time-to-event rather than with
+    exposure_time.
+
+    Parameters:
+    - df_distance, layers, t_peak, exposure_time : as for run_ppe_model
+    - stop_on     : status level ("PAIN", "BURN_RISK", "NOT_SAFE") that ends
+                    the run, or None to simulate the whole exposure
+    - method, dt, rtol, atol, max_step, nodes_per_layer : as for
+                    run_ppe_model (default method "adaptive")
+
+    Event times are the first times each level (or a higher one) is
+    reached: located inside the step for "implicit"/"adaptive", on the
+    time grid for "euler".
+
+    Returns:
+    - dict with event_times_s (level -> time or None), pain_time, stopped,
+      t_end_s, steps, peak_q_skin_W_m2, peak_T_K (layer name -> max T) and
+      final_status
+    """
+    if stop_on is not None and stop_on not in STATUS_LEVELS[1:]:
+        raise ValueError(f"Unknown status '{stop_on}'. Available levels: {STATUS_LEVELS[1:]}")
+    stop_level = None if stop_on is None else STATUS_LEVELS.index(stop_on)
+
+    _, _, _, (mcp, k_link, owner), absorbed_flux = _ppe_setup(df_distance, layers, t_peak, nodes_per_layer)
+
+    event_times = {level: None for level in STATUS_LEVELS[1:]}
+    reached = set()
+    peak_q_skin = -np.inf
+    peak_T = np.full(len(mcp), -np.inf)
+    steps = 0
+    prev = None
+    stopped = False
+
+    for t, T, q_left, q_skin in _ppe_rows(method, absorbed_flux, mcp, exposure_time, dt, rtol, atol, max_step,
+                                          k_link):
+        steps += 1
+        if q_skin > peak_q_skin:
+            peak_q_skin = float(q_skin)
+        np.fmax(peak_T, T, out=peak_T)
+
+        # Level index as in _status_codes (NaN counts as NOT_SAFE)
+        code = sum(not q_skin < threshold for threshold in STATUS_THRESHOLDS)
+
+        if method == "euler":
+            for level in range(1, code + 1):
+                if level not in reached:
+                    reached.add(level)
+                    event_times[STATUS_LEVELS[level]] = t
+        else:
+            row = (t, T.copy(), q_left.copy(), q_skin)
+            if prev is not None:
+                for t_e, _, level in _new_crossings(prev, row, mcp, reached, hermite=method == "adaptive"):
+                    event_times[STATUS_LEVELS[level]] = t_e
+            prev = row
+
+        if stop_level is not None and stop_level in reached:
+            stopped = True
+            break
+
+    count("ppe.events", steps)
+    return {
+        "event_times_s": event_times,
+        "pain_time": event_times["PAIN"],
+        "stopped": stopped,
+        "t_end_s": t,
+        "steps": steps,
+        "peak_q_skin_W_m2": peak_q_skin,
+        "peak_T_K": {layer["name"]: peak_T[owner == i].max() for i, layer in enumerate(layers)},
+        "final_status": STATUS_LEVELS[code]
+    }
+
+
+def _euler_rows(time, q_in, mcp, dt):
+    """
+    Explicit Euler layer update (original scheme) for one garment stack.
+
+    Yields (t, T, q_left, q_skin) per step: fluxes at t and the
+    temperatures after the step, in reused buffers.
+
+    Every step is a fixed handful of in-place ufunc calls on preallocated
+    buffers, in the operation order of the original per-layer loop, so
+    the history is bit-identical to it (see benchmark ppe_solver). The gap
+    coefficient goes through scalar pow, because numpy's SIMD array pow
+    (and Tm * Tm * Tm) round some cubes differently. For the usual 4-layer
+    stack numpy's per-call overhead makes this about as fast as the
+    per-layer loop; the array form pulls ahead as the layer count grows
+    (about 1.4x at 8 layers, 2-2.5x at 16), and the large gain comes from
+    batching stacks (run_ppe_batch).
+    """
+    n_layers = len(mcp)
 
     # -------------------------------------------------
-    # STORAGE ARRAYS
+    # INITIAL TEMPERATURES
     # -------------------------------------------------
-    T_hist = np.zeros((len(time), n_layers))
-    q_layer = np.zeros((len(time), n_layers))
-    q_skin = np.zeros(len(time))
-    safety_status = []
+    T = np.ones(n_layers) * T_AMB
 
-    q_rad_t = np.zeros(len(time))
-    q_conv_t = np.zeros(len(time))
-    q_total_t = np.zeros(len(time))
-
-    pain_time = None
+    # Work buffers and fixed views (T is updated in place)
+    q_left = np.zeros(n_layers)
+    dT = np.zeros(n_layers)
+    Tm = np.zeros(n_layers - 1)
+    h_gap = np.zeros(n_layers - 1)
+    T_hot, T_cold = T[:-1], T[1:]
+    mcp = np.asarray(mcp, dtype=float)
 
     # -------------------------------------------------
-    # AIR GAP FUNCTION
+    # TIME LOOP (all layers updated together)
     # -------------------------------------------------
-    def h_air_gap(T1, T2):
-        Tm = 0.5 * (T1 + T2)
-        h_rad = 4 * sigma * Tm**3 / (1/eps_air_1 + 1/eps_air_2 - 1)
-        h_cond = k_air / air_gap_thickness
-        return h_cond + h_rad
+    for n in range(len(time)):
+
+        # Left boundary: incident flux on layer 0, gap flux elsewhere
+        q_left[0] = q_in[n]
+
+        np.add(T_hot, T_cold, out=Tm)
+        Tm *= 0.5
+        h_gap[:] = [H_COND + FOUR_SIGMA * x**3 / EPS_DEN for x in Tm]
+        np.subtract(T_hot, T_cold, out=Tm)
+        np.multiply(h_gap, Tm, out=q_left[1:])
+
+        # Right boundary: next gap, skin for the last layer
+        q_skin = H_SKIN * (float(T[-1]) - T_AMB)
+        np.subtract(q_left[:-1], q_left[1:], out=dT[:-1])
+        dT[-1] = q_left[-1] - q_skin
+
+        dT /= mcp
+        dT *= dt
+        T += dT
 
+        yield time[n], T, q_left, q_skin
+
+
+def _batch_time_loop(q_rad_ref, q_conv_ref, eps_outer, mcp, k_link, t_peak, exposure_time, implicit, dt,
+                     stop_on=None, injury=False):
+    """
+    Time loop of run_ppe_batch over (configurations × nodes) arrays.
+
+    q_rad_ref, q_conv_ref and eps_outer have one value per configuration,
+    mcp (and k_link) one row; t_peak may be a scalar or per configuration.
+    Returns (pain_time, burn_time, peak_q_skin, skin) with skin the
+    SkinDamage state (None unless injury).
+    """
     # -------------------------------------------------
-    # FIRE TIME FUNCTION
+    # TIME SETTINGS AND STATE
     # -------------------------------------------------
-    def fire_time_function(t, tp):
-        if t <= 0:
-            return 0.0
-        return (t / tp) * np.exp(1 - t / tp)
+    time = np.arange(0, exposure_time + dt, dt)
+
+    n_cfg = len(mcp)
+    T = np.full((n_cfg, mcp.shape[1]), T_AMB)
+
+    pain_time = np.full(n_cfg, np.nan)
+    burn_time = np.full(n_cfg, np.nan)
+    peak_q_skin = np.full(n_cfg, -np.inf)
+    q_skin = np.zeros(n_cfg)
+    skin = SkinDamage(n_cfg, t0=time[0]) if injury else None
 
     # -------------------------------------------------
-    # TIME LOOP
+    # TIME LOOP (configurations × layers)
     # -------------------------------------------------
-    for n, t in enumerate(time):
+    n = 0   # last step index (no steps when exposure_time < dt)
+    for n in range(1 if implicit else 0, len(time)):
 
-        fire_factor = fire_time_function(t, t_peak)
+        fire_factor = fire_time_function(time[n], t_peak)
+        q_in = eps_outer * (q_rad_ref * fire_factor) + q_conv_ref * fire_factor
 
-        q_rad_inc = q_rad_ref * fire_factor
-        q_conv_inc = q_conv_ref * fire_factor
-        q_total_inc = q_rad_inc + q_conv_inc
+        if implicit:
+            # State at time[n]; crossings located between time[n-1] and time[n]
+            q_prev = q_skin
+            T = _implicit_step(T, q_in, mcp, dt, k_link)
+            q_skin = H_SKIN * (T[:, -1] - T_AMB)
 
-        q_rad_t[n] = q_rad_inc
-        q_conv_t[n] = q_conv_inc
-        q_total_t[n] = q_total_inc
+            new_pain = np.isnan(pain_time) & (q_skin >= STATUS_THRESHOLDS[0])
+            new_burn = np.isnan(burn_time) & (q_skin >= STATUS_THRESHOLDS[1])
+            pain_time[new_pain] = linear_crossing(time[n - 1], time[n], q_prev[new_pain],
+                                                  q_skin[new_pain], STATUS_THRESHOLDS[0])
+            burn_time[new_burn] = linear_crossing(time[n - 1], time[n], q_prev[new_burn],
+                                                  q_skin[new_burn], STATUS_THRESHOLDS[1])
+        else:
+            # Status levels as in run_ppe_model (skin flux before the update);
+            # a step straight past PAIN counts as reaching PAIN, as in the
+            # implicit branch
+            q_left, q_skin = _layer_fluxes(T, q_in)
+            T += _net_flux(q_left, q_skin) / mcp * dt
 
-        q_rad_abs = layers[0]["eps"] * q_rad_inc
-        q_in = q_rad_abs + q_conv_inc
+            is_pain = ~(q_skin < STATUS_THRESHOLDS[0])
+            is_burn = ~(q_skin < STATUS_THRESHOLDS[1])
+            pain_time[np.isnan(pain_time) & is_pain] = time[n]
+            burn_time[np.isnan(burn_time) & is_burn] = time[n]
 
-        T_new = T.copy()
+        np.fmax(peak_q_skin, q_skin, out=peak_q_skin)
+        if skin is not None:
+            skin.update(time[n], q_skin)
 
-        for i, layer in enumerate(layers):
-            mcp = layer["rho"] * layer["cp"] * layer["d"]
+        if stop_on is not None and not np.isnan(pain_time if stop_on == "PAIN" else burn_time).any():
+            break
 
-            # Left boundary
-            if i == 0:
-                q_left = q_in
-            else:
-                h_gap = h_air_gap(T[i-1], T[i])
-                q_left = h_gap * (T[i-1] - T[i])
+    # configuration-steps
+    count("ppe.batch", n_cfg * (n + (0 if implicit else 1)))
+    return pain_time, burn_time, peak_q_skin, skin
 
-            # Right boundary
-            if i < n_layers - 1:
-                h_gap = h_air_gap(T[i], T[i+1])
-                q_right = h_gap * (T[i] - T[i+1])
-            else:
-                q_right = h_skin * (T[i] - T_amb)
-                q_skin[n] = q_right
 
-            T_new[i] += (q_left - q_right) / mcp * dt
-            q_layer[n, i] = q_left
+@timed("ppe.batch")
+def run_ppe_batch(df_distance, layer_stacks, t_peak, distances=None, exposure_time=600.0,
+                  method="euler", dt=None, stop_on=None, nodes_per_layer=1, injury=False):
+    """
+    PPE heat transfer for many garment stacks × standoff distances at once.
 
-        T = T_new
-        T_hist[n, :] = T
+    All (stack, distance) configurations are advanced together as one
+    (configurations × layers) temperature array; only per-configuration
+    summaries are kept. Temperatures and fluxes agree with run_ppe_model
+    to rounding, but the times differ in one case. Pain_Time_s is the first
+    time q_skin is at the PAIN level or above. run_ppe_model's pain_time
+    (First_Entry_s of PAIN) is the first row classified exactly PAIN. It
+    is None when a step jumps straight from SAFE past PAIN, while
+    Pain_Time_s is that step's time.
 
-        # Safety classification
-        if q_skin[n] < 2000:
-            safety_status.append("SAFE")
-        elif q_skin[n] < 4000:
-            safety_status.append("PAIN")
-            if pain_time is None:
-                pain_time = t
-        elif q_skin[n] < 6000:
-            safety_status.append("BURN_RISK")
-        else:
-            safety_status.append("NOT_SAFE")
+    Parameters:
+    - df_distance  : DataFrame from distance model
+    - layer_stacks : list of layer lists (same layer count in every stack)
+    - t_peak       : peak fire time from File1 (s)
+    - distances    : distances (m) to evaluate; fluxes are interpolated from
+                     df_distance. Default: the Flux_Approx_100kW row
+    - exposure_time : total simulation time (s)
+    - method, dt   : "euler" (default dt 0.1) or "implicit" (default dt 1.0,
+                     threshold crossings located inside the step)
+    - stop_on      : "PAIN" or "BURN_RISK" to stop once every configuration
+                     has reached that level (later times are left unsimulated)
+    - nodes_per_layer : nodes through each layer (see run_ppe_model); N > 1
+                     needs method "implicit" and solves one (configurations
+                     × nodes) tridiagonal system per step
+    - injury       : also stream q_skin through burn_injury.SkinDamage and add
+                     First/Second/Third_Degree_s (Henriques burn times, NaN if
+                     not reached) and Peak_T_Basal_K columns
+
+    Returns:
+    - DataFrame with one row per configuration: Stack, Distance_m, incident
+      reference fluxes, Pain_Time_s and Burn_Risk_Time_s (first times q_skin
+      reaches the PAIN / BURN_RISK level or above) and Peak_q_skin_W_m2
+    """
+    if method not in ("euler", "implicit"):
+        raise ValueError(f"Unknown batch method '{method}'. Available methods: ['euler', 'implicit']")
+    if stop_on not in (None, "PAIN", "BURN_RISK"):
+        raise ValueError(f"Unknown batch stop level '{stop_on}'. Available levels: ['PAIN', 'BURN_RISK']")
+    implicit = method == "implicit"
+    dt = (1.0 if implicit else 0.1) if dt is None else dt
 
     # -------------------------------------------------
-    # OUTPUT DATAFRAME
+    # INCIDENT FLUX AT EACH DISTANCE
     # -------------------------------------------------
-    data = {
-        "Time_s": time,
-        "Distance_m": distance_m,
-        "Radiative_Flux_Incident_W_m2": q_rad_t,
-        "Convective_Flux_Incident_W_m2": q_conv_t,
-        "Total_Flux_Incident_W_m2": q_total_t,
-        "q_skin_W_m2": q_skin,
-        "Exposure_Safety_Status": safety_status
-    }
+    if distances is None:
+        row = df_distance[df_distance["Flux_Approx_100kW"] == True].iloc[0]
+        distances = np.array([row["Distance_m"]])
+        q_rad_dist = np.array([row["Radiative_Flux_W_m2"]])
+        q_conv_dist = np.array([row["Convective_Flux_W_m2"]])
+    else:
+        distances = np.atleast_1d(np.asarray(distances, dtype=float))
+        R_grid = df_distance["Distance_m"].to_numpy()
+        q_rad_dist = np.interp(distances, R_grid, df_distance["Radiative_Flux_W_m2"].to_numpy())
+        q_conv_dist = np.interp(distances, R_grid, df_distance["Convective_Flux_W_m2"].to_numpy())
 
-    for i, layer in enumerate(layers):
-        data[f"T_{layer['name']}_K"] = T_hist[:, i]
-        data[f"q_into_{layer['name']}_W_m2"] = q_layer[:, i]
+    # -------------------------------------------------
+    # CONFIGURATIONS (stack-major: stack s, distance j)
+    # -------------------------------------------------
+    n_layers = len(layer_stacks[0])
+    if any(len(stack) != n_layers for stack in layer_stacks):
+        raise ValueError("All layer stacks must have the same number of layers.")
 
-    df_ppe = pd.DataFrame(data)
+    n_dist = len(distances)
+    networks = [_layer_network(stack, nodes_per_layer) for stack in layer_stacks]
+    mcp_stack = np.array([mcp for mcp, _, _ in networks])
+    resolved = networks[0][1] is not None
+    if resolved and not implicit:
+        raise ValueError("Through-thickness conduction (nodes_per_layer > 1) needs method 'implicit'.")
+    eps_stack = np.array([stack[0]["eps"] for stack in layer_stacks], dtype=float)
 
-    return df_ppe, pain_time
+    stack_idx = np.repeat(np.arange(len(layer_stacks)), n_dist)
+    dist_idx = np.tile(np.arange(n_dist), len(layer_stacks))
+
+    mcp = mcp_stack[stack_idx]
+    k_link = np.array([k for _, k, _ in networks])[stack_idx] if resolved else None
+    eps_outer = eps_stack[stack_idx]
+    q_rad_ref = q_rad_dist[dist_idx]
+    q_conv_ref = q_conv_dist[dist_idx]
+    n_cfg = len(stack_idx)
+
+    pain_time, burn_time, peak_q_skin, skin = _batch_time_loop(
+        q_rad_ref, q_conv_ref, eps_outer, mcp, k_link, t_peak, exposure_time, implicit, dt, stop_on, injury)
+
+    df = pd.DataFrame({
+        "Config": np.arange(n_cfg),
+        "Stack": stack_idx,
+        "Distance_m": distances[dist_idx],
+        "Radiative_Flux_Ref_W_m2": q_rad_ref,
+        "Convective_Flux_Ref_W_m2": q_conv_ref,
+        "Pain_Time_s": pain_time,
+        "Burn_Risk_Time_s": burn_time,
+        "Peak_q_skin_W_m2": peak_q_skin,
+    })
+    if skin is not None:
+        injury_df = skin.summary()
+        for col in ["First_Degree_s", "Second_Degree_s", "Third_Degree_s", "Peak_T_Basal_K"]:
+            df[col] = injury_df[col].to_numpy()
+    return df
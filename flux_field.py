@@ -0,0 +1,134 @@
+# ----------------------------------------------------------
+# SPACE–TIME FLUX FIELD  q(t, R)
+# Radiative / convective / total flux over a (time × radius)
+# grid, stored as float32 (optionally memory-mapped .npy files)
+# ----------------------------------------------------------
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from file2_distance import _radial_flux, _view_model
+from instrumentation import timed
+
+
+FIELD_COLUMNS = [
+    "Radiative_Flux_W_m2",
+    "Convective_Flux_W_m2",
+    "Total_Flux_W_m2"
+]
+
+
+@timed("flux_field")
+def run_flux_field(fire_result, R_min=0.0, R_max=50.0, n_R=300, dtype=np.float32,
+                   memmap_dir=None, total_only=False, chunk_elements=1_000_000):
+    """
+    Flux field over the fire's time vector × a radial grid.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model (its df_flux time grid is
+                    used, so set n_points there for finer time resolution)
+    - R_min, R_max, n_R : radial grid
+    - dtype       : storage dtype of the field arrays
+    - memmap_dir  : if given, arrays are written to <column>.npy files in this
+                    directory and returned as memory maps
+    - total_only  : store only Total_Flux_W_m2
+    - chunk_elements : approximate float64 work size per time-row chunk
+
+    Returns:
+    - dict with Time_s (n_t,), Distance_m (n_R,) and one (n_t, n_R) array
+      per flux column
+    """
+    df_time = fire_result["df_flux"]
+    time = df_time["Time_s"].to_numpy()
+    HRR = df_time["HRR_W"].to_numpy()
+
+    D = fire_result["D_m"]
+    chi_r = fire_result["chi_r"]
+    tau_f = fire_result["tau_f"]
+    view = _view_model(fire_result)
+
+    R_values = np.linspace(R_min, R_max, n_R)
+    shape = (len(time), n_R)
+    columns = FIELD_COLUMNS[2:] if total_only else FIELD_COLUMNS
+
+    # -------------------------------------------------
+    # STORAGE (in memory or memory-mapped)
+    # -------------------------------------------------
+    if memmap_dir is not None:
+        os.makedirs(memmap_dir, exist_ok=True)
+        store = {
+            col: np.lib.format.open_memmap(os.path.join(memmap_dir, f"{col}.npy"),
+                                           mode="w+", dtype=dtype, shape=shape)
+            for col in columns
+        }
+    else:
+        store = {col: np.empty(shape, dtype=dtype) for col in columns}
+
+    # -------------------------------------------------
+    # CHUNKED BROADCAST OVER TIME ROWS
+    # -------------------------------------------------
+    rows_per_chunk = max(1, chunk_elements // max(n_R, 1))
+
+    for start in range(0, len(time), rows_per_chunk):
+        sl = slice(start, start + rows_per_chunk)
+        q = dict(zip(FIELD_COLUMNS, _radial_flux(R_values[None, :], HRR[sl, None], D, chi_r, tau_f, *view)))
+        for col in columns:
+            store[col][sl] = q[col]
+
+    if memmap_dir is not None:
+        for arr in store.values():
+            arr.flush()
+
+    field = {"Time_s": time, "Distance_m": R_values}
+    field.update(store)
+    return field
+
+
+def load_flux_field(memmap_dir, time, R_values, mode="r"):
+    """Re-open a field written with memmap_dir without loading it into memory."""
+    field = {"Time_s": np.asarray(time), "Distance_m": np.asarray(R_values)}
+    for col in FIELD_COLUMNS:
+        path = os.path.join(memmap_dir, f"{col}.npy")
+        if os.path.exists(path):
+            field[col] = np.load(path, mmap_mode=mode)
+    return field
+
+
+def _interp_weights(grid, x):
+    """
+    Bracketing indices (i, i_next) and weight w of i_next for linear
+    interpolation of x on a sorted grid; a one-point grid gives (0, 0, 0.0).
+    """
+    if len(grid) == 1:
+        return 0, 0, 0.0
+    x = float(np.clip(x, grid[0], grid[-1]))
+    i = int(np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2))
+    span = grid[i + 1] - grid[i]
+    w = (x - grid[i]) / span if span > 0 else 0.0
+    return i, i + 1, w
+
+
+def _field_columns(field):
+    return [col for col in FIELD_COLUMNS if col in field]
+
+
+def field_at_time(field, t):
+    """Radial profile at time t (linear interpolation between time rows)."""
+    i, i_next, w = _interp_weights(field["Time_s"], t)
+    data = {"Distance_m": field["Distance_m"]}
+    for col in _field_columns(field):
+        a = field[col]
+        data[col] = (1 - w) * a[i].astype(float) + w * a[i_next].astype(float)
+    return pd.DataFrame(data)
+
+
+def field_at_distance(field, R):
+    """Flux history at distance R (linear interpolation between radial columns)."""
+    j, j_next, w = _interp_weights(field["Distance_m"], R)
+    data = {"Time_s": field["Time_s"]}
+    for col in _field_columns(field):
+        a = field[col]
+        data[col] = (1 - w) * a[:, j].astype(float) + w * a[:, j_next].astype(float)
+    return pd.DataFrame(data)
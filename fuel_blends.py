@@ -0,0 +1,130 @@
+# ----------------------------------------------------------
+# FUEL BLENDS
+# Effective properties of fuel mixtures from component mass
+# or volume fractions, vectorized over many blend ratios,
+# with derived blends registered in the fuel registry
+# ----------------------------------------------------------
+
+import numpy as np
+
+from fuel_data import PROPERTY_COLUMNS, REGISTRY
+
+
+# Common blends: (components, fractions, basis)
+BLENDS = {
+    "E10": (("Gasoline", "Ethanol"), (0.90, 0.10), "volume"),
+    "E85": (("Gasoline", "Ethanol"), (0.15, 0.85), "volume"),
+    "M15": (("Gasoline", "Methanol"), (0.85, 0.15), "volume"),
+    "B7": (("Diesel", "Biodiesel (FAME)"), (0.93, 0.07), "volume"),
+    "B20": (("Diesel", "Biodiesel (FAME)"), (0.80, 0.20), "volume"),
+}
+
+BASES = ("mass", "volume")
+
+
+def _fractions(fractions, n_components):
+    """Validated (n_blends × n_components) fraction array."""
+    x = np.atleast_2d(np.asarray(fractions, dtype=float))
+    if x.shape[-1] != n_components:
+        raise ValueError(f"Expected {n_components} fractions per blend, got {x.shape[-1]}.")
+    if (x < 0).any() or not np.isfinite(x).all():
+        raise ValueError("Blend fractions must be finite and non-negative.")
+    total = x.sum(axis=-1)
+    if not np.allclose(total, 1.0, rtol=0, atol=1e-6):
+        raise ValueError("Blend fractions must sum to 1 for every blend.")
+    return x / total[:, None]
+
+
+def mix_properties(components, fractions, basis="mass", registry=None):
+    """
+    Effective properties of blends of registered fuels.
+
+    Parameters:
+    - components : component fuel names
+    - fractions  : (n_components,) or (n_blends, n_components) fractions,
+                   each blend summing to 1
+    - basis      : "mass" or "volume" fractions (volume needs densities)
+    - registry   : fuel_data.FuelRegistry (default fuel_data.REGISTRY)
+
+    Mixing rules (w = mass fractions):
+    - lhv                   : Σ w_i LHV_i
+    - combustion_efficiency : Σ w_i η_i LHV_i / LHV_mix (released heat is additive)
+    - burning_rate          : Σ w_i m''_i (mass-weighted approximation)
+    - density               : 1 / Σ (w_i / ρ_i) (ideal mixing; NaN if unknown)
+
+    Returns:
+    - dict of (n_blends,) arrays: burning_rate, lhv, combustion_efficiency,
+      density and mass_fractions (n_blends × n_components)
+    """
+    if basis not in BASES:
+        raise ValueError(f"Unknown basis '{basis}'. Available: {list(BASES)}")
+    registry = REGISTRY if registry is None else registry
+
+    comp = registry.lookup(list(components))
+    x = _fractions(fractions, len(components))
+
+    if basis == "volume":
+        if np.isnan(comp["density"]).any():
+            missing = [c for c, rho in zip(components, comp["density"]) if np.isnan(rho)]
+            raise ValueError(f"Volume fractions need densities; missing for {missing}.")
+        w = x * comp["density"]
+        w /= w.sum(axis=-1, keepdims=True)
+    else:
+        w = x
+
+    # only components present in the blend need a density
+    with np.errstate(divide="ignore", invalid="ignore"):
+        specific_volume = np.where(w > 0, w / comp["density"], 0.0).sum(axis=-1)
+
+    lhv = w @ comp["lhv"]
+    return {
+        "burning_rate": w @ comp["burning_rate"],
+        "lhv": lhv,
+        "combustion_efficiency": (w @ (comp["combustion_efficiency"] * comp["lhv"])) / lhv,
+        "density": 1.0 / specific_volume,
+        "mass_fractions": w,
+    }
+
+
+def blend_name(components, fractions, basis="mass"):
+    """Registry name of a blend, e.g. 'Gasoline 90% / Ethanol 10% (volume)'."""
+    parts = [f"{name} {100 * f:g}%" for name, f in zip(components, fractions) if f > 0]
+    return " / ".join(parts) + f" ({basis})"
+
+
+def register_blends(components, fractions, basis="mass", names=None, registry=None):
+    """
+    Add blends to the fuel registry so they can be used by name.
+
+    Blends already present are not recomputed, and the new ones are
+    derived in one vectorized mix_properties call. The returned names
+    can be passed to get_fuel_properties, run_pool_fire_batch, the
+    pipeline and the runner.
+
+    Returns:
+    - list of blend names, one per row of fractions
+    """
+    registry = REGISTRY if registry is None else registry
+    x = _fractions(fractions, len(components))
+    if names is None:
+        names = [blend_name(components, np.round(row, 6), basis) for row in x]
+    elif len(names) != len(x):
+        raise ValueError("names must have one entry per blend.")
+
+    todo = [i for i, name in enumerate(names) if name not in registry]
+    if todo:
+        props = mix_properties(components, x[todo], basis, registry)
+        registry.add_many({
+            names[i]: {col: props[col][j] for col in PROPERTY_COLUMNS}
+            for j, i in enumerate(todo)
+        })
+    return list(names)
+
+
+def register_common_blends(registry=None):
+    """Register the BLENDS presets (E10, E85, ...) under their short names."""
+    registry = REGISTRY if registry is None else registry
+    for name, (components, fractions, basis) in BLENDS.items():
+        if all(c in registry for c in components):
+            register_blends(components, [fractions], basis, names=[name], registry=registry)
+    return [name for name in BLENDS if name in registry]
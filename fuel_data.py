@@ -3,6 +3,18 @@
 # Database of fuel types with their combustion characteristics
 # ----------------------------------------------------------
 
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import tomllib          # Python 3.11+
+except ModuleNotFoundError:
+    tomllib = None
+
+# Built-in fuels; REGISTRY (below) is seeded from these and holds any loaded ones
 FUEL_DATABASE = {
     "Gasoline": {
         "burning_rate": 0.055,           # ṁ'' (kg/m²·s)
@@ -52,9 +64,188 @@ FUEL_DATABASE = {
         "combustion_efficiency": 0.99,
         "density": 675.0,
     },
+    "Biodiesel (FAME)": {
+        "burning_rate": 0.035,           # approximate
+        "lhv": 37.3,
+        "combustion_efficiency": 0.92,
+        "density": 880.0,
+    },
 }
 
 
+# ----------------------------------------------------------
+# FUEL REGISTRY
+# Column-oriented property store (one float array per
+# property, name -> row index map) with file loading and
+# vectorized bulk lookup
+# ----------------------------------------------------------
+
+PROPERTY_COLUMNS = ("burning_rate", "lhv", "combustion_efficiency", "density")
+REQUIRED_COLUMNS = ("burning_rate", "lhv", "combustion_efficiency")
+
+
+class FuelRegistry:
+    """
+    Fuel properties stored column-wise.
+
+    columns[prop] is a float array with one entry per fuel (NaN where a
+    property such as density is unknown); index maps names to rows.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index_map = {}
+        self.columns = {col: np.empty(0) for col in PROPERTY_COLUMNS}
+
+    @classmethod
+    def from_dict(cls, fuels):
+        registry = cls()
+        registry.add_many(fuels)
+        return registry
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index_map
+
+    def add_many(self, fuels, replace=True):
+        """
+        Add or update fuels from {name: {prop: value}} or a list of records
+        with a "name" key. Updates of registered fuels are partial: the given
+        properties (None counts as not given) replace those of the existing
+        row and the rest are kept. Properties are validated before anything
+        changes.
+        """
+        if not isinstance(fuels, dict):
+            fuels = {rec["name"]: {k: v for k, v in rec.items() if k != "name"} for rec in fuels}
+
+        rows = {col: [] for col in PROPERTY_COLUMNS}
+        new_names = []
+        for name, props in fuels.items():
+            if str(name) in self.index_map:
+                given = {k: v for k, v in props.items() if v is not None}
+                props = dict(self.get(str(name)), **given)
+            missing = [col for col in REQUIRED_COLUMNS if props.get(col) is None]
+            if missing:
+                raise ValueError(f"Fuel '{name}' is missing properties: {missing}")
+            if not replace and name in self.index_map:
+                raise ValueError(f"Fuel '{name}' is already registered.")
+            values = {col: _to_float(props.get(col)) for col in PROPERTY_COLUMNS}
+            if values["burning_rate"] <= 0 or values["lhv"] <= 0:
+                raise ValueError(f"Fuel '{name}': burning_rate and lhv must be positive.")
+            if not 0 < values["combustion_efficiency"] <= 1:
+                raise ValueError(f"Fuel '{name}': combustion_efficiency must be in (0, 1].")
+            new_names.append(str(name))
+            for col in PROPERTY_COLUMNS:
+                rows[col].append(values[col])
+
+        # updates in place, new fuels appended in one concatenation
+        appended = []
+        for i, name in enumerate(new_names):
+            row = self.index_map.get(name)
+            if row is None:
+                self.index_map[name] = len(self.names)
+                self.names.append(name)
+                appended.append(i)
+            else:
+                for col in PROPERTY_COLUMNS:
+                    self.columns[col][row] = rows[col][i]
+        for col in PROPERTY_COLUMNS:
+            self.columns[col] = np.concatenate([self.columns[col], np.take(rows[col], appended)])
+        return self
+
+    def add(self, name, **props):
+        return self.add_many({name: props})
+
+    def index(self, names):
+        """Row indices of an array of fuel names (same shape)."""
+        names = np.asarray(names, dtype=object)
+        unique, inverse = np.unique(names.astype(str), return_inverse=True)
+        unknown = [name for name in unique if name not in self.index_map]
+        if unknown:
+            raise ValueError(f"Fuel '{unknown[0]}' not found in database. "
+                             f"Available fuels: {_preview(self.names)}")
+        rows = np.array([self.index_map[name] for name in unique], dtype=np.intp)
+        return rows[inverse].reshape(names.shape)
+
+    def lookup(self, names, columns=PROPERTY_COLUMNS):
+        """Property arrays (shaped like names) for an array of fuel names."""
+        rows = self.index(names)
+        return {col: self.columns[col][rows] for col in columns}
+
+    def get(self, name):
+        """Properties of one fuel as a new dict (unknown properties omitted)."""
+        row = self.index_map.get(name)
+        if row is None:
+            raise ValueError(f"Fuel '{name}' not found in database. Available fuels: {_preview(self.names)}")
+        props = {}
+        for col in PROPERTY_COLUMNS:
+            value = self.columns[col][row]
+            if not np.isnan(value):
+                props[col] = float(value)
+        return props
+
+    def to_frame(self):
+        return pd.DataFrame(self.columns, index=pd.Index(self.names, name="name"))
+
+
+def _to_float(value):
+    if value is None or value == "":
+        return np.nan
+    return float(value)
+
+
+def _preview(names, limit=20):
+    return list(names) if len(names) <= limit else list(names[:limit]) + [f"... ({len(names)} total)"]
+
+
+def read_fuel_file(path):
+    """
+    Fuel definitions from a file as {name: {prop: value}}.
+
+    - .csv  : one row per fuel, a "name" (or "fuel") column plus property columns
+    - .json : {"name": {...}, ...} or a list of records with "name"
+    - .toml : [fuels."name"] tables, or a [[fuels]] array with "name"
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+
+    if ext == ".csv":
+        df = pd.read_csv(path)
+        name_col = "name" if "name" in df.columns else "fuel"
+        if name_col not in df.columns:
+            raise ValueError("Fuel CSV needs a 'name' or 'fuel' column.")
+        df = df.set_index(name_col)
+        return {name: {k: (None if pd.isna(v) else v) for k, v in row.items()}
+                for name, row in df.to_dict("index").items()}
+
+    if ext == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    elif ext == ".toml":
+        if tomllib is None:
+            raise ImportError("Reading TOML fuel files requires Python 3.11+ (tomllib).")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        data = data.get("fuels", data)
+    else:
+        raise ValueError(f"Unsupported fuel file type '{ext}'. Use .csv, .json or .toml.")
+
+    if isinstance(data, list):
+        data = {rec["name"]: {k: v for k, v in rec.items() if k != "name"} for rec in data}
+    return data
+
+
+def load_fuels(path, registry=None, replace=True):
+    """Add the fuels in a CSV / JSON / TOML file to a registry (default REGISTRY)."""
+    registry = REGISTRY if registry is None else registry
+    return registry.add_many(read_fuel_file(path), replace=replace)
+
+
+# Default registry, seeded with the built-in fuels
+REGISTRY = FuelRegistry.from_dict(FUEL_DATABASE)
+
+
 def get_fuel_properties(fuel_name):
     """
     Retrieve fuel properties from the database.
@@ -68,12 +259,19 @@ def get_fuel_properties(fuel_name):
     Raises:
         ValueError: If fuel not found in database
     """
-    if fuel_name not in FUEL_DATABASE:
-        raise ValueError(f"Fuel '{fuel_name}' not found in database. Available fuels: {list(FUEL_DATABASE.keys())}")
-    
-    return FUEL_DATABASE[fuel_name].copy()
+    return REGISTRY.get(fuel_name)
+
+
+def lookup_fuel_properties(fuel_names, columns=PROPERTY_COLUMNS):
+    """
+    Bulk lookup: array of fuel names -> dict of property arrays.
+
+    Raises:
+        ValueError: If any fuel is not found in the registry
+    """
+    return REGISTRY.lookup(fuel_names, columns)
 
 
 def get_all_fuel_names():
     """Return list of all available fuel names."""
-    return list(FUEL_DATABASE.keys())
+    return list(REGISTRY.names)
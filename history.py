@@ -0,0 +1,46 @@
+# ----------------------------------------------------------
+# HISTORY THINNING
+# Row selection for decimated time-series output
+# ----------------------------------------------------------
+
+import numpy as np
+
+
+def decimation_mask(n, every=None, window=None, values=None, start=0):
+    """
+    Rows to keep when thinning a history of n rows.
+
+    Parameters:
+    - every   : keep rows whose global index (start + i) is a multiple of every
+    - window  : keep the rows holding the minimum and maximum of values in
+                each block of window rows (blocks aligned on global index)
+    - values  : 1-D array the window envelope is taken over
+    - start   : global index of the first row (for chunked histories)
+
+    With neither every nor window every row is kept.
+
+    Returns:
+    - boolean mask of length n
+    """
+    if not every and not window:
+        return np.ones(n, dtype=bool)
+
+    keep = np.zeros(n, dtype=bool)
+    index = start + np.arange(n)
+
+    if every:
+        keep |= index % every == 0
+
+    if window:
+        values = np.asarray(values, dtype=float)
+        block = index // window
+        edges = np.flatnonzero(np.diff(block)) + 1
+        for lo, hi in zip(np.r_[0, edges], np.r_[edges, n]):
+            segment = values[lo:hi]
+            if np.isnan(segment).all():
+                keep[lo] = True
+                continue
+            keep[lo + np.nanargmin(segment)] = True
+            keep[lo + np.nanargmax(segment)] = True
+
+    return keep
@@ -0,0 +1,171 @@
+# ----------------------------------------------------------
+# INSTRUMENTATION
+# Optional per-stage wall time, step counts and memory of
+# the models. Disabled (near-zero cost) unless a Profiler is
+# active:
+#
+#   with Profiler(memory=True) as prof:
+#       run_pipeline(...)
+#   print(prof.summary())
+# ----------------------------------------------------------
+
+import functools
+import json
+import time as _time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+
+_ACTIVE = None          # innermost active Profiler
+_NULL = nullcontext()   # shared no-op context for the disabled path
+
+
+def _new_record():
+    return {"calls": 0, "total_s": 0.0, "max_s": 0.0, "steps": 0, "alloc_mib": 0.0, "peak_mib": 0.0}
+
+
+class Profiler:
+    """
+    Collects per-stage statistics while active (use as a context manager).
+
+    Parameters:
+    - memory : also trace allocations with tracemalloc (net allocation
+               and peak traced memory per stage); this slows the run
+    - hooks  : callables hook(name, record) called at the end of every
+               stage with that call's time / memory
+
+    The same Profiler can be entered several times (e.g. once per batch
+    run) and keeps accumulating; merge() folds in records from other
+    processes.
+    """
+
+    def __init__(self, memory=False, hooks=None):
+        self.memory = memory
+        self.hooks = list(hooks or [])
+        self.records = {}
+        self._outer = None
+        self._started_tracing = False
+        self._peaks = []   # running peak of each open stage (nested stages)
+
+    def __enter__(self):
+        global _ACTIVE
+        self._outer, _ACTIVE = _ACTIVE, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        _ACTIVE = self._outer
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _record(self, name):
+        if name not in self.records:
+            self.records[name] = _new_record()
+        return self.records[name]
+
+    @contextmanager
+    def stage(self, name):
+        if self.memory:
+            current0, peak0 = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        t0 = _time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = _time.perf_counter() - t0
+            rec = self._record(name)
+            rec["calls"] += 1
+            rec["total_s"] += elapsed
+            rec["max_s"] = max(rec["max_s"], elapsed)
+            event = {"time_s": elapsed}
+
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self._peaks.pop())
+                # the stage's peak also counts towards any enclosing stage
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak, peak0)
+                alloc = (current - current0) / 2**20
+                peak_mib = (peak - current0) / 2**20
+                rec["alloc_mib"] += alloc
+                rec["peak_mib"] = max(rec["peak_mib"], peak_mib)
+                event.update(alloc_mib=alloc, peak_mib=peak_mib)
+
+            for hook in self.hooks:
+                hook(name, event)
+
+    def count(self, name, n=1):
+        self._record(name)["steps"] += n
+
+    def merge(self, records):
+        """Add records (dict from another Profiler, e.g. a worker process)."""
+        if isinstance(records, Profiler):
+            records = records.records
+        for name, other in records.items():
+            rec = self._record(name)
+            for key in ("calls", "total_s", "steps", "alloc_mib"):
+                rec[key] += other[key]
+            for key in ("max_s", "peak_mib"):
+                rec[key] = max(rec[key], other[key])
+        return self
+
+    def summary(self):
+        """One row per stage, slowest first."""
+        df = pd.DataFrame.from_dict(self.records, orient="index")
+        if df.empty:
+            return pd.DataFrame(columns=["stage"] + list(_new_record()) + ["mean_s"])
+        df.index.name = "stage"
+        df["mean_s"] = df["total_s"] / df["calls"].where(df["calls"] > 0)
+        if not self.memory:
+            df = df.drop(columns=["alloc_mib", "peak_mib"])
+        return df.sort_values("total_s", ascending=False).reset_index()
+
+    def to_json(self, path=None):
+        """Records as JSON text (also written to path if given)."""
+        text = json.dumps({"memory": self.memory, "records": self.records}, indent=1)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+# -------------------------------------------------
+# HOOKS USED BY THE MODELS
+# -------------------------------------------------
+def active():
+    """The active Profiler, or None."""
+    return _ACTIVE
+
+
+def stage(name):
+    """Context manager timing a stage when profiling is active (no-op otherwise)."""
+    if _ACTIVE is None:
+        return _NULL
+    return _ACTIVE.stage(name)
+
+
+def count(name, n=1):
+    """Add n steps to a stage when profiling is active."""
+    if _ACTIVE is not None:
+        _ACTIVE.count(name, n)
+
+
+def timed(name):
+    """Decorator timing every call of a function as stage name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            with _ACTIVE.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,110 @@
+# ----------------------------------------------------------
+# TIME INTEGRATION HELPERS
+# Batched tridiagonal solver, adaptive step-doubling control
+# and threshold-crossing localization shared by the models
+# ----------------------------------------------------------
+
+import numpy as np
+
+
+def solve_tridiagonal(lower, diag, upper, rhs):
+    """
+    Solve tridiagonal systems along the last axis (Thomas algorithm).
+
+    All arguments have shape (..., n) and leading axes are independent
+    systems; lower[..., 0] and upper[..., -1] are ignored. Cost is linear
+    in n and vectorized over the leading axes.
+    """
+    n = diag.shape[-1]
+    c = np.empty(np.broadcast(lower, diag, upper, rhs).shape)
+    d = np.empty_like(c)
+
+    c[..., 0] = upper[..., 0] / diag[..., 0]
+    d[..., 0] = rhs[..., 0] / diag[..., 0]
+    for i in range(1, n):
+        m = diag[..., i] - lower[..., i] * c[..., i - 1]
+        if i < n - 1:
+            c[..., i] = upper[..., i] / m
+        d[..., i] = (rhs[..., i] - lower[..., i] * d[..., i - 1]) / m
+
+    x = d
+    for i in range(n - 2, -1, -1):
+        x[..., i] -= c[..., i] * x[..., i + 1]
+    return x
+
+
+def step_doubling(step, t0, y0, t_end, rtol=1e-4, atol=1e-2, first_step=0.01, max_step=np.inf,
+                  max_steps=1_000_000):
+    """
+    Adaptive integration with a one-step method y1 = step(t, y, h).
+
+    Each step is compared with two half steps; their difference is the
+    error estimate and the Richardson extrapolation 2 y_half - y_full is
+    kept. Combined with an implicit step this is stable and second-order.
+    Generator yielding (t, y) after every accepted step, so callers can
+    stop early or stream results. The error norm is the RMS over the last
+    axis and the maximum over any leading (batch) axes.
+    """
+    t = float(t0)
+    y = np.array(y0, dtype=float)
+    h = min(first_step, max_step, t_end - t)
+
+    for _ in range(max_steps):
+        if t >= t_end:
+            return
+
+        y_full = step(t, y, h)
+        y_half = step(t + 0.5 * h, step(t, y, 0.5 * h), 0.5 * h)
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_half))
+        err_norm = np.sqrt(np.mean(((y_half - y_full) / scale)**2, axis=-1)).max()
+
+        if np.isfinite(err_norm) and err_norm <= 1.0:
+            t = t + h if t_end - t > h else t_end
+            y = 2 * y_half - y_full
+            yield t, y
+            factor = 4.0 if err_norm == 0 else min(4.0, 0.9 * err_norm**-0.5)
+        else:
+            factor = 0.2 if not np.isfinite(err_norm) else max(0.2, 0.9 * err_norm**-0.5)
+
+        h = min(h * factor, max_step, t_end - t)
+        if t < t_end and h <= 1e-12 * max(1.0, abs(t)):
+            raise RuntimeError(f"Step size underflow at t = {t}.")
+
+    raise RuntimeError(f"Maximum number of steps ({max_steps}) exceeded.")
+
+
+def hermite_interp(s, h, y0, y1, f0, f1):
+    """Cubic Hermite interpolant at fraction s of a step of length h."""
+    h00 = 2 * s**3 - 3 * s**2 + 1
+    h10 = s**3 - 2 * s**2 + s
+    h01 = -2 * s**3 + 3 * s**2
+    h11 = s**3 - s**2
+    return h00 * y0 + h10 * h * f0 + h01 * y1 + h11 * h * f1
+
+
+def hermite_crossing(t0, t1, g0, g1, dg0, dg1, level, n_iter=30):
+    """
+    Time in [t0, t1] at which the cubic Hermite interpolant of g reaches level.
+
+    g0/g1 are values and dg0/dg1 time derivatives at the step ends
+    (broadcasting); assumes g0 < level <= g1.
+    """
+    h = t1 - t0
+    lo = np.zeros(np.broadcast(g0, g1, level).shape)
+    hi = np.ones_like(lo)
+
+    for _ in range(n_iter):
+        mid = 0.5 * (lo + hi)
+        below = hermite_interp(mid, h, g0, g1, dg0, dg1) < level
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+
+    return t0 + hi * h
+
+
+def linear_crossing(t0, t1, g0, g1, level):
+    """Time in [t0, t1] at which the linear interpolant of g reaches level."""
+    span = g1 - g0
+    w = np.divide(level - g0, span, out=np.ones(np.broadcast(g0, g1, level).shape), where=span != 0)
+    return t0 + np.clip(w, 0.0, 1.0) * (t1 - t0)
@@ -0,0 +1,273 @@
+# ----------------------------------------------------------
+# INVERSE DESIGN
+# Closest standoff distance, or thinnest garment layer, that
+# keeps the pain time at or above a target. Pain time grows
+# monotonically with distance and thickness, so both are
+# bracketed searches; each round probes a few candidates in
+# one batch PPE run that stops at the target time (or once
+# every candidate is in pain):
+#
+#   _, fire = fire_stage("Gasoline", 14.8, 2.0)       # cached
+#   min_standoff_distance(fire, layers, target_time=300)
+#   min_layer_thickness(fire, layers, "Thermal Liner", 300, distance=5.0)
+#
+# Usage: python inverse_design.py Gasoline 14.8 2 --target 300
+#            [--layer "Thermal Liner" --distance 5]
+# ----------------------------------------------------------
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from file2_distance import _bisect_distance, _peak_fire_state, _radial_flux, _view_model
+from file3_ppe import _batch_time_loop, _layer_network
+from instrumentation import count, timed
+
+
+N_PROBES = 8        # candidates per search round (one batch PPE run)
+MAX_ROUNDS = 60
+
+
+# -------------------------------------------------
+# PAIN TIMES OF CANDIDATES
+# -------------------------------------------------
+def pain_times(fire_result, layer_stacks, distances, target_time, method="implicit", dt=None,
+               nodes_per_layer=1, view_factor=None, view_options=None):
+    """
+    Pain times of candidate (stack, distance) pairs, simulated up to target_time.
+
+    The incident flux at each distance comes straight from the distance
+    model at t_peak (no grid interpolation). The batch stops once every
+    candidate has reached the PAIN level or at target_time.
+
+    Parameters:
+    - fire_result   : dict from run_pool_fire_model
+    - layer_stacks  : list of layer lists, one per candidate (or one for all)
+    - distances     : distance(s) (m), one per candidate (or one for all)
+    - target_time   : simulated exposure (s)
+    - method, dt    : batch PPE integrator ("implicit" or "euler", see run_ppe_batch)
+    - nodes_per_layer : PPE nodes through each layer
+    - view_factor, view_options : flame view factor (default: as in fire_result)
+
+    Returns:
+    - array of first times (s) at PAIN level or above, NaN if not reached
+      by target_time
+    """
+    if method not in ("euler", "implicit"):
+        raise ValueError(f"Unknown batch method '{method}'. Available methods: ['euler', 'implicit']")
+    implicit = method == "implicit"
+    dt = (1.0 if implicit else 0.1) if dt is None else dt
+
+    distances = np.atleast_1d(np.asarray(distances, dtype=float))
+    n = max(len(layer_stacks), len(distances))
+    if len(layer_stacks) not in (1, n) or len(distances) not in (1, n):
+        raise ValueError("Give one layer stack and one distance per candidate (or one of either for all).")
+    stacks = list(layer_stacks) * (n // len(layer_stacks))
+    distances = np.broadcast_to(distances, (n,))
+
+    networks = [_layer_network(stack, nodes_per_layer) for stack in stacks]
+    mcp = np.array([m for m, _, _ in networks])
+    resolved = networks[0][1] is not None
+    if resolved and not implicit:
+        raise ValueError("Through-thickness conduction (nodes_per_layer > 1) needs method 'implicit'.")
+    k_link = np.array([k for _, k, _ in networks]) if resolved else None
+    eps_outer = np.array([stack[0]["eps"] for stack in stacks], dtype=float)
+
+    HRR, D, chi_r, tau_f = _peak_fire_state(fire_result)
+    view = _view_model(fire_result, view_factor, view_options)
+    q_rad_ref, q_conv_ref, _ = _radial_flux(distances, HRR, D, chi_r, tau_f, *view)
+
+    pain_time, _, _, _ = _batch_time_loop(
+        q_rad_ref, q_conv_ref, eps_outer, mcp, k_link, fire_result["t_peak_s"], target_time, implicit, dt,
+        stop_on="PAIN")
+    count("inverse.candidates", n)
+    return pain_time
+
+
+# -------------------------------------------------
+# BRACKETED SEARCH
+# -------------------------------------------------
+def _bracket_search(pain_at, lo, hi, target_time, tol, n_probes=N_PROBES):
+    """
+    Smallest x in [lo, hi] whose pain time is at least target_time.
+
+    pain_at(x) returns pain times for an array of x (NaN: not reached by
+    target_time) and must be non-decreasing in x. Every round probes
+    n_probes interior points together and keeps the sub-interval where
+    the target is first met, shrinking the bracket n_probes + 1 times.
+
+    Returns:
+    - dict with value (upper bracket end, None if even hi fails), bracket,
+      pain_time_s at value, feasible, rounds (batch PPE runs)
+    """
+    if not hi > lo:
+        raise ValueError(f"Search range must have hi > lo (got [{lo}, {hi}]).")
+    if tol <= 0 or n_probes < 1:
+        raise ValueError("tol and n_probes must be positive.")
+
+    def meets(t):
+        return np.isnan(t) | (t >= target_time)
+
+    t_ends = pain_at(np.array([lo, hi]))
+    rounds = 1
+    if meets(t_ends[0]):
+        return {"value": lo, "bracket": (lo, lo), "pain_time_s": t_ends[0], "feasible": True, "rounds": rounds}
+    if not meets(t_ends[1]):
+        return {"value": None, "bracket": (lo, hi), "pain_time_s": t_ends[1], "feasible": False,
+                "rounds": rounds}
+
+    t_hi = t_ends[1]
+    while hi - lo > tol and rounds < MAX_ROUNDS:
+        x = np.linspace(lo, hi, n_probes + 2)[1:-1]
+        t = pain_at(x)
+        rounds += 1
+
+        ok = meets(t)
+        i = int(np.argmax(ok)) if ok.any() else len(x)
+        if i < len(x):
+            hi, t_hi = x[i], t[i]
+        if i > 0:
+            lo = x[i - 1]
+
+    return {"value": hi, "bracket": (lo, hi), "pain_time_s": t_hi, "feasible": True, "rounds": rounds}
+
+
+def _result(search, target_time, **extra):
+    out = {
+        "target_time_s": target_time,
+        "value": None if search["value"] is None else float(search["value"]),
+        "feasible": search["feasible"],
+        "bracket": tuple(float(x) for x in search["bracket"]),
+        # NaN: no pain within the simulated target time
+        "pain_time_s": float(search["pain_time_s"]),
+        "solves": search["rounds"],
+    }
+    out.update(extra)
+    return out
+
+
+# -------------------------------------------------
+# QUERIES
+# -------------------------------------------------
+@timed("inverse.distance")
+def min_standoff_distance(fire_result, layers, target_time, R_min=0.0, R_max=50.0, tol=1e-3,
+                          n_probes=N_PROBES, **ppe_options):
+    """
+    Closest distance at which the wearer stays out of pain for target_time.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model (e.g. pipeline.fire_stage)
+    - layers      : PPE layer stack (list of dicts)
+    - target_time : required time without pain (s)
+    - R_min, R_max : search range (m)
+    - tol         : distance tolerance (m); the result is the far end of
+                    the final bracket, so it meets the target
+    - n_probes    : candidates per round
+    - ppe_options : method, dt, nodes_per_layer, view_factor, view_options
+                    (see pain_times)
+
+    Returns:
+    - dict with distance_m (None if not even R_max is enough; R_min if
+      the target is met there), feasible, bracket, pain_time_s at
+      distance_m (NaN: no pain by target_time), solves, target_time_s
+    """
+    def pain_at(R):
+        return pain_times(fire_result, [layers], R, target_time, **ppe_options)
+
+    search = _bracket_search(pain_at, R_min, R_max, target_time, tol, n_probes)
+    out = _result(search, target_time)
+    out["distance_m"] = out.pop("value")
+    return out
+
+
+@timed("inverse.thickness")
+def min_layer_thickness(fire_result, layers, layer, target_time, distance=None, d_range=None, tol=1e-5,
+                        standoff_flux=100e3, n_probes=N_PROBES, **ppe_options):
+    """
+    Thinnest layer that keeps the wearer out of pain for target_time.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model (e.g. pipeline.fire_stage)
+    - layers      : PPE layer stack (list of dicts)
+    - layer       : name or index of the layer whose thickness d is varied
+    - target_time : required time without pain (s)
+    - distance    : wearer distance (m); default: where the t_peak flux
+                    equals standoff_flux
+    - d_range     : (d_min, d_max) search range (m); default 1 % to 20×
+                    the layer's current thickness
+    - tol         : thickness tolerance (m)
+    - standoff_flux : flux (W/m²) fixing the default distance
+    - n_probes    : candidates per round
+    - ppe_options : method, dt, nodes_per_layer, view_factor, view_options
+                    (see pain_times)
+
+    Returns:
+    - dict with thickness_m (None if not even d_max is enough), feasible,
+      bracket, pain_time_s, solves, target_time_s, layer, distance_m
+    """
+    names = [lay.get("name") for lay in layers]
+    if isinstance(layer, str):
+        if layer not in names:
+            raise ValueError(f"Unknown layer '{layer}'. Available: {names}")
+        index = names.index(layer)
+    elif 0 <= layer < len(layers):
+        index = int(layer)
+    else:
+        raise ValueError(f"Layer index {layer} out of range for {len(layers)} layers.")
+
+    if distance is None:
+        HRR, D, chi_r, tau_f = _peak_fire_state(fire_result)
+        view = _view_model(fire_result, ppe_options.get("view_factor"), ppe_options.get("view_options"))
+        distance = float(_bisect_distance(standoff_flux, HRR, D, chi_r, tau_f, view=view))
+        if np.isnan(distance):
+            raise ValueError(f"The flux exceeds {standoff_flux} W/m² over the whole distance range; give distance.")
+
+    d0 = layers[index]["d"]
+    d_min, d_max = (0.01 * d0, 20 * d0) if d_range is None else d_range
+
+    def pain_at(d):
+        stacks = [[dict(lay, d=x) if i == index else lay for i, lay in enumerate(layers)] for x in d]
+        return pain_times(fire_result, stacks, distance, target_time, **ppe_options)
+
+    search = _bracket_search(pain_at, d_min, d_max, target_time, tol, n_probes)
+    out = _result(search, target_time, layer=names[index], distance_m=distance)
+    out["thickness_m"] = out.pop("value")
+    return out
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    from pipeline import fire_stage
+    from runner import DEFAULT_STACKS, load_layer_stacks
+
+    parser = argparse.ArgumentParser(description="Closest standoff distance or thinnest layer for a target pain time.")
+    parser.add_argument("fuel", help="fuel name (see fuel_data)")
+    parser.add_argument("m_fuel", type=float, help="fuel mass (kg)")
+    parser.add_argument("D", type=float, help="pool diameter (m)")
+    parser.add_argument("--target", type=float, required=True, help="required time without pain (s)")
+    parser.add_argument("--layer", help="solve for this layer's thickness instead of the distance")
+    parser.add_argument("--distance", type=float, help="wearer distance for --layer (m)")
+    parser.add_argument("-s", "--stacks", help="layer stacks (JSON, CSV or Parquet)")
+    parser.add_argument("--stack-id", default="standard", help="layer stack to use")
+    parser.add_argument("--method", default="implicit", help="PPE integrator (implicit, euler)")
+    args = parser.parse_args(argv)
+
+    stacks = load_layer_stacks(args.stacks) if args.stacks else DEFAULT_STACKS
+    if args.stack_id not in stacks:
+        parser.error(f"unknown stack '{args.stack_id}'")
+    layers = stacks[args.stack_id]
+
+    _, fire_result = fire_stage(args.fuel, args.m_fuel, args.D)
+    if args.layer:
+        out = min_layer_thickness(fire_result, layers, args.layer, args.target, args.distance,
+                                  method=args.method)
+    else:
+        out = min_standoff_distance(fire_result, layers, args.target, method=args.method)
+    print(pd.Series(out).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # main.py
+from burn_injury import burn_injury
 from file1_time import run_pool_fire_model
 from file2_distance import run_distance_model
-from file3_ppe import run_ppe_model
+from file3_ppe import run_ppe_model, status_summary
 from fuel_data import get_fuel_properties, get_all_fuel_names
 
 # -------------------------------------------------
@@ -87,12 +88,16 @@ if pain_time:
 else:
     print("The wearer is SAFE for the entire exposure duration.")
 
-statuses = ["SAFE", "PAIN", "BURN_RISK", "NOT_SAFE"]
-for status in statuses:
-    rows = df_ppe[df_ppe["Exposure_Safety_Status"] == status]
-    if not rows.empty:
-        t_first = rows["Time_s"].iloc[0]
-        print(f"First time status '{status}' is reached: t = {round(t_first,2)} s")
+summary = status_summary(df_ppe).dropna(subset=["First_Entry_s"])
+for status, row in summary.iterrows():
+    print(f"First time status '{status}' is reached: t = {round(row['First_Entry_s'],2)} s"
+          f" (total {round(row['Time_In_Level_s'],1)} s)")
+
+injury = burn_injury(df_ppe)
+for degree in ["first", "second", "third"]:
+    t_burn = injury[f"{degree}_degree_s"]
+    print(f"{degree.capitalize()}-degree burn (Henriques): "
+          + (f"t = {round(t_burn, 2)} s" if t_burn is not None else "not reached"))
 
 final_status = df_ppe["Exposure_Safety_Status"].iloc[-1]
 print(f"\nFinal Status at end of exposure ({df_ppe['Time_s'].iloc[-1]} s): {final_status}")
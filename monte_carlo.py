@@ -0,0 +1,429 @@
+# ----------------------------------------------------------
+# MONTE CARLO UNCERTAINTY PROPAGATION
+# Samples uncertain fuel, flame and garment inputs (plain
+# random or Latin hypercube), runs fire → distance → PPE for
+# whole chunks of samples as arrays, spreads the chunks over
+# a process pool and reports percentile bands of the peak
+# flux, standoff / safe distances and pain time.
+#
+# Cost is linear in the number of samples and set by the PPE
+# loop, which runs until every sample of a chunk reaches
+# stop_on. On one core (1 worker) 1e5 samples took about 4 s
+# for 500 kg gasoline / D = 5 m and 12-14 s for the main.py
+# scenario (14.8 kg / D = 2 m), whose slower exposures keep
+# the loop going longer; see the monte_carlo benchmark suite.
+# Usage: python monte_carlo.py Gasoline 500 5 -n 100000 [-j 8]
+# ----------------------------------------------------------
+
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from correlations import chi_r, kappa_f
+from file1_time import _flame_flux, _hrr_shape
+from file2_distance import _bisect_distance, _radial_flux
+from file3_ppe import _batch_time_loop, _layer_network
+from fuel_data import get_fuel_properties
+from instrumentation import Profiler, count, stage, timed
+
+
+SAMPLING_METHODS = ("lhs", "random")
+
+# Uncertain inputs as factors on the nominal value:
+#   ("normal", mean, sd), ("lognormal", median, sigma_log),
+#   ("uniform", low, high), ("triangular", low, mode, high)
+# layer_* factors are drawn independently for every layer
+UNCERTAINTY = {
+    "burning_rate":          ("normal", 1.0, 0.15),
+    "lhv":                   ("normal", 1.0, 0.02),
+    "combustion_efficiency": ("uniform", 0.90, 1.0),
+    "chi_r":                 ("triangular", 0.7, 1.0, 1.3),
+    "kappa_f":               ("triangular", 0.5, 1.0, 1.5),
+    "layer_d":               ("normal", 1.0, 0.10),
+    "layer_k":               ("normal", 1.0, 0.10),
+    "layer_rho":             ("normal", 1.0, 0.05),
+    "layer_cp":              ("normal", 1.0, 0.05),
+    "layer_eps":             ("uniform", 0.95, 1.05),
+}
+
+MIN_FACTOR = 1e-3      # floor on sampled factors (normal tails)
+
+BAND_COLUMNS = ["q_peak_W_m2", "Distance_m", "Safe_Distance_m", "Pain_Time_s"]
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# -------------------------------------------------
+# SAMPLING
+# -------------------------------------------------
+def _norm_ppf(u):
+    """Standard normal quantiles (Acklam's rational approximation, |rel. error| < 1.2e-9)."""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+
+    u = np.clip(np.asarray(u, dtype=float), 1e-300, 1 - 1e-16)
+    tail = np.minimum(u, 1 - u)
+    low = tail < 0.02425
+
+    # central region
+    q = u - 0.5
+    r = q * q
+    x = ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+         / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1))
+
+    # tails
+    s = np.sqrt(-2 * np.log(np.where(low, tail, 0.5)))
+    x_tail = ((((((c[0] * s + c[1]) * s + c[2]) * s + c[3]) * s + c[4]) * s + c[5])
+              / ((((d[0] * s + d[1]) * s + d[2]) * s + d[3]) * s + 1))
+    return np.where(low, np.where(u < 0.5, x_tail, -x_tail), x)
+
+
+def _from_unit(u, spec):
+    """Map uniform (0, 1) draws to the distribution spec (inverse CDF)."""
+    kind, *p = spec
+    if kind == "normal":
+        return p[0] + p[1] * _norm_ppf(u)
+    if kind == "lognormal":
+        return p[0] * np.exp(p[1] * _norm_ppf(u))
+    if kind == "uniform":
+        return p[0] + (p[1] - p[0]) * u
+    if kind == "triangular":
+        low, mode, high = p
+        split = (mode - low) / (high - low) if high > low else 0.5
+        return np.where(u < split,
+                        low + np.sqrt(u * (high - low) * (mode - low)),
+                        high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+    raise ValueError(f"Unknown distribution '{kind}'. Available: ['normal', 'lognormal', 'uniform', 'triangular']")
+
+
+def _check_spec(name, spec):
+    n_params = {"normal": 2, "lognormal": 2, "uniform": 2, "triangular": 3}
+    if not isinstance(spec, tuple) or spec[0] not in n_params or len(spec) != n_params[spec[0]] + 1:
+        raise ValueError(f"Bad distribution for '{name}': {spec!r} "
+                         "(use ('normal', mean, sd), ('lognormal', median, sigma), "
+                         "('uniform', low, high) or ('triangular', low, mode, high)).")
+    if spec[0] == "triangular" and not spec[1] <= spec[2] <= spec[3]:
+        raise ValueError(f"Triangular distribution for '{name}' needs low <= mode <= high.")
+
+
+def sample_factors(n, uncertainty=None, n_layers=4, method="lhs", rng=None):
+    """
+    Input factors for n samples.
+
+    Parameters:
+    - n           : number of samples
+    - uncertainty : {name: distribution spec}, merged over UNCERTAINTY
+                    (None as a spec fixes that input at its nominal value)
+    - n_layers    : layers in the garment stack (layer_* inputs)
+    - method      : "lhs" (one draw per stratum in every dimension) or "random"
+    - rng         : numpy Generator
+
+    Returns:
+    - dict name -> (n,) factors, or (n, n_layers) for layer_* inputs
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method '{method}'. Available: {list(SAMPLING_METHODS)}")
+    rng = np.random.default_rng() if rng is None else rng
+
+    specs = dict(UNCERTAINTY)
+    specs.update(uncertainty or {})
+    unknown = set(specs) - set(UNCERTAINTY)
+    if unknown:
+        raise ValueError(f"Unknown uncertain inputs: {sorted(unknown)}. Available: {list(UNCERTAINTY)}")
+    specs = {name: spec for name, spec in specs.items() if spec is not None}
+    for name, spec in specs.items():
+        _check_spec(name, spec)
+
+    widths = [n_layers if name.startswith("layer_") else 1 for name in specs]
+    n_dim = sum(widths)
+
+    if method == "lhs":
+        strata = np.argsort(rng.random((n_dim, n)), axis=1)
+        u = (strata + rng.random((n_dim, n))) / n
+    else:
+        u = rng.random((n_dim, n))
+
+    factors = {}
+    row = 0
+    for (name, spec), width in zip(specs.items(), widths):
+        x = np.maximum(_from_unit(u[row:row + width], spec), MIN_FACTOR)
+        factors[name] = x.T if name.startswith("layer_") else x[0]
+        row += width
+    return factors
+
+
+# -------------------------------------------------
+# ONE CHUNK (samples as arrays)
+# -------------------------------------------------
+def _garment_arrays(layers, factors, n, nodes_per_layer):
+    """Per-sample node heat capacities, link conductances and outer emissivity."""
+    mcp0, k0, owner = _layer_network(layers, nodes_per_layer)
+    ones = np.ones((n, len(layers)))
+    f_d, f_k, f_rho, f_cp, f_eps = (factors.get(f"layer_{p}", ones) for p in ("d", "k", "rho", "cp", "eps"))
+
+    mcp = mcp0 * (f_rho * f_cp * f_d)[:, owner]
+    # conduction links lie within one layer (air-gap links stay NaN)
+    k_link = None if k0 is None else k0 * (f_k / f_d)[:, owner[:-1]]
+    eps = np.minimum(layers[0]["eps"] * f_eps[:, 0], 1.0)
+    return mcp, k_link, eps
+
+
+def _run_chunk(seed_seq, n, props, m_fuel, D, layers, uncertainty, method, options, profile_memory=None):
+    if profile_memory is None:
+        return _chunk_samples(seed_seq, n, props, m_fuel, D, layers, uncertainty, method, options), None
+
+    # profiled in the worker; the records are merged by the parent
+    with Profiler(memory=profile_memory) as prof:
+        with prof.stage("mc.chunk"):
+            df = _chunk_samples(seed_seq, n, props, m_fuel, D, layers, uncertainty, method, options)
+    return df, prof.records
+
+
+def _chunk_samples(seed_seq, n, props, m_fuel, D, layers, uncertainty, method, options):
+    rng = np.random.default_rng(seed_seq)
+    factors = sample_factors(n, uncertainty, len(layers), method, rng)
+    one = np.ones(n)
+    view = (options["view_factor"], options["view_options"])
+
+    # ==========================================================
+    # FIRE (samples × time)
+    # ==========================================================
+    with stage("mc.fire"):
+        m_dot_area = props["burning_rate"] * factors.get("burning_rate", one)
+        LHV = props["lhv"] * 1e6 * factors.get("lhv", one)
+        eta = np.minimum(props["combustion_efficiency"] * factors.get("combustion_efficiency", one), 1.0)
+        chi_r_s = np.minimum(chi_r(D) * factors.get("chi_r", one), 1.0)
+        tau_f_s = np.exp(-kappa_f(D) * factors.get("kappa_f", one) * (2 * D))
+
+        A_pool = math.pi * D**2 / 4.0
+        t_burn = m_fuel / (m_dot_area * A_pool)
+        time = np.linspace(0.0, 1.0, options["n_points"]) * t_burn[:, None]
+        HRR = (m_dot_area * A_pool * LHV * eta)[:, None] * _hrr_shape(time, t_burn[:, None])
+
+        q_total = _flame_flux(HRR, D, chi_r_s[:, None], tau_f_s[:, None], 0.0, *view)[3]
+        idx_peak = np.argmax(q_total, axis=1)
+        rows = np.arange(n)
+        q_peak = q_total[rows, idx_peak]
+        t_peak = time[rows, idx_peak]
+        HRR_peak = HRR[rows, idx_peak]
+    count("mc.fire", n * options["n_points"])
+
+    # ==========================================================
+    # DISTANCES (bisected together)
+    # ==========================================================
+    with stage("mc.distance"):
+        fluxes = np.array([[options["standoff_flux"]], [options["safe_flux"]]])
+        R = _bisect_distance(fluxes, HRR_peak, D, chi_r_s, tau_f_s, options["R_min"], options["R_max"],
+                             options["tol"], view)
+        R_standoff, R_safe = R
+
+        # the wearer stands at the standoff distance (R_max if still exceeded there)
+        R_ppe = np.where(np.isnan(R_standoff), options["R_max"], R_standoff)
+        q_rad_ref, q_conv_ref, _ = _radial_flux(R_ppe, HRR_peak, D, chi_r_s, tau_f_s, *view)
+
+    # ==========================================================
+    # PPE (samples × nodes)
+    # ==========================================================
+    with stage("mc.ppe"):
+        mcp, k_link, eps = _garment_arrays(layers, factors, n, options["nodes_per_layer"])
+        pain_time, burn_time, _, _ = _batch_time_loop(
+            q_rad_ref, q_conv_ref, eps, mcp, k_link, t_peak, options["exposure_time"], True,
+            options["dt"], options["stop_on"])
+
+    data = {
+        "Burn_Duration_s": t_burn,
+        "q_peak_W_m2": q_peak,
+        "t_peak_s": t_peak,
+        "Distance_m": R_standoff,
+        "Safe_Distance_m": R_safe,
+        "Pain_Time_s": pain_time,
+        "Burn_Risk_Time_s": burn_time,
+    }
+    for name, x in factors.items():
+        if x.ndim == 1:
+            data[f"{name}_factor"] = x
+        else:
+            for i in range(x.shape[1]):
+                data[f"{name}_factor_L{i}"] = x[:, i]
+    return pd.DataFrame(data)
+
+
+# -------------------------------------------------
+# REPORT
+# -------------------------------------------------
+def percentile_bands(df_samples, columns=None, percentiles=PERCENTILES):
+    """
+    Percentile bands of sampled outputs.
+
+    NaN samples (pain never reached, flux still exceeded at R_max) are left
+    out of the percentiles and counted in Fraction_Finite.
+
+    Returns:
+    - DataFrame indexed by Quantity with Mean, Std, P<p> columns and
+      Fraction_Finite
+    """
+    columns = BAND_COLUMNS if columns is None else columns
+    rows = []
+    for col in columns:
+        x = df_samples[col].to_numpy(dtype=float)
+        finite = x[np.isfinite(x)]
+        row = {"Quantity": col}
+        if len(finite):
+            row["Mean"] = finite.mean()
+            row["Std"] = finite.std(ddof=1) if len(finite) > 1 else 0.0
+            row.update({f"P{p:g}": v for p, v in zip(percentiles, np.percentile(finite, percentiles))})
+        else:
+            row.update({"Mean": np.nan, "Std": np.nan}, **{f"P{p:g}": np.nan for p in percentiles})
+        row["Fraction_Finite"] = len(finite) / len(x) if len(x) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("Quantity")
+
+
+# -------------------------------------------------
+# MANY SAMPLES
+# -------------------------------------------------
+@timed("mc.run")
+def run_monte_carlo(fuel, m_fuel, D, layers, n_samples=1000, method="lhs", seed=None, uncertainty=None,
+                    exposure_time=600.0, dt=1.0, nodes_per_layer=1, stop_on="BURN_RISK",
+                    standoff_flux=100e3, safe_flux=4.7e3, R_min=0.0, R_max=50.0, tol=1e-4, n_points=300,
+                    view_factor="point", view_options=None, fuel_props=None, workers=None,
+                    chunk_size=10_000, percentiles=PERCENTILES, profiler=None):
+    """
+    Propagate input uncertainty through fire → distance → PPE.
+
+    Every chunk of samples draws from its own stream spawned from one
+    SeedSequence, so results depend only on seed and chunk_size, not on
+    the worker count or completion order. With method "lhs" each chunk
+    is its own Latin hypercube.
+
+    Run time scales with n_samples / workers and with how long the PPE
+    loop runs (until every sample in a chunk reaches stop_on, at most
+    exposure_time / dt steps); see the module header for measured figures.
+
+    Parameters:
+    - fuel, m_fuel, D : scenario (fuel name, mass in kg, pool diameter in m)
+    - layers        : nominal PPE layer stack (list of dicts)
+    - n_samples     : number of samples
+    - method        : "lhs" or "random"
+    - seed          : int / SeedSequence (None draws fresh entropy, which is
+                      returned so the run can be repeated)
+    - uncertainty   : {input: distribution} overrides of UNCERTAINTY
+    - exposure_time, dt, nodes_per_layer : PPE settings; the PPE is the
+                      implicit batch integrator (crossings inside the step)
+    - stop_on       : "PAIN" or "BURN_RISK" ends a chunk once every sample
+                      has reached that level, None runs the full exposure
+    - standoff_flux : flux (W/m²) fixing the wearer's distance (Distance_m)
+    - safe_flux     : flux (W/m²) for the safe distance (Safe_Distance_m)
+    - R_min, R_max, tol : distance search range and tolerance (m)
+    - n_points      : fire time points per sample
+    - view_factor, view_options : flame view factor (see view_factor.py)
+    - fuel_props    : nominal fuel properties (default from fuel_data)
+    - workers       : process count (default os.cpu_count(); 1 runs in-process)
+    - chunk_size    : samples advanced together as one array batch
+    - percentiles   : percentiles reported in df_bands
+    - profiler      : optional instrumentation.Profiler (worker stages merged)
+
+    Returns:
+    - dict with df_samples (one row per sample: outputs and input factors),
+      df_bands (percentile_bands of BAND_COLUMNS) and seed_entropy
+    """
+    if n_samples < 1 or chunk_size < 1:
+        raise ValueError("n_samples and chunk_size must be at least 1.")
+    if stop_on not in (None, "PAIN", "BURN_RISK"):
+        raise ValueError(f"Unknown stop level '{stop_on}'. Available levels: ['PAIN', 'BURN_RISK']")
+
+    props = dict(get_fuel_properties(fuel) if fuel_props is None else fuel_props)
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    # validate the specs once in the parent
+    sample_factors(1, uncertainty, len(layers), method)
+
+    options = {
+        "exposure_time": exposure_time, "dt": dt, "nodes_per_layer": nodes_per_layer, "stop_on": stop_on,
+        "standoff_flux": standoff_flux, "safe_flux": safe_flux, "R_min": R_min, "R_max": R_max, "tol": tol,
+        "n_points": n_points, "view_factor": view_factor, "view_options": dict(view_options or {}),
+    }
+
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    streams = seed_seq.spawn(len(sizes))
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    profile_memory = None if profiler is None else profiler.memory
+
+    tasks = [(stream, size, props, m_fuel, D, layers, uncertainty, method, options, profile_memory)
+             for stream, size in zip(streams, sizes)]
+    frames = [None] * len(tasks)
+
+    def collect(i, chunk_result):
+        df, stage_records = chunk_result
+        if stage_records is not None:
+            profiler.merge(stage_records)
+        frames[i] = df
+
+    if workers <= 1 or len(tasks) <= 1:
+        for i, task in enumerate(tasks):
+            collect(i, _run_chunk(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = {pool.submit(_run_chunk, *task): i for i, task in enumerate(tasks)}
+            for future in as_completed(futures):
+                collect(futures[future], future.result())
+
+    df_samples = pd.concat(frames, ignore_index=True)
+    df_samples.insert(0, "Sample", np.arange(len(df_samples)))
+
+    return {
+        "df_samples": df_samples,
+        "df_bands": percentile_bands(df_samples, percentiles=percentiles),
+        "seed_entropy": seed_seq.entropy,
+    }
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    from runner import DEFAULT_STACKS, load_layer_stacks
+
+    parser = argparse.ArgumentParser(description="Monte Carlo uncertainty of one pool fire / PPE scenario.")
+    parser.add_argument("fuel", help="fuel name (see fuel_data)")
+    parser.add_argument("m_fuel", type=float, help="fuel mass (kg)")
+    parser.add_argument("D", type=float, help="pool diameter (m)")
+    parser.add_argument("-n", "--samples", type=int, default=1000, help="number of samples")
+    parser.add_argument("--method", default="lhs", choices=SAMPLING_METHODS, help="sampling method")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("-s", "--stacks", help="layer stacks (JSON, CSV or Parquet)")
+    parser.add_argument("--stack-id", default="standard", help="layer stack to use")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="samples per task")
+    parser.add_argument("-o", "--output", help="write the samples to this CSV")
+    parser.add_argument("--profile", action="store_true", help="print per-stage timings")
+    args = parser.parse_args(argv)
+
+    stacks = load_layer_stacks(args.stacks) if args.stacks else DEFAULT_STACKS
+    if args.stack_id not in stacks:
+        parser.error(f"unknown stack '{args.stack_id}'")
+    profiler = Profiler() if args.profile else None
+
+    out = run_monte_carlo(args.fuel, args.m_fuel, args.D, stacks[args.stack_id], n_samples=args.samples,
+                          method=args.method, seed=args.seed, workers=args.workers,
+                          chunk_size=args.chunk_size, profiler=profiler)
+
+    print(out["df_bands"].to_string())
+    print(f"seed entropy: {out['seed_entropy']}", file=sys.stderr)
+    if args.output:
+        out["df_samples"].to_csv(args.output, index=False)
+    if profiler is not None:
+        print(profiler.summary().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
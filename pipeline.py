@@ -0,0 +1,101 @@
+# ----------------------------------------------------------
+# FIRE → DISTANCE → PPE PIPELINE
+# Runs the three models for one scenario, memoizing each
+# stage so unchanged upstream stages are reused
+# ----------------------------------------------------------
+
+from cache import ResultCache, cache_key
+from file1_time import run_pool_fire_model
+from file2_distance import run_distance_model
+from file3_ppe import run_ppe_model
+from fuel_data import get_fuel_properties
+from instrumentation import timed
+
+
+DEFAULT_CACHE = ResultCache()
+
+
+def fire_stage(fuel, m_fuel, D, fuel_props=None, cache=DEFAULT_CACHE, view_factor="point", view_options=None):
+    """
+    Cached pool fire result of a scenario (the fire stage of run_pipeline).
+
+    Returns (fire_key, fire_result); fire_key also keys the stages
+    derived from this fire.
+    """
+    if fuel_props is None:
+        fuel_props = get_fuel_properties(fuel)
+    if cache is None:
+        cache = ResultCache(max_bytes=0)
+
+    # only the properties the fire model uses enter the key
+    fire_inputs = {
+        "fuel": fuel,
+        "m_fuel": m_fuel,
+        "D": D,
+        "burning_rate": fuel_props["burning_rate"],
+        "lhv_mj": fuel_props["lhv"],
+        "combustion_efficiency": fuel_props["combustion_efficiency"],
+    }
+    if view_factor != "point" or view_options:
+        fire_inputs.update(view_factor=view_factor, view_options=view_options)
+    fire_key = cache_key("fire", **fire_inputs)
+    return fire_key, cache.get_or_compute(fire_key, run_pool_fire_model, **fire_inputs)
+
+
+@timed("pipeline")
+def run_pipeline(fuel, m_fuel, D, layers, exposure_time=600.0, fuel_props=None, cache=DEFAULT_CACHE,
+                 view_factor="point", view_options=None, **ppe_options):
+    """
+    Pool fire, distance and PPE models for one scenario, with stage caching.
+
+    Stage keys are built from the inputs that stage depends on, so changing
+    the PPE stack or exposure time reuses the cached fire and distance
+    results, and an identical scenario returns without recomputation.
+
+    Parameters:
+    - fuel, m_fuel, D : as run_pool_fire_model
+    - layers        : PPE layer stack (list of dicts)
+    - exposure_time : PPE exposure duration (s)
+    - fuel_props    : fuel property dict (looked up from fuel_data if None)
+    - cache         : ResultCache, or None to disable caching
+    - view_factor, view_options : flame view factor of the fire and
+                      distance stages ("point" or "cylinder", see view_factor.py)
+    - ppe_options   : extra keyword arguments for run_ppe_model
+                      (method, dt, every, on_chunk, ...); on_chunk is not
+                      part of the cache key, and on a PPE cache hit it
+                      receives the cached history as one chunk
+
+    Returns:
+    - dict with fire_result, df_distance, df_ppe, pain_time
+    """
+    if cache is None:
+        cache = ResultCache(max_bytes=0)
+
+    fire_key, fire_result = fire_stage(fuel, m_fuel, D, fuel_props, cache, view_factor, view_options)
+
+    distance_key = cache_key("distance", fire_key)
+    df_distance = cache.get_or_compute(distance_key, run_distance_model, fire_result)
+
+    # a callback does not change the result (and its repr differs per run)
+    key_options = {k: v for k, v in ppe_options.items() if k != "on_chunk"}
+    ppe_key = cache_key("ppe", distance_key, layers, exposure_time, **key_options)
+
+    on_chunk = ppe_options.get("on_chunk")
+    computed = False
+
+    def compute_ppe():
+        nonlocal computed
+        computed = True
+        return run_ppe_model(df_distance, layers, fire_result["t_peak_s"], exposure_time=exposure_time,
+                             **ppe_options)
+
+    df_ppe, pain_time = cache.get_or_compute(ppe_key, compute_ppe)
+    if on_chunk is not None and not computed:
+        on_chunk(df_ppe)
+
+    return {
+        "fire_result": fire_result,
+        "df_distance": df_distance,
+        "df_ppe": df_ppe,
+        "pain_time": pain_time,
+    }
@@ -0,0 +1,257 @@
+# ----------------------------------------------------------
+# RESULTS STORE
+# Columnar binary storage of pipeline results: one .npy file
+# per column (memory-mappable) plus a meta.json per scenario
+#
+# <store>/<scenario_id>/meta.json
+# <store>/<scenario_id>/<table>/<column>.npy
+# ----------------------------------------------------------
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from file3_ppe import STATUS_LEVELS
+
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+# axis columns always stored as float64, so values such as t_peak_s can be
+# matched against them exactly after a float32 round trip
+AXIS_COLUMNS = ("Time_s", "Distance_m")
+
+# tables of a run_pipeline result and where they live in it
+RESULT_TABLES = {
+    "fire": ("fire_result", "df_flux"),
+    "distance": ("df_distance", None),
+    "ppe": ("df_ppe", None),
+}
+
+
+def _scenario_dir(store_dir, scenario_id):
+    scenario_id = str(scenario_id)
+    if not scenario_id or scenario_id in (".", "..") or "/" in scenario_id or os.sep in scenario_id:
+        raise ValueError(f"Invalid scenario id '{scenario_id}'.")
+    return os.path.join(store_dir, scenario_id)
+
+
+def _scalar(value):
+    """JSON-safe scalar (numpy types unwrapped, NaN / inf kept as strings)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return repr(value)
+    return value
+
+
+def _unscalar(value):
+    if value in ("nan", "inf", "-inf"):
+        return float(value)
+    return value
+
+
+# -------------------------------------------------
+# WRITE
+# -------------------------------------------------
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _write_column(path, series, float_dtype):
+    """Write one column; returns its meta entry."""
+    ordered = False
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = [str(c) for c in series.cat.categories]
+        codes = series.cat.codes.to_numpy()
+        ordered = bool(series.cat.ordered)
+    elif _is_text(series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        categories = [str(c) for c in uniques]
+    else:
+        values = series.to_numpy()
+        if values.dtype.kind == "f" and float_dtype is not None and series.name not in AXIS_COLUMNS:
+            values = values.astype(float_dtype)
+        np.save(path, values)
+        return {"dtype": values.dtype.str}
+
+    # categorical: smallest integer code type (-1 marks missing)
+    code_dtype = np.int8 if len(categories) < 128 else np.int32
+    np.save(path, codes.astype(code_dtype))
+    return {"dtype": np.dtype(code_dtype).str, "categories": categories, "ordered": ordered}
+
+
+def save_scenario(store_dir, scenario_id, tables, scalars=None, float_dtype=np.float32, categories=None):
+    """
+    Write one scenario's tables and scalars to the store.
+
+    Parameters:
+    - store_dir   : store root directory (created if needed)
+    - scenario_id : directory name of the scenario (replaced if present)
+    - tables      : dict of name -> DataFrame
+    - scalars     : dict of JSON-serializable summary values
+    - float_dtype : storage dtype of float columns (None keeps float64);
+                    AXIS_COLUMNS (Time_s, Distance_m) always stay float64
+    - categories  : optional dict of column -> category list fixing the
+                    code order of string columns (e.g. status levels)
+
+    Object (string) columns are stored as integer codes plus a category
+    list; all other columns as plain .npy arrays.
+    """
+    final_dir = _scenario_dir(store_dir, scenario_id)
+    tmp_dir = final_dir + ".tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "scenario_id": str(scenario_id),
+        "scalars": {k: _scalar(v) for k, v in (scalars or {}).items()},
+        "tables": {},
+    }
+
+    for name, df in tables.items():
+        os.makedirs(os.path.join(tmp_dir, name))
+        columns = {}
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            if categories and col in categories and _is_text(series):
+                series = series.astype(pd.CategoricalDtype(categories[col]))
+            entry = _write_column(os.path.join(tmp_dir, name, f"{i:03d}.npy"), series, float_dtype)
+            entry["file"] = f"{i:03d}.npy"
+            columns[str(col)] = entry
+        # DataFrame.attrs (e.g. the PPE status summary) travel with the table
+        meta["tables"][name] = {"rows": len(df), "columns": columns, "attrs": dict(df.attrs)}
+
+    with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=1)
+
+    # swap the finished directory in, so readers never see a half-written scenario
+    if os.path.exists(final_dir):
+        shutil.rmtree(final_dir)
+    os.replace(tmp_dir, final_dir)
+    return final_dir
+
+
+def save_results(store_dir, scenario_id, results, float_dtype=np.float32):
+    """
+    Store a run_pipeline result dict (fire / distance / PPE tables plus
+    the fire summary values and pain_time as scalars).
+    """
+    tables = {}
+    for name, (key, sub) in RESULT_TABLES.items():
+        if key in results:
+            tables[name] = results[key][sub] if sub else results[key]
+
+    fire_result = results.get("fire_result", {})
+    scalars = {k: v for k, v in fire_result.items() if not isinstance(v, (pd.DataFrame, dict))}
+    scalars["pain_time"] = results.get("pain_time")
+
+    return save_scenario(store_dir, scenario_id, tables, scalars, float_dtype,
+                         categories={"Exposure_Safety_Status": STATUS_LEVELS})
+
+
+# -------------------------------------------------
+# READ
+# -------------------------------------------------
+def list_scenarios(store_dir):
+    """Scenario ids present in the store."""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(name for name in os.listdir(store_dir)
+                  if os.path.exists(os.path.join(store_dir, name, META_FILE)))
+
+
+def load_meta(store_dir, scenario_id):
+    with open(os.path.join(_scenario_dir(store_dir, scenario_id), META_FILE)) as f:
+        meta = json.load(f)
+    meta["scalars"] = {k: _unscalar(v) for k, v in meta["scalars"].items()}
+    return meta
+
+
+def load_columns(store_dir, scenario_id, table, columns=None, mmap=True, decode=False):
+    """
+    Raw column arrays of one table (memory-mapped by default).
+
+    Categorical columns are returned as their integer codes unless
+    decode=True; the category lists are in load_meta(...)["tables"].
+    """
+    meta = load_meta(store_dir, scenario_id)
+    if table not in meta["tables"]:
+        raise ValueError(f"Scenario '{scenario_id}' has no table '{table}'.")
+
+    entries = meta["tables"][table]["columns"]
+    columns = list(entries) if columns is None else list(columns)
+    unknown = set(columns) - set(entries)
+    if unknown:
+        raise ValueError(f"Unknown columns in table '{table}': {sorted(unknown)}")
+
+    base = os.path.join(_scenario_dir(store_dir, scenario_id), table)
+    arrays = {}
+    for col in columns:
+        entry = entries[col]
+        values = np.load(os.path.join(base, entry["file"]), mmap_mode="r" if mmap else None)
+        if decode and "categories" in entry:
+            values = pd.Categorical.from_codes(np.asarray(values), dtype=pd.CategoricalDtype(
+                entry["categories"], ordered=entry.get("ordered", False)))
+        arrays[col] = values
+    return arrays
+
+
+def load_table(store_dir, scenario_id, table, columns=None, categorical=True, mmap=True):
+    """
+    One table as a DataFrame.
+
+    Only the requested columns are read. Categorical columns come back as
+    pandas categoricals (or plain strings with categorical=False).
+    """
+    arrays = load_columns(store_dir, scenario_id, table, columns, mmap=mmap, decode=True)
+    if not categorical:
+        arrays = {k: np.asarray(v).astype(str) if isinstance(v, pd.Categorical) else v
+                  for k, v in arrays.items()}
+    df = pd.DataFrame(arrays)
+    df.attrs.update(load_meta(store_dir, scenario_id)["tables"][table].get("attrs", {}))
+    return df
+
+
+def load_results(store_dir, scenario_id, float64=True):
+    """
+    Rebuild a run_pipeline-style result dict from the store.
+
+    float64=True upcasts float columns back to float64 so downstream code
+    sees the same dtypes as a fresh run.
+    """
+    meta = load_meta(store_dir, scenario_id)
+    tables = {}
+    for name in meta["tables"]:
+        df = load_table(store_dir, scenario_id, name, mmap=False)
+        if float64:
+            floats = df.select_dtypes("floating").columns
+            df[floats] = df[floats].astype(np.float64)
+        tables[name] = df
+
+    scalars = dict(meta["scalars"])
+    pain_time = scalars.pop("pain_time", None)
+
+    results = {"pain_time": pain_time}
+    if "fire" in tables:
+        results["fire_result"] = dict(scalars, df_flux=tables["fire"])
+    if "distance" in tables:
+        results["df_distance"] = tables["distance"]
+    if "ppe" in tables:
+        results["df_ppe"] = tables["ppe"]
+    return results
+
+
+def load_scalars(store_dir, scenario_ids=None):
+    """Summary scalars of many scenarios as one DataFrame (tables are not read)."""
+    scenario_ids = list_scenarios(store_dir) if scenario_ids is None else scenario_ids
+    rows = [dict(load_meta(store_dir, sid)["scalars"], Scenario_ID=sid) for sid in scenario_ids]
+    df = pd.DataFrame(rows)
+    if len(df):
+        df = df[["Scenario_ID"] + [c for c in df.columns if c != "Scenario_ID"]]
+    return df
@@ -0,0 +1,337 @@
+# ----------------------------------------------------------
+# SCENARIO RUNNER
+# Runs fire → distance → PPE for a table of scenarios across
+# a process pool, appending results as chunks finish so an
+# interrupted run can be resumed
+# Usage: python runner.py scenarios.csv -o results.csv [-j 8]
+# ----------------------------------------------------------
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from file3_ppe import STATUS_LEVELS, status_summary
+from fuel_data import load_fuels
+from instrumentation import Profiler
+from pipeline import run_pipeline
+from results_io import save_results
+
+
+SCENARIO_COLUMNS = ["Scenario_ID", "Fuel", "m_fuel_kg", "D_m", "Stack_ID", "Exposure_Time_s"]
+
+DEFAULT_STACKS = {
+    "standard": [
+        {"name": "Outer Shell",      "d": 0.0007, "k": 0.25, "rho": 450, "cp": 1400, "eps": 0.8},
+        {"name": "Moisture Barrier", "d": 0.0005, "k": 0.20, "rho": 900, "cp": 1300, "eps": 0.7},
+        {"name": "Thermal Liner",    "d": 0.0030, "k": 0.05, "rho": 120, "cp": 1400, "eps": 0.9},
+        {"name": "Inner Liner",      "d": 0.0005, "k": 0.10, "rho": 300, "cp": 1300, "eps": 0.9},
+    ]
+}
+
+
+# -------------------------------------------------
+# INPUTS
+# -------------------------------------------------
+def _read_table(path):
+    if str(path).lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def load_scenarios(path_or_df):
+    """
+    Scenario table from a CSV / Parquet file (or a DataFrame).
+
+    Columns: Fuel, m_fuel_kg, D_m, and optionally Stack_ID (default
+    "standard"), Exposure_Time_s (default 600) and Scenario_ID (default
+    the row number, which keeps IDs stable for resuming).
+    """
+    df = path_or_df.copy() if isinstance(path_or_df, pd.DataFrame) else _read_table(path_or_df)
+
+    missing = {"Fuel", "m_fuel_kg", "D_m"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Scenario table is missing columns: {sorted(missing)}")
+
+    if "Scenario_ID" not in df.columns:
+        df["Scenario_ID"] = np.arange(len(df))
+    if "Stack_ID" not in df.columns:
+        df["Stack_ID"] = "standard"
+    if "Exposure_Time_s" not in df.columns:
+        df["Exposure_Time_s"] = 600.0
+
+    if df["Scenario_ID"].duplicated().any():
+        raise ValueError("Scenario_ID values must be unique.")
+
+    df["Scenario_ID"] = df["Scenario_ID"].astype(str)
+    df["Stack_ID"] = df["Stack_ID"].astype(str)
+    return df[SCENARIO_COLUMNS].reset_index(drop=True)
+
+
+def load_layer_stacks(path):
+    """
+    Layer stacks by Stack_ID.
+
+    JSON: {"stack_id": [{"name", "d", "k", "rho", "cp", "eps"}, ...], ...}
+    CSV / Parquet: one row per layer with a Stack_ID column, outer layer first.
+    """
+    if str(path).lower().endswith(".json"):
+        with open(path) as f:
+            stacks = json.load(f)
+        return {str(k): list(v) for k, v in stacks.items()}
+
+    df = _read_table(path)
+    if "Stack_ID" not in df.columns:
+        raise ValueError("Layer table needs a Stack_ID column.")
+    return {
+        str(stack_id): group.drop(columns="Stack_ID").to_dict("records")
+        for stack_id, group in df.groupby("Stack_ID", sort=False)
+    }
+
+
+# -------------------------------------------------
+# ONE SCENARIO
+# -------------------------------------------------
+def run_scenario(scenario, stacks, store=None, **ppe_options):
+    """
+    Pipeline summary for one scenario (dict with the SCENARIO_COLUMNS keys).
+
+    With store set, the full results are also written to that results_io
+    store under the Scenario_ID.
+    """
+    result = {col: scenario[col] for col in SCENARIO_COLUMNS}
+
+    try:
+        if scenario["Stack_ID"] not in stacks:
+            raise ValueError(f"Unknown Stack_ID '{scenario['Stack_ID']}'.")
+
+        out = run_pipeline(scenario["Fuel"], float(scenario["m_fuel_kg"]), float(scenario["D_m"]),
+                           stacks[scenario["Stack_ID"]], exposure_time=float(scenario["Exposure_Time_s"]),
+                           **ppe_options)
+        if store is not None:
+            save_results(store, scenario["Scenario_ID"], out)
+
+        fire_result = out["fire_result"]
+        df_distance = out["df_distance"]
+        df_ppe = out["df_ppe"]
+
+        selected = df_distance[df_distance["Flux_Approx_100kW"] == True].iloc[0]
+        summary = status_summary(df_ppe)
+
+        result.update({
+            "Burn_Duration_s": fire_result["burn_duration_s"],
+            "q_peak_W_m2": fire_result["q_peak_W_m2"],
+            "t_peak_s": fire_result["t_peak_s"],
+            "Distance_m": selected["Distance_m"],
+            "Total_Flux_W_m2": selected["Total_Flux_W_m2"],
+            "Pain_Time_s": np.nan if out["pain_time"] is None else out["pain_time"],
+            "Peak_q_skin_W_m2": np.nanmax(df_ppe["q_skin_W_m2"].to_numpy()),
+        })
+        for level in STATUS_LEVELS[1:]:
+            result[f"First_{level}_s"] = summary.at[level, "First_Entry_s"]
+        for level in STATUS_LEVELS:
+            result[f"Time_In_{level}_s"] = summary.at[level, "Time_In_Level_s"]
+        result["Final_Status"] = df_ppe["Exposure_Safety_Status"].iloc[-1]
+        result["Error"] = ""
+
+    except Exception as exc:
+        result["Error"] = f"{type(exc).__name__}: {exc}"
+
+    return result
+
+
+_LOADED_FUEL_FILES = set()
+
+
+def _run_chunk(records, stacks, store, ppe_options, profile_memory=None, fuel_files=()):
+    # each worker keeps the pipeline's module-level cache, so scenarios in a
+    # chunk that share a fire reuse its fire and distance stages
+    for path in fuel_files:
+        if path not in _LOADED_FUEL_FILES:
+            load_fuels(path)
+            _LOADED_FUEL_FILES.add(path)
+
+    if profile_memory is None:
+        return [run_scenario(rec, stacks, store, **ppe_options) for rec in records], None
+
+    # profiled in the worker; the records are merged by the parent
+    with Profiler(memory=profile_memory) as prof:
+        with prof.stage("runner.chunk"):
+            rows = [run_scenario(rec, stacks, store, **ppe_options) for rec in records]
+    return rows, prof.records
+
+
+# -------------------------------------------------
+# OUTPUT (append-only CSV)
+# -------------------------------------------------
+RESULT_COLUMNS = SCENARIO_COLUMNS + [
+    "Burn_Duration_s", "q_peak_W_m2", "t_peak_s", "Distance_m", "Total_Flux_W_m2",
+    "Pain_Time_s", "Peak_q_skin_W_m2",
+] + [f"First_{level}_s" for level in STATUS_LEVELS[1:]] + [
+    f"Time_In_{level}_s" for level in STATUS_LEVELS
+] + ["Final_Status", "Error"]
+
+
+def _completed_ids(output):
+    """Scenario_IDs already written to output (ignores a truncated last line)."""
+    if output is None or not os.path.exists(output) or os.path.getsize(output) == 0:
+        return set()
+    done = pd.read_csv(output, usecols=["Scenario_ID", "Error"], dtype={"Scenario_ID": str},
+                       keep_default_na=False, on_bad_lines="skip", engine="python")
+    # a row cut off mid-write lacks its trailing Error field
+    with open(output, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        complete = f.read(1) == b"\n"
+    if not complete and len(done):
+        done = done.iloc[:-1]
+    return set(done["Scenario_ID"])
+
+
+def _append(output, rows):
+    df = pd.DataFrame(rows).reindex(columns=RESULT_COLUMNS)
+    header = not os.path.exists(output) or os.path.getsize(output) == 0
+    text = df.to_csv(index=False, header=header)
+
+    with open(output, "a+b") as f:
+        # drop a partial line left by an interrupted write
+        if not header:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 1, 0))
+            if f.read(1) != b"\n":
+                f.seek(0)
+                data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+        f.write(text.encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# -------------------------------------------------
+# MANY SCENARIOS
+# -------------------------------------------------
+def run_scenarios(scenarios, stacks=None, output=None, workers=None, chunk_size=16, resume=True,
+                  progress=None, store=None, profiler=None, fuel_files=(), **ppe_options):
+    """
+    Run every scenario through the fire → distance → PPE pipeline.
+
+    Parameters:
+    - scenarios  : DataFrame or path accepted by load_scenarios
+    - stacks     : dict of layer stacks by Stack_ID (default DEFAULT_STACKS)
+    - output     : CSV path; results are appended chunk by chunk
+    - workers    : process count (default os.cpu_count(); 1 runs in-process)
+    - chunk_size : scenarios per task; scenarios are ordered by fire inputs
+                   first so chunks share cached fire / distance stages
+    - resume     : skip Scenario_IDs already present in output
+    - progress   : optional callback(n_done, n_total)
+    - store      : optional results_io store directory for the full
+                   fire / distance / PPE tables of every scenario
+    - fuel_files : fuel CSV / JSON / TOML files added to the fuel registry
+                   (in every worker) before running
+    - profiler   : optional instrumentation.Profiler; per-stage statistics
+                   of all workers are merged into it
+    - ppe_options : passed on to run_ppe_model (method, dt, ...)
+
+    Returns:
+    - DataFrame of results (all rows in output, when given)
+    """
+    scenarios = load_scenarios(scenarios)
+    stacks = DEFAULT_STACKS if stacks is None else stacks
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    if output is not None and not resume and os.path.exists(output):
+        os.remove(output)
+    done = _completed_ids(output) if resume else set()
+
+    pending = scenarios[~scenarios["Scenario_ID"].isin(done)]
+    pending = pending.sort_values(["Fuel", "m_fuel_kg", "D_m"], kind="stable")
+    records = pending.to_dict("records")
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    results = []
+    n_done = 0
+
+    profile_memory = None if profiler is None else profiler.memory
+
+    def collect(chunk_result):
+        nonlocal n_done
+        rows, stage_records = chunk_result
+        if stage_records is not None:
+            profiler.merge(stage_records)
+        if output is not None:
+            _append(output, rows)
+        else:
+            results.extend(rows)
+        n_done += len(rows)
+        if progress is not None:
+            progress(n_done, len(records))
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            collect(_run_chunk(chunk, stacks, store, ppe_options, profile_memory, fuel_files))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [pool.submit(_run_chunk, chunk, stacks, store, ppe_options, profile_memory, fuel_files)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    if output is not None:
+        if not os.path.exists(output):
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.read_csv(output, dtype={"Scenario_ID": str, "Stack_ID": str, "Error": str},
+                           keep_default_na=True)
+
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run pool fire / PPE scenarios in parallel.")
+    parser.add_argument("scenarios", help="scenario table (CSV or Parquet)")
+    parser.add_argument("-o", "--output", required=True, help="results CSV (appended, resumable)")
+    parser.add_argument("-s", "--stacks", help="layer stacks (JSON, CSV or Parquet)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=16, help="scenarios per task")
+    parser.add_argument("--no-resume", action="store_true", help="overwrite output instead of resuming")
+    parser.add_argument("--method", default="euler", help="PPE integrator (euler, implicit, adaptive)")
+    parser.add_argument("--nodes-per-layer", type=int, default=1,
+                        help="PPE nodes through each layer's thickness (> 1 needs --method implicit/adaptive)")
+    parser.add_argument("--store", help="also write full results to this results_io store directory")
+    parser.add_argument("--profile", action="store_true", help="print per-stage timings")
+    parser.add_argument("--profile-json", help="write per-stage timings to this JSON file")
+    parser.add_argument("--fuels", nargs="+", default=(), help="extra fuel files (CSV, JSON or TOML)")
+    args = parser.parse_args(argv)
+
+    stacks = load_layer_stacks(args.stacks) if args.stacks else DEFAULT_STACKS
+    profiler = Profiler() if args.profile or args.profile_json else None
+
+    def progress(n_done, n_total):
+        print(f"\r{n_done}/{n_total} scenarios", end="", file=sys.stderr, flush=True)
+
+    df = run_scenarios(args.scenarios, stacks, output=args.output, workers=args.workers,
+                       chunk_size=args.chunk_size, resume=not args.no_resume, progress=progress,
+                       store=args.store, profiler=profiler, fuel_files=tuple(args.fuels), method=args.method,
+                       nodes_per_layer=args.nodes_per_layer)
+    print(file=sys.stderr)
+
+    if profiler is not None:
+        if args.profile:
+            print(profiler.summary().to_string(index=False))
+        if args.profile_json:
+            profiler.to_json(args.profile_json)
+
+    n_failed = int((df["Error"].fillna("") != "").sum())
+    print(f"{len(df)} scenarios in {args.output} ({n_failed} failed)")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
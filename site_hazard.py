@@ -0,0 +1,319 @@
+# ----------------------------------------------------------
+# SITE HAZARD MAP
+# Several pool fires placed at (x, y) on a site, their flux
+# superposed on a 2-D raster, with iso-flux contours and
+# hazard-zone areas. Each fire's radial flux profile (with
+# its view factor and atmospheric attenuation) is tabulated
+# once; the raster is filled tile by tile and sources whose
+# cutoff radius misses a tile are skipped.
+# ----------------------------------------------------------
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from file2_distance import _radial_flux, _view_model
+from instrumentation import count, timed
+
+
+# flux levels of the usual hazard zones (W/m²)
+HAZARD_LEVELS = (100e3, 37.5e3, 12.5e3, 4.7e3)
+
+
+# -------------------------------------------------
+# SOURCES
+# -------------------------------------------------
+def place_fire(fire_result, x, y, t_ignition=0.0, name=None):
+    """
+    A fire source on the site.
+
+    Parameters:
+    - fire_result : dict from run_pool_fire_model (or run_spill_fire_model)
+    - x, y        : position of the pool centre (m)
+    - t_ignition  : ignition time on the site clock (s)
+    - name        : label (default "fire<i>" by position in the list)
+    """
+    return {"fire_result": fire_result, "x": float(x), "y": float(y),
+            "t_ignition": float(t_ignition), "name": name}
+
+
+def _source_hrr(source, time):
+    """HRR of a source at site time (peak HRR if time is None)."""
+    fire_result = source["fire_result"]
+    df = fire_result["df_flux"]
+    if time is None:
+        return float(df.loc[df["Time_s"] == fire_result["t_peak_s"], "HRR_W"].iloc[0])
+    t = time - source["t_ignition"]
+    return float(np.interp(t, df["Time_s"], df["HRR_W"], left=0.0, right=0.0))
+
+
+def _source_profile(source, HRR, cutoff_flux, include_convective, n_profile=4096, r_limit=1e4):
+    """
+    Tabulated flux q(r) of one source out to its cutoff radius.
+
+    Returns (r_grid, q) with q[-1] the first value below cutoff_flux (the
+    profile is zero beyond r_grid[-1]); both empty if the fire is out.
+    """
+    fire_result = source["fire_result"]
+    if not HRR > 0:
+        return np.empty(0), np.empty(0)
+
+    D, chi_r, tau_f = fire_result["D_m"], fire_result["chi_r"], fire_result["tau_f"]
+    view = _view_model(fire_result)
+
+    def flux(r):
+        q_rad, q_conv, _ = _radial_flux(r, HRR, D, chi_r, tau_f, *view)
+        return q_rad + q_conv if include_convective else q_rad
+
+    # grow the range until the flux has dropped below the cutoff
+    r_max = max(50.0, 2 * D)
+    while flux(np.array([r_max]))[0] >= cutoff_flux and r_max < r_limit:
+        r_max *= 2
+
+    r_grid = np.linspace(0.0, r_max, n_profile)
+    q = flux(r_grid)
+    below = np.flatnonzero(q < cutoff_flux)
+    end = below[0] + 1 if len(below) else n_profile
+    return r_grid[:end], q[:end]
+
+
+# -------------------------------------------------
+# RASTER
+# -------------------------------------------------
+@timed("site.raster")
+def site_flux_raster(sources, extent, cell_size=1.0, time=None, cutoff_flux=100.0, include_convective=False,
+                     tile=512, dtype=np.float32, memmap_path=None):
+    """
+    Superposed flux of all sources on a regular raster.
+
+    Parameters:
+    - sources     : list of place_fire dicts
+    - extent      : (x_min, x_max, y_min, y_max) of the site (m)
+    - cell_size   : raster resolution (m); values are at cell centres
+    - time        : site time (s), or None for every fire at its peak
+    - cutoff_flux : flux below which a source is ignored (W/m²); sets each
+                    source's cutoff radius
+    - include_convective : add the near-field convective flux
+                    (exp(-R / R_C) decay) to the radiative flux
+    - tile        : tile edge (cells) of the chunked evaluation
+    - dtype       : storage dtype of the raster
+    - memmap_path : if given, the raster is written to this .npy file and
+                    returned as a memory map
+
+    Returns:
+    - dict with x (n_x,), y (n_y,) cell centres, flux (n_y, n_x),
+      cell_size, df_sources (position, HRR and cutoff radius per source)
+      and evaluated_fraction (share of tile × source pairs not skipped)
+    """
+    x_min, x_max, y_min, y_max = extent
+    if not (x_max > x_min and y_max > y_min and cell_size > 0):
+        raise ValueError("extent must be (x_min, x_max, y_min, y_max) with positive size, and cell_size > 0.")
+
+    x = np.arange(x_min + 0.5 * cell_size, x_max, cell_size)
+    y = np.arange(y_min + 0.5 * cell_size, y_max, cell_size)
+    shape = (len(y), len(x))
+
+    if memmap_path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(memmap_path)), exist_ok=True)
+        flux = np.lib.format.open_memmap(memmap_path, mode="w+", dtype=dtype, shape=shape)
+    else:
+        flux = np.empty(shape, dtype=dtype)
+
+    # -------------------------------------------------
+    # SOURCE PROFILES (once per source)
+    # -------------------------------------------------
+    rows = []
+    profiles = []
+    for i, source in enumerate(sources):
+        HRR = _source_hrr(source, time)
+        r_grid, q = _source_profile(source, HRR, cutoff_flux, include_convective)
+        profiles.append((source["x"], source["y"], r_grid, q))
+        rows.append({"Name": source["name"] or f"fire{i}", "x_m": source["x"], "y_m": source["y"],
+                     "HRR_W": HRR, "D_m": source["fire_result"]["D_m"],
+                     "Cutoff_Radius_m": r_grid[-1] if len(r_grid) else 0.0})
+
+    # -------------------------------------------------
+    # TILES (sources outside the cutoff radius skipped)
+    # -------------------------------------------------
+    pairs = evaluated = 0
+    for i0 in range(0, shape[0], tile):
+        yi = y[i0:i0 + tile]
+        for j0 in range(0, shape[1], tile):
+            xj = x[j0:j0 + tile]
+            acc = np.zeros((len(yi), len(xj)))
+
+            for sx, sy, r_grid, q in profiles:
+                pairs += 1
+                if not len(r_grid):
+                    continue
+                # distance from the source to the tile's bounding box
+                gap_x = max(xj[0] - sx, 0.0, sx - xj[-1])
+                gap_y = max(yi[0] - sy, 0.0, sy - yi[-1])
+                if math.hypot(gap_x, gap_y) >= r_grid[-1]:
+                    continue
+                evaluated += 1
+
+                r = np.hypot(xj[None, :] - sx, yi[:, None] - sy)
+                acc += np.interp(r, r_grid, q, right=0.0)
+
+            flux[i0:i0 + tile, j0:j0 + tile] = acc
+
+    count("site.raster", shape[0] * shape[1])
+    if memmap_path is not None:
+        flux.flush()
+
+    return {
+        "x": x,
+        "y": y,
+        "flux": flux,
+        "cell_size": cell_size,
+        "df_sources": pd.DataFrame(rows),
+        "evaluated_fraction": evaluated / pairs if pairs else 0.0,
+    }
+
+
+# -------------------------------------------------
+# CONTOURS AND ZONES
+# -------------------------------------------------
+# marching-squares edges: 0 top (a-b), 1 right (b-c), 2 bottom (d-c), 3 left (a-d)
+# with corners a = z[i, j], b = z[i, j+1], c = z[i+1, j+1], d = z[i+1, j]
+_CASE_SEGMENTS = np.array([
+    [[-1, -1], [-1, -1]],   # 0
+    [[3, 2], [-1, -1]],     # 1  d
+    [[2, 1], [-1, -1]],     # 2  c
+    [[3, 1], [-1, -1]],     # 3  c d
+    [[0, 1], [-1, -1]],     # 4  b
+    [[0, 1], [3, 2]],       # 5  b d (saddle, split around b and d)
+    [[0, 2], [-1, -1]],     # 6  b c
+    [[3, 0], [-1, -1]],     # 7  b c d
+    [[3, 0], [-1, -1]],     # 8  a
+    [[0, 2], [-1, -1]],     # 9  a d
+    [[3, 0], [2, 1]],       # 10 a c (saddle, split around a and c)
+    [[0, 1], [-1, -1]],     # 11 a c d
+    [[3, 1], [-1, -1]],     # 12 a b
+    [[2, 1], [-1, -1]],     # 13 a b d
+    [[3, 2], [-1, -1]],     # 14 a b c
+    [[-1, -1], [-1, -1]],   # 15
+])
+
+
+def _contour_segments(z, level):
+    """Marching-squares segments (n, 2, 2) of z == level in (row, col) index coordinates."""
+    a, b = z[:-1, :-1], z[:-1, 1:]
+    c, d = z[1:, 1:], z[1:, :-1]
+    case = (8 * (a >= level) + 4 * (b >= level) + 2 * (c >= level) + (d >= level)).astype(np.int8)
+
+    ii, jj = np.nonzero((case != 0) & (case != 15))
+    if not len(ii):
+        return np.empty((0, 2, 2))
+    a, b, c, d = (v[ii, jj].astype(float) for v in (a, b, c, d))
+    cases = case[ii, jj]
+
+    def frac(v0, v1):
+        span = v1 - v0
+        return np.divide(level - v0, span, out=np.full(span.shape, 0.5), where=span != 0)
+
+    # crossing point on each edge, shape (4, n, 2)
+    points = np.stack([
+        np.stack([ii, jj + frac(a, b)], axis=-1),
+        np.stack([ii + frac(b, c), jj + 1], axis=-1),
+        np.stack([ii + 1, jj + frac(d, c)], axis=-1),
+        np.stack([ii + frac(a, d), jj], axis=-1),
+    ])
+
+    segments = _CASE_SEGMENTS[cases].copy()
+    # saddles whose centre is inside connect the other way round
+    centre_in = 0.25 * (a + b + c + d) >= level
+    segments[(cases == 5) & centre_in] = [[3, 0], [2, 1]]
+    segments[(cases == 10) & centre_in] = [[0, 1], [3, 2]]
+
+    out = []
+    n = np.arange(len(cases))
+    for k in range(2):
+        used = segments[:, k, 0] >= 0
+        e0, e1 = segments[used, k, 0], segments[used, k, 1]
+        out.append(np.stack([points[e0, n[used]], points[e1, n[used]]], axis=1))
+    return np.concatenate(out)
+
+
+def _join_segments(segments, decimals=9):
+    """Chain segments sharing end points into polylines (list of (m, 2) arrays)."""
+    keys = [tuple(np.round(p, decimals)) for p in segments.reshape(-1, 2)]
+    ends = {}
+    for idx, key in enumerate(keys):
+        ends.setdefault(key, []).append(idx)
+
+    used = np.zeros(len(segments), dtype=bool)
+    lines = []
+    for s in range(len(segments)):
+        if used[s]:
+            continue
+        used[s] = True
+        line = [2 * s, 2 * s + 1]
+        # extend forwards from the tail, then backwards from the head
+        for forward in (True, False):
+            while True:
+                key = keys[line[-1] if forward else line[0]]
+                nxt = next((p for p in ends[key] if not used[p // 2]), None)
+                if nxt is None:
+                    break
+                used[nxt // 2] = True
+                other = nxt ^ 1
+                if forward:
+                    line.append(other)
+                else:
+                    line.insert(0, other)
+        lines.append(segments.reshape(-1, 2)[line])
+    return lines
+
+
+def iso_flux_contours(raster, levels=HAZARD_LEVELS):
+    """
+    Iso-flux contour polylines of a site_flux_raster result.
+
+    Returns:
+    - dict level -> list of (m, 2) arrays of (x, y) points (closed
+      contours repeat their first point)
+    """
+    z = np.asarray(raster["flux"])
+    x, y = raster["x"], raster["y"]
+    contours = {}
+    for level in levels:
+        segments = _contour_segments(z, level)
+        lines = _join_segments(segments)
+        contours[level] = [np.column_stack([np.interp(line[:, 1], np.arange(len(x)), x),
+                                            np.interp(line[:, 0], np.arange(len(y)), y)])
+                           for line in lines]
+    return contours
+
+
+def hazard_zones(raster, levels=HAZARD_LEVELS, chunk_rows=1024):
+    """Area (m²) and cell count at or above each flux level."""
+    z = raster["flux"]
+    cells = np.zeros(len(levels), dtype=np.int64)
+    levels_arr = np.asarray(levels, dtype=float)
+    for i0 in range(0, z.shape[0], chunk_rows):
+        block = np.asarray(z[i0:i0 + chunk_rows])
+        cells += (block[..., None] >= levels_arr).sum(axis=(0, 1))
+    return pd.DataFrame({
+        "Level_W_m2": levels_arr,
+        "Cells": cells,
+        "Area_m2": cells * raster["cell_size"]**2,
+    })
+
+
+def run_site_hazard(sources, extent, cell_size=1.0, levels=HAZARD_LEVELS, **raster_options):
+    """
+    Raster, contours and zone areas of a multi-fire site in one call.
+
+    raster_options are passed to site_flux_raster (time, cutoff_flux, ...).
+
+    Returns:
+    - dict with the site_flux_raster result plus contours and df_zones
+    """
+    raster = site_flux_raster(sources, extent, cell_size, **raster_options)
+    raster["contours"] = iso_flux_contours(raster, levels)
+    raster["df_zones"] = hazard_zones(raster, levels)
+    return raster
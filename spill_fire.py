@@ -0,0 +1,283 @@
+# ----------------------------------------------------------
+# SPILL FIRE MODEL
+# Burning pool whose area follows the spill: the pool spreads
+# while it is thicker than a minimum film, then shrinks as the
+# remaining fuel burns away. Fuel volume and front radius are
+# integrated with adaptive steps while the front moves; the
+# bunded (constant-area) and break-up phases are closed form.
+# Output columns match File1
+# ----------------------------------------------------------
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from correlations import chi_r, tau_f
+from file1_time import FLUX_COLUMNS, _flame_flux
+from fuel_data import get_fuel_properties
+from history import decimation_mask
+from instrumentation import count, timed
+from integrators import step_doubling, linear_crossing
+
+
+G = 9.81
+
+RELEASE_MODES = ("instantaneous", "continuous")
+
+SPILL_COLUMNS = FLUX_COLUMNS + ["Pool_Diameter_m", "Fuel_Volume_m3"]
+
+BURNOUT_POINTS = 32     # samples of the closed-form burn-out phase
+
+
+def _pool_area(V, r, h_min):
+    """
+    Burning area for pool volume V and front radius r.
+
+    The full area while the pool is at least h_min thick; below that the
+    pool breaks up and the area falls as sqrt(V), so it burns out in
+    finite time.
+    """
+    A_front = math.pi * r**2
+    if A_front <= 0.0 or V <= 0.0:
+        return 0.0
+    h = V / A_front
+    return A_front if h >= h_min else A_front * math.sqrt(h / h_min)
+
+
+def _spill_rhs(V, r, inflow, regression, h_min, spread_coeff, r_max):
+    """(dV/dt, dr/dt) for the pool volume and front radius (V >= 0)."""
+    A = _pool_area(V, r, h_min)
+    dV = inflow - regression * A
+
+    h = V / (math.pi * r**2) if r > 0 else 0.0
+    dr = spread_coeff * math.sqrt(G * (h - h_min)) if h > h_min and r < r_max else 0.0
+    return dV, dr
+
+
+@timed("fire.spill")
+def run_spill_fire_model(fuel, m_fuel, release="instantaneous", release_rate=None, D_max=None,
+                         h_min=0.005, spread_coeff=1.0, burning_rate=None, lhv_mj=None,
+                         combustion_efficiency=None, density=None, r0=None, n_points=300,
+                         rtol=1e-4, atol=1e-6, max_step=None, t_max=1e7, every=None, window=None,
+                         view_factor="point", view_options=None):
+    """
+    Pool fire on a spreading / shrinking spill over its whole burn.
+
+    Parameters:
+    - fuel, m_fuel : fuel name and total released mass (kg)
+    - release      : "instantaneous" (all fuel at t = 0) or "continuous"
+    - release_rate : release mass flow (kg/s) for continuous spills
+    - D_max        : bund / confinement diameter (m); None for unconfined
+    - h_min        : minimum film thickness below which the pool stops
+                     spreading and starts breaking up (m)
+    - spread_coeff : front speed coefficient, dr/dt = c sqrt(g (h - h_min))
+    - burning_rate, lhv_mj, combustion_efficiency, density :
+                     overrides of the fuel_data values
+    - r0           : initial pool radius (default from the released volume)
+    - n_points     : output time points (None for the integrator's own steps)
+    - rtol, atol, max_step : step control on the (scaled) state
+    - t_max        : give-up time of the spreading phase (s)
+    - every, window : thin df_flux as in run_pool_fire_model
+    - view_factor, view_options : flame view factor (see view_factor.py)
+
+    Returns:
+    - dict as run_pool_fire_model (D_m, chi_r, tau_f at the peak) plus
+      release, D_pool_max_m, steps; df_flux also has Pool_Diameter_m
+      and Fuel_Volume_m3
+    """
+    if release not in RELEASE_MODES:
+        raise ValueError(f"Unknown release '{release}'. Available: {list(RELEASE_MODES)}")
+    if m_fuel <= 0:
+        raise ValueError("m_fuel must be positive.")
+
+    props = get_fuel_properties(fuel) if None in (burning_rate, lhv_mj, combustion_efficiency, density) else {}
+    m_dot_area = props["burning_rate"] if burning_rate is None else burning_rate
+    LHV = (props["lhv"] if lhv_mj is None else lhv_mj) * 1e6
+    eta = props["combustion_efficiency"] if combustion_efficiency is None else combustion_efficiency
+    rho = props.get("density") if density is None else density
+    if rho is None or not rho > 0:
+        raise ValueError(f"A fuel density is required for spill fires (none known for '{fuel}').")
+
+    # ==========================================================
+    # RELEASE AND SCALES
+    # ==========================================================
+    V_total = m_fuel / rho
+    regression = m_dot_area / rho                             # m/s
+    r_spread = math.sqrt(V_total / (math.pi * h_min))         # unconfined spread limit
+    r_max = r_spread if D_max is None else min(D_max / 2, r_spread)
+
+    if release == "instantaneous":
+        t_release, inflow = 0.0, 0.0
+        V0 = V_total
+        r_init = (V_total / math.pi)**(1 / 3) if r0 is None else r0
+    else:
+        if not release_rate or release_rate <= 0:
+            raise ValueError("Continuous spills need a positive release_rate (kg/s).")
+        t_release, inflow = m_fuel / release_rate, release_rate / rho
+        V0 = 0.0
+        r_init = 0.05 if r0 is None else r0
+    r_init = min(r_init, r_max)
+
+    # state y = (V / V_total, r / r_spread) keeps both components O(1);
+    # the front moves until it reaches the bund (an event located in the
+    # integration loop below), then stays fixed
+    def step_for(q_in, front_fixed):
+        def f(y):
+            r = y[1] * r_spread
+            dV, dr = _spill_rhs(y[0] * V_total, r, q_in, regression, h_min, spread_coeff,
+                                r if front_fixed else math.inf)
+            return np.array([dV / V_total, dr / r_spread])
+
+        def step(t, y, h):
+            # explicit midpoint; step_doubling supplies error control. A
+            # step that empties the pool is returned as NaN, which
+            # step_doubling rejects and retries with a smaller h
+            y_mid = y + 0.5 * h * f(y)
+            if y_mid[0] < 0.0:
+                return np.full(2, np.nan)
+            y_new = y + h * f(y_mid)
+            if y_new[0] < 0.0:
+                return np.full(2, np.nan)
+            return y_new
+        return step
+
+    # ==========================================================
+    # ADAPTIVE INTEGRATION (release phase, then spreading burn)
+    # ==========================================================
+    t_steps = [0.0]
+    y_steps = [np.array([V0 / V_total, r_init / r_spread])]
+    max_h = np.inf if max_step is None else max_step
+    r_stop = r_max / r_spread
+
+    def film_margin(y):
+        # > 0 while the pool is thicker than h_min
+        return y[0] * V_total - h_min * math.pi * (y[1] * r_spread)**2
+
+    def front_margin(y):
+        # < 0 while the front is inside the bund
+        return y[1] - r_stop
+
+    n_steps = 0
+    bunded = r_init >= r_max
+    film_reached = False
+    phases = ([(t_release, inflow)] if t_release > 0 else []) + [(t_max, 0.0)]
+    for t_end, q_in in phases:
+        while not film_reached:
+            t0, y0 = t_steps[-1], y_steps[-1]
+            if q_in == 0.0 and (bunded or film_margin(y0) <= 0.0):
+                # the closed-form phases below take over
+                film_reached = film_margin(y0) <= 0.0
+                break
+
+            first = min(1e-3 * max(t_end - t0, 1.0), 1.0)
+            event = None
+            for t, y in step_doubling(step_for(q_in, bunded), t0, y0, t_end, rtol=rtol, atol=atol,
+                                      first_step=first, max_step=max_h):
+                n_steps += 1
+                if q_in == 0.0 and film_margin(y) <= 0.0:
+                    event = film_margin       # pool thins below h_min inside this step
+                elif not bunded and front_margin(y) >= 0.0:
+                    event = front_margin      # front reaches the bund inside this step
+                if event is None:
+                    t_steps.append(t)
+                    y_steps.append(y.copy())
+                    continue
+
+                # stop at the event
+                g0, g1 = event(y_steps[-1]), event(y)
+                t_out = float(linear_crossing(t_steps[-1], t, g0, g1, 0.0))
+                w = (t_out - t_steps[-1]) / (t - t_steps[-1]) if t > t_steps[-1] else 1.0
+                y_out = y_steps[-1] + w * (y - y_steps[-1])
+                if event is front_margin:
+                    y_out[1] = r_stop
+                t_steps.append(t_out)
+                y_steps.append(y_out)
+                break
+            else:
+                if q_in == 0.0:
+                    raise RuntimeError(f"Spill fire still burning at t_max = {t_max} s.")
+                break                         # release finished
+
+            if event is film_margin:
+                film_reached = True
+            else:
+                bunded = True                 # continue with the front held by the bund
+    count("fire.spill", n_steps)
+
+    # ==========================================================
+    # BUNDED BURN (closed form)
+    # ==========================================================
+    # With the front at the bund and the film thicker than h_min the
+    # area is constant, so V falls linearly until the film reaches h_min
+    t1, (v1, r1) = t_steps[-1], y_steps[-1]
+    A_front = math.pi * (r1 * r_spread)**2
+    V_film = h_min * A_front
+    if v1 * V_total > V_film:
+        t_film = t1 + (v1 * V_total - V_film) / (regression * A_front)
+        t_steps.append(t_film)
+        y_steps.append(np.array([V_film / V_total, r1]))
+        t1, v1 = t_film, V_film / V_total
+
+    # ==========================================================
+    # BREAK-UP AND BURN-OUT (closed form)
+    # ==========================================================
+    # With the front fixed and A = A_front sqrt(h / h_min), sqrt(V) falls
+    # linearly, so the last phase is exact and ends at a finite time
+    slope = 0.5 * regression * math.sqrt(A_front / h_min)     # d sqrt(V) / dt
+    t_out = t1 + math.sqrt(max(v1, 0.0) * V_total) / slope
+    for s in np.linspace(0.0, 1.0, BURNOUT_POINTS + 1)[1:]:
+        t_steps.append(t1 + s * (t_out - t1))
+        y_steps.append(np.array([v1 * (1 - s)**2, r1]))
+
+    t_steps = np.array(t_steps)
+    y_steps = np.array(y_steps)
+
+    # ==========================================================
+    # OUTPUT GRID AND FLUXES
+    # ==========================================================
+    if n_points is None:
+        time = t_steps
+        V = y_steps[:, 0] * V_total
+        r = y_steps[:, 1] * r_spread
+    else:
+        time = np.linspace(0.0, t_steps[-1], n_points)
+        V = np.interp(time, t_steps, y_steps[:, 0]) * V_total
+        r = np.interp(time, t_steps, y_steps[:, 1]) * r_spread
+
+    A = np.array([_pool_area(v, ri, h_min) for v, ri in zip(V, r)])
+    D = np.sqrt(4 * A / math.pi)
+    HRR = m_dot_area * A * LHV * eta
+
+    H = np.zeros_like(D)
+    q_rad = np.zeros_like(D)
+    q_conv = np.zeros_like(D)
+    burning = D > 0
+    H[burning], q_rad[burning], q_conv[burning], _ = _flame_flux(
+        HRR[burning], D[burning], chi_r(D[burning]), tau_f(D[burning]), 0.0, view_factor, view_options)
+    q_total = q_rad + q_conv
+
+    idx_peak = int(np.argmax(q_total))
+    keep = decimation_mask(len(time), every, window, q_total)
+    keep[[idx_peak, -1]] = True
+
+    df = pd.DataFrame(dict(zip(SPILL_COLUMNS, [
+        time[keep], HRR[keep], H[keep], q_rad[keep], q_conv[keep], q_total[keep], D[keep], V[keep]
+    ])))
+
+    D_peak = float(D[idx_peak])
+    return {
+        "fuel": fuel,
+        "burn_duration_s": float(time[-1]),
+        "q_peak_W_m2": q_total[idx_peak],
+        "t_peak_s": time[idx_peak],
+        "D_m": D_peak,
+        "chi_r": float(chi_r(D_peak)),
+        "tau_f": float(tau_f(D_peak)),
+        "release": release,
+        "D_pool_max_m": float(D.max()),
+        "steps": n_steps,
+        "view_factor": view_factor,
+        "view_options": dict(view_options or {}),
+        "df_flux": df
+    }
@@ -0,0 +1,252 @@
+# ----------------------------------------------------------
+# FLAME VIEW FACTORS
+# Configuration factor from a flame to a small target at
+# horizontal distance R from the flame axis:
+#
+#   "point"    : point-source estimate A_proj / (4π(R² + (H/2)²))
+#   "cylinder" : solid cylindrical flame (D × H), vertical by
+#                closed form (Mudan), tilted by an interpolation
+#                table of numerically integrated factors
+#
+# All functions broadcast over R, D and H (distance × time).
+# ----------------------------------------------------------
+
+import math
+
+import numpy as np
+
+
+VIEW_FACTOR_MODELS = ("point", "cylinder")
+ORIENTATIONS = ("max", "vertical", "horizontal")
+
+# tilted-cylinder table axes: S = L / r (L from the base centre), h = H / r
+TABLE_GAP = np.geomspace(1e-2, 1e3, 26)        # S - 1
+TABLE_HEIGHT = np.geomspace(5e-2, 2e2, 22)     # h
+TABLE_TILT = np.linspace(-70.0, 70.0, 15)      # degrees, positive towards the target
+
+_TILT_TABLE = None   # built on first use (see _tilt_table)
+
+
+# -------------------------------------------------
+# POINT SOURCE
+# -------------------------------------------------
+def point_view_factor(R, D, H):
+    """Point-source factor A_proj / (4π(R² + (H/2)²)), capped at 1."""
+    A_proj = D * H
+    denom = 4 * math.pi * (R**2 + (H / 2)**2)
+    F = np.divide(A_proj, denom, out=np.zeros(np.shape(denom)), where=denom > 0)
+    return np.minimum(F, 1.0)
+
+
+# -------------------------------------------------
+# VERTICAL CYLINDER (closed form)
+# -------------------------------------------------
+def vertical_cylinder_factors(S, h):
+    """
+    Factors from a vertical cylinder to a ground-level target (Mudan).
+
+    Parameters:
+    - S : distance from the cylinder axis / radius (> 1)
+    - h : cylinder height / radius
+
+    Returns:
+    - (F_vertical, F_horizontal) for a target facing the axis and a
+      target facing up
+    """
+    S, h = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(h, dtype=float))
+    S = np.maximum(S, 1.0 + 1e-9)
+    h = np.maximum(h, 1e-12)
+
+    A = (h**2 + S**2 + 1) / (2 * S)
+    B = (1 + S**2) / (2 * S)
+    s_ratio = (S - 1) / (S + 1)
+
+    atan_A = np.arctan(np.sqrt((A + 1) * s_ratio / (A - 1)))
+    atan_B = np.arctan(np.sqrt((B + 1) * s_ratio / (B - 1)))
+
+    F_v = (np.arctan(h / np.sqrt(S**2 - 1)) / (math.pi * S)
+           - h / (math.pi * S) * np.arctan(np.sqrt(s_ratio))
+           + A * h / (math.pi * S * np.sqrt(A**2 - 1)) * atan_A)
+    F_h = ((B - 1 / S) / np.sqrt(B**2 - 1) * atan_B
+           - (A - 1 / S) / np.sqrt(A**2 - 1) * atan_A) / math.pi
+
+    return np.maximum(F_v, 0.0), np.maximum(F_h, 0.0)
+
+
+# -------------------------------------------------
+# TILTED CYLINDER (numerical integration → table)
+# -------------------------------------------------
+def _gauss_panels(x_min, x_max, n_gauss=6, ratio=2.0):
+    """Nodes / weights on [0, x_max] in geometric panels growing from x_min."""
+    edges = [0.0]
+    width = x_min
+    while edges[-1] + width < x_max:
+        edges.append(edges[-1] + width)
+        width *= ratio
+    edges.append(x_max)
+
+    g, w = np.polynomial.legendre.leggauss(n_gauss)
+    a, b = np.array(edges[:-1])[:, None], np.array(edges[1:])[:, None]
+    nodes = 0.5 * (b - a) * g + 0.5 * (b + a)
+    weights = 0.5 * (b - a) * w
+    return nodes.ravel(), weights.ravel()
+
+
+def _tilted_factors(S, h, tilt_deg, n_phi=24):
+    """
+    (F_vertical, F_horizontal) of oblique unit-radius cylinders by quadrature.
+
+    The cylinder has horizontal circular sections of radius 1 whose
+    centres move by z·tan(tilt) towards the ground-level target at (S, 0, 0).
+    A section point at angle φ faces the target iff cos φ > 1/S, for any
+    height and tilt, so the angular limits are exact. tilt_deg may be an
+    array (one result per tilt).
+    """
+    t = np.tan(np.radians(np.asarray(tilt_deg, dtype=float)))[..., None, None]
+    z, wz = _gauss_panels(min(S - 1.0, 1.0), h)
+
+    phi_max = math.acos(1.0 / S)
+    g, w = np.polynomial.legendre.leggauss(n_phi)
+    phi = 0.5 * phi_max * (g + 1)
+    wphi = 0.5 * phi_max * w
+
+    Z = z[:, None]
+    cos_p, sin_p = np.cos(phi), np.sin(phi)
+    dx = S - Z * t - cos_p          # target minus surface point
+    s2 = dx**2 + sin_p**2 + Z**2
+
+    facing = S * cos_p - 1.0        # n_surface · (target - point), per unit dφ dz
+    kernel = facing / (math.pi * s2**2) * (wz[:, None] * wphi)
+
+    # both halves (±φ) by symmetry; the vertical target only sees the flame in front of it
+    F_v = 2 * np.sum(kernel * np.maximum(dx, 0.0), axis=(-2, -1))
+    F_h = 2 * np.sum(kernel * Z, axis=(-2, -1))
+    return F_v, F_h
+
+
+def _tilt_table():
+    """
+    Tilt correction table, ratio of tilted to vertical factors on
+    (S - 1, h, tilt); computed once per process.
+
+    Ratios of two quadratures share their discretization error, so the
+    table times the closed-form vertical factor stays accurate.
+    """
+    global _TILT_TABLE
+    if _TILT_TABLE is None:
+        table = np.empty((len(TABLE_GAP), len(TABLE_HEIGHT), len(TABLE_TILT), 2))
+        for i, gap in enumerate(TABLE_GAP):
+            for j, h in enumerate(TABLE_HEIGHT):
+                F_v, F_h = _tilted_factors(1.0 + gap, h, TABLE_TILT)
+                F0_v, F0_h = _tilted_factors(1.0 + gap, h, 0.0)
+                table[i, j, :, 0] = F_v / F0_v if F0_v > 0 else 1.0
+                table[i, j, :, 1] = F_h / F0_h if F0_h > 0 else 1.0
+        _TILT_TABLE = table
+    return _TILT_TABLE
+
+
+def _interp_axis(grid, x):
+    """Lower index and weight of x on a sorted grid (clamped to its ends)."""
+    x = np.clip(x, grid[0], grid[-1])
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+    w = (x - grid[i]) / (grid[i + 1] - grid[i])
+    return i, w
+
+
+def _tilt_ratio(S, h, tilt_deg):
+    """Trilinear interpolation of the tilt table (log S - 1, log h, tilt)."""
+    table = _tilt_table()
+    i, wi = _interp_axis(np.log(TABLE_GAP), np.log(np.maximum(S - 1.0, 1e-300)))
+    j, wj = _interp_axis(np.log(TABLE_HEIGHT), np.log(np.maximum(h, 1e-300)))
+    k, wk = _interp_axis(TABLE_TILT, tilt_deg)
+
+    out = 0.0
+    for di, fi in ((0, 1 - wi), (1, wi)):
+        for dj, fj in ((0, 1 - wj), (1, wj)):
+            for dk, fk in ((0, 1 - wk), (1, wk)):
+                out = out + (fi * fj * fk)[..., None] * table[i + di, j + dj, k + dk]
+    return out[..., 0], out[..., 1]
+
+
+def _cylinder_part(S, h, tilt_deg):
+    """(F_vertical, F_horizontal) of one cylinder part above a target at its base level."""
+    F_v, F_h = vertical_cylinder_factors(S, h)
+    if np.any(tilt_deg != 0):
+        r_v, r_h = _tilt_ratio(S, h, tilt_deg)
+        tilted = tilt_deg != 0
+        F_v = np.where(tilted, F_v * r_v, F_v)
+        F_h = np.where(tilted, F_h * r_h, F_h)
+    return np.where(h > 0, F_v, 0.0), np.where(h > 0, F_h, 0.0)
+
+
+def cylinder_view_factor(R, D, H, orientation="max", tilt_deg=0.0, target_height=0.0):
+    """
+    View factor from a solid cylindrical flame to a small target.
+
+    Parameters:
+    - R             : horizontal distance from the flame axis (m)
+    - D, H          : flame diameter and height (m)
+    - orientation   : "max" (target turned for the largest factor),
+                      "vertical" (facing the flame), "horizontal" (facing up)
+                      or the target normal's elevation angle in degrees
+    - tilt_deg      : flame tilt from vertical, positive towards the target
+    - target_height : target height above the pool base (m)
+
+    Targets within the flame base (R <= D/2) are engulfed (factor 1). The
+    flame is split at the target height and the parts above and below
+    (mirrored) are combined as a vector, (F_vertical, F_horizontal).
+
+    Returns:
+    - view factor array (broadcast shape of R, D and H)
+    """
+    R, D, H = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (R, D, H)))
+    tilt = float(tilt_deg)
+    r = D / 2
+    z_t = np.clip(target_height, 0.0, H)
+    t = math.tan(math.radians(tilt))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # part above the target: base at target level, shifted by z_t·tan(tilt)
+        S_up = (R - z_t * t) / r
+        F_v, F_h = _cylinder_part(S_up, (H - z_t) / r, tilt)
+        engulfed = S_up <= 1
+
+        # part below, mirrored to stand on the target level (tilting away)
+        if np.any(z_t > 0):
+            Fv_dn, Fh_dn = _cylinder_part(S_up, z_t / r, -tilt)
+            F_v = F_v + Fv_dn
+            F_h = F_h - Fh_dn
+
+    if orientation == "max":
+        F = np.hypot(F_v, F_h)
+    elif orientation == "vertical":
+        F = F_v
+    elif orientation == "horizontal":
+        F = F_h
+    elif isinstance(orientation, (int, float)):
+        a = math.radians(orientation)
+        F = math.cos(a) * F_v + math.sin(a) * F_h
+    else:
+        raise ValueError(f"Unknown orientation '{orientation}'. Available: {list(ORIENTATIONS)} or an angle")
+
+    F = np.where(engulfed | (r <= 0), 1.0, F)
+    return np.clip(F, 0.0, 1.0)
+
+
+# -------------------------------------------------
+# DISPATCH
+# -------------------------------------------------
+def flame_view_factor(R, D, H, model="point", **options):
+    """
+    Flame-to-target view factor for the chosen model (broadcasting).
+
+    options are passed to cylinder_view_factor (orientation, tilt_deg,
+    target_height); the point model takes none.
+    """
+    if model == "point":
+        if options:
+            raise ValueError(f"The point view factor takes no options, got {sorted(options)}.")
+        return point_view_factor(R, D, H)
+    if model == "cylinder":
+        return cylinder_view_factor(R, D, H, **options)
+    raise ValueError(f"Unknown view factor model '{model}'. Available: {list(VIEW_FACTOR_MODELS)}")